@@ -0,0 +1,236 @@
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "inference_KLAX"))
+from ev import ev_grid
+
+FEE = 0.02  # dollars per contract
+
+
+def add_bounds(prices):
+    """
+    floor/cap for every market from its ticker threshold, for all days at once (vectorized add_floor_cap):
+    B buckets span threshold +- 0.5, a T market at or below the event's lowest bucket floor is the
+    lower tail (cap = threshold), one at or above its highest bucket cap the upper tail (floor =
+    threshold). A T market in between is ambiguous and keeps floor and cap NaN (BacktestData drops it).
+    Events without B buckets fall back to their lowest/highest T threshold.
+    """
+    out = prices.copy()
+    thr = out["threshold"].to_numpy(dtype="float64")
+    is_b = out["threshold_type"].eq("B").to_numpy()
+    is_t = out["threshold_type"].eq("T").to_numpy()
+    keys = [out["day"], out["event_ticker"]]
+    b_thr = pd.Series(np.where(is_b, thr, np.nan), index=out.index).groupby(keys)
+    b_floor = b_thr.transform("min").to_numpy() - 0.5
+    b_cap = b_thr.transform("max").to_numpy() + 0.5
+    t_thr = pd.Series(np.where(is_t, thr, np.nan), index=out.index)
+    t_min = t_thr.groupby(keys).transform("min").to_numpy()
+    t_max = t_thr.groupby(keys).transform("max").to_numpy()
+    has_b = ~np.isnan(b_floor)
+    lower = is_t & np.where(has_b, thr <= b_floor + 1e-9, thr == t_min)
+    upper = is_t & np.where(has_b, ~lower & (thr >= b_cap - 1e-9), thr == t_max)
+    out["floor"] = np.where(is_b, thr - 0.5, np.where(upper, thr, np.nan))
+    out["cap"] = np.where(is_b, thr + 0.5, np.where(lower, thr, np.nan))
+    return out
+
+
+def settles_yes(floor, cap, tmax):
+    """
+    Kalshi settlement on the reported (integer) high: a bucket pays YES if floor <= TMAX <= cap
+    (66.5 covers 66 and 67), the lower tail if TMAX < cap, the upper tail if TMAX > floor.
+    """
+    has_floor, has_cap = ~np.isnan(floor), ~np.isnan(cap)
+    with np.errstate(invalid="ignore"):
+        bucket = has_floor & has_cap & (tmax >= floor) & (tmax <= cap)
+        lower = ~has_floor & has_cap & (tmax < cap)
+        upper = has_floor & ~has_cap & (tmax > floor)
+    return bucket | lower | upper
+
+
+class BacktestData:
+    """
+    One row per market and day, joined once and held as aligned arrays:
+    day (codes into days), floor, cap, yes_ask, no_ask (dollars), mu (adjusted forecast), tmax, yes_wins.
+    Days with no prediction, no realized TMAX or no price are dropped, and so are markets with
+    neither floor nor cap (T thresholds add_bounds could not place).
+    """
+    ARRAYS = ("day", "days", "floor", "cap", "yes_ask", "no_ask", "mu", "tmax", "yes_wins")
+
+    def __init__(self, prices, predictions, realized, day_col="day", date_col="DATE",
+                 mu_col="adjusted_forecast", tmax_col="TMAX"):
+        if "floor" not in prices.columns or "cap" not in prices.columns:
+            prices = add_bounds(prices)
+        day = pd.to_datetime(prices[day_col]).to_numpy("datetime64[D]")
+        mu = _lookup(day, predictions[date_col], predictions[mu_col])
+        tmax = _lookup(day, realized[date_col], realized[tmax_col])
+        yes_ask = prices["yes_ask"].to_numpy(dtype="float64")
+        no_ask = prices["no_ask"].to_numpy(dtype="float64") if "no_ask" in prices.columns else 1.0 - yes_ask
+        floor, cap = prices["floor"].to_numpy(dtype="float64"), prices["cap"].to_numpy(dtype="float64")
+        unbounded = np.isnan(floor) & np.isnan(cap)
+        keep = ~(np.isnan(mu) | np.isnan(tmax) | np.isnan(yes_ask) | np.isnan(no_ask) | unbounded)
+
+        codes, self.days = pd.factorize(day[keep], sort=True)
+        self.day = codes.astype(np.intp)
+        self.ticker = prices["ticker"].to_numpy()[keep] if "ticker" in prices.columns else None
+        self.floor, self.cap = floor[keep], cap[keep]
+        self.yes_ask, self.no_ask = yes_ask[keep], no_ask[keep]
+        self.mu, self.tmax = mu[keep], tmax[keep]
+        self.yes_wins = settles_yes(self.floor, self.cap, self.tmax)
+
+    def __len__(self):
+        return len(self.day)
+
+    @property
+    def n_days(self):
+        return len(self.days)
+
+    def arrays(self):
+        """
+        The numeric arrays (everything but ticker), e.g. to place them in shared memory.
+        """
+        return {k: np.asarray(getattr(self, k)) for k in self.ARRAYS}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuilds the data from arrays() without joining again (ticker is not kept).
+        """
+        data = cls.__new__(cls)
+        for k in cls.ARRAYS:
+            setattr(data, k, arrays[k])
+        data.ticker = None
+        return data
+
+    @property
+    def month(self):
+        """
+        Month (1..12) of every row's day, for a seasonal residual_cdf.ResidualCDF.
+        """
+        days = np.asarray(self.days, dtype="datetime64[D]")
+        return (days.astype("datetime64[M]").astype(np.int64) % 12 + 1)[self.day]
+
+    def edges(self, sigma, mu=None):
+        """
+        (edge_yes, edge_no) in dollars for every row, as in ev.get_ev (unrounded).
+        sigma is a number (Normal error) or a residual_cdf.ResidualCDF.
+        """
+        month = self.month if getattr(sigma, "seasonal", False) else None
+        _, edge_yes, edge_no = ev_grid(self.floor, self.cap, self.mu if mu is None else mu, sigma,
+                                       self.yes_ask, self.no_ask, ask_scale=1.0, month=month)
+        return edge_yes, edge_no
+
+
+def _lookup(day, dates, values):
+    """
+    values at each of day (datetime64[D]) from a (dates, values) table, NaN where the date is missing.
+    """
+    keys = pd.to_datetime(dates).to_numpy("datetime64[D]")
+    vals = pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64")
+    order = np.argsort(keys, kind="stable")
+    keys, vals = keys[order], vals[order]
+    # last value wins for duplicated dates
+    pos = np.searchsorted(keys, day, side="right") - 1
+    found = (pos >= 0) & (keys[np.clip(pos, 0, None)] == day)
+    return np.where(found, vals[np.clip(pos, 0, None)], np.nan)
+
+
+def _best_per_day(day, score, eligible):
+    """
+    Mask with the highest-scoring eligible row of every day.
+    """
+    idx = np.flatnonzero(eligible)
+    if not len(idx):
+        return np.zeros(len(day), dtype=bool)
+    order = idx[np.lexsort((score[idx], day[idx]))]
+    last = np.r_[day[order][1:] != day[order][:-1], True]
+    mask = np.zeros(len(day), dtype=bool)
+    mask[order[last]] = True
+    return mask
+
+
+# Entry rules: rule(day, edge_yes, edge_no) -> (buy_yes, buy_no) boolean masks over the rows.
+
+def best_edge(side="no", min_edge=-np.inf):
+    """
+    The single best edge of the day on one side ("yes", "no") or either ("both"), if above min_edge.
+    best_edge("no") is the notebook's strategy: the NO with the highest edge, every day.
+    """
+    def rule(day, edge_yes, edge_no):
+        if side == "both":
+            best = np.maximum(edge_yes, edge_no)
+            mask = _best_per_day(day, best, best > min_edge)
+            return mask & (edge_yes >= edge_no), mask & (edge_yes < edge_no)
+        edge = edge_yes if side == "yes" else edge_no
+        mask = _best_per_day(day, edge, edge > min_edge)
+        none = np.zeros_like(mask)
+        return (mask, none) if side == "yes" else (none, mask)
+    return rule
+
+
+def all_positive(sides=("yes", "no"), min_edge=0.0):
+    """
+    Every leg whose edge is above min_edge, on the given sides.
+    """
+    def rule(day, edge_yes, edge_no):
+        return ("yes" in sides) & (edge_yes > min_edge), ("no" in sides) & (edge_no > min_edge)
+    return rule
+
+
+def threshold(t, side="no"):
+    """
+    The day's best edge on side, only on days where it beats t (the notebook's threshold cell).
+    """
+    return best_edge(side, min_edge=t)
+
+
+def limit_fills(edge, ask, price_offset):
+    """
+    Whether a limit order at the model's fair value plus price_offset (dollars) fills against ask,
+    priced like send_order: round(p * 100) + offset cents, kept within 1..99.
+    """
+    limit = np.clip(np.round((edge + ask) * 100) + np.round(price_offset * 100), 1, 99)
+    return np.round(ask * 100) <= limit
+
+
+def backtest(data, sigma, rule=None, fee=FEE, mu=None, price_offset=None):
+    """
+    Settles the legs rule picks at their ask and returns (daily, summary):
+      daily:   per day trades, pnl, cumulative pnl and drawdown
+      summary: pnl, trades, days traded, hit rate, capital, return on capital, max drawdown, mean edge
+    With price_offset (dollars) a picked leg is sent as send_order's limit order at the model's fair
+    value plus price_offset and only trades (at the ask) if that limit reaches the ask; without it
+    every picked leg trades.
+    """
+    rule = rule or best_edge("no")
+    edge_yes, edge_no = data.edges(sigma, mu)
+    buy_yes, buy_no = rule(data.day, edge_yes, edge_no)
+    if price_offset is not None:
+        buy_yes = buy_yes & limit_fills(edge_yes, data.yes_ask, price_offset)
+        buy_no = buy_no & limit_fills(edge_no, data.no_ask, price_offset)
+    n = data.n_days
+
+    wins = np.concatenate([data.yes_wins[buy_yes], ~data.yes_wins[buy_no]])
+    cost = np.concatenate([data.yes_ask[buy_yes], data.no_ask[buy_no]])
+    edge = np.concatenate([edge_yes[buy_yes], edge_no[buy_no]])
+    day = np.concatenate([data.day[buy_yes], data.day[buy_no]])
+    pnl = wins - cost - fee
+
+    daily_pnl = np.bincount(day, weights=pnl, minlength=n)
+    trades = np.bincount(day, minlength=n)
+    cum = np.cumsum(daily_pnl)
+    drawdown = cum - np.maximum.accumulate(np.r_[0.0, cum])[1:]
+
+    daily = pd.DataFrame({"DATE": data.days, "trades": trades, "pnl": daily_pnl, "cum_pnl": cum, "drawdown": drawdown})
+    summary = {
+        "pnl": float(pnl.sum()),
+        "trades": int(len(pnl)),
+        "days_traded": int((trades > 0).sum()),
+        "hit_rate": float(wins.mean()) if len(wins) else np.nan,
+        "capital": float(cost.sum()),
+        "return_on_capital": float(pnl.sum() / cost.sum()) if cost.sum() else np.nan,
+        "max_drawdown": float(drawdown.min()) if n else 0.0,
+        "mean_edge": float(edge.mean()) if len(edge) else np.nan,
+    }
+    return daily, summary
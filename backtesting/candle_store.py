@@ -0,0 +1,165 @@
+import sys
+from datetime import datetime, date, timedelta, timezone
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "inference_KLAX"))
+from columnar import write_columns, read_partitions, is_partition, partition_rows
+from get_market_data import KALSHI_READ_RATE, _to_date, _event_ticker_for_day, fetch_daily_candles
+
+STORE_DIR = Path(__file__).resolve().parent / "candle_store"   # backtesting/candle_store/
+
+# an event for day D trades from the day before until D ends in Pacific time
+HISTORY_START = timedelta(days=-1)
+HISTORY_END = timedelta(days=1, hours=8)
+
+CANDLE_COLUMNS = ["event_ticker", "day", "ticker", "end_period_ts", "yes_ask", "yes_bid", "price", "volume", "open_interest"]
+
+
+def settled(d, now=None):
+    """
+    Whether day d's event has stopped trading (its history window has ended) by now (UTC).
+    """
+    now = now or datetime.now(timezone.utc)
+    return datetime(d.year, d.month, d.day, tzinfo=timezone.utc) + HISTORY_END <= now
+
+
+class CandleStore:
+    """
+    Full 1-minute candle history of every market, one columnar partition per series and event date:
+      <root>/<series_ticker>/<YYYY-MM-DD>/<column>.npy
+
+    Settled events never change, so a partition is written once and only days that are
+    missing locally are ever requested from the API. A day is stored once its trading window
+    has ended (settled()); days that have not are fetched but not stored. A settled day that
+    returned no candles is stored as an empty partition, so it is not requested again.
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+
+    def _partition(self, series_ticker, d):
+        return self.root / series_ticker / d.isoformat()
+
+    def days(self, series_ticker):
+        """
+        Event dates stored for a series.
+        """
+        series_dir = self.root / series_ticker
+        if not series_dir.exists():
+            return []
+        return sorted(date.fromisoformat(p.name) for p in series_dir.iterdir() if is_partition(p))
+
+    def missing_days(self, series_ticker, start_date, end_date):
+        have = set(self.days(series_ticker))
+        d, end_d = _to_date(start_date), _to_date(end_date)
+        out = []
+        while d <= end_d:
+            if d not in have:
+                out.append(d)
+            d += timedelta(days=1)
+        return out
+
+    def read(self, series_ticker, start_date, end_date, columns=None):
+        """
+        Candles for the stored event dates in [start_date, end_date], reading only those partitions.
+        """
+        start_d, end_d = _to_date(start_date), _to_date(end_date)
+        paths = [self._partition(series_ticker, d) for d in self.days(series_ticker) if start_d <= d <= end_d]
+        paths = [p for p in paths if partition_rows(p)]
+        return read_partitions(paths, columns) if paths else pd.DataFrame(columns=columns or CANDLE_COLUMNS)
+
+    def fetch_missing(self, series_ticker, start_date, end_date, max_workers=8, rate=KALSHI_READ_RATE, client=None):
+        """
+        Downloads the full history of every day in the range that is not stored yet and stores the
+        settled ones. Returns (candles for the fetched days, failed days).
+        """
+        missing = self.missing_days(series_ticker, start_date, end_date)
+        if not missing:
+            return pd.DataFrame(columns=CANDLE_COLUMNS), pd.DataFrame(columns=["day", "event_ticker", "error"])
+        table = history_request_table(series_ticker, missing)
+        candles, failed = fetch_daily_candles(table, max_workers=max_workers, rate=rate, client=client, raw=True)
+        candles = candles.reindex(columns=CANDLE_COLUMNS)
+        now = datetime.now(timezone.utc)
+        for day, part in candles.groupby("day", sort=False):
+            d = date.fromisoformat(day)
+            if settled(d, now):
+                write_columns(self._partition(series_ticker, d), part.reset_index(drop=True))
+        # settled days that answered without candles (not failed ones, which are retried)
+        answered = set(candles["day"]) | set(failed["day"])
+        for d in missing:
+            if d.isoformat() not in answered and settled(d, now):
+                write_columns(self._partition(series_ticker, d), pd.DataFrame(columns=CANDLE_COLUMNS))
+        return candles, failed
+
+    def load(self, series_ticker, start_date, end_date, fetch=True, **kwargs):
+        """
+        Candles for every day in the range: stored partitions plus, if fetch, whatever was missing.
+        """
+        fresh = pd.DataFrame(columns=CANDLE_COLUMNS)
+        if fetch:
+            fresh, failed = self.fetch_missing(series_ticker, start_date, end_date, **kwargs)
+            if not failed.empty:
+                print(f"{len(failed)} day(s) failed to download:")
+                print(failed.to_string(index=False))
+        stored = self.read(series_ticker, start_date, end_date)
+        if not fresh.empty:
+            # days that are not settled yet were fetched but not stored
+            stored_days = set(stored["day"]) if not stored.empty else set()
+            fresh = fresh[~fresh["day"].isin(stored_days)]
+            stored = pd.concat([stored, fresh], ignore_index=True)
+        return stored
+
+
+def history_request_table(series_ticker, days):
+    """
+    One request per event date covering the event's whole trading window.
+    """
+    rows = []
+    for d in days:
+        midnight = datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+        rows.append({
+            "series_ticker": series_ticker,
+            "event_ticker": _event_ticker_for_day(series_ticker, d),
+            "start_ts": int((midnight + HISTORY_START).timestamp()),
+            "end_ts": int((midnight + HISTORY_END).timestamp()),
+            "target_ts": None,
+            "day": d.isoformat(),
+        })
+    return pd.DataFrame(rows)
+
+
+def candles_asof(candles, request_table):
+    """
+    Vectorized as-of lookup, parse_event_candles on the day's request window in one pass over all
+    days: for every market, among its candles with end_period_ts in the day's [start_ts, end_ts],
+    the last one ending by target_ts (or the earliest in the window if none does). Markets without
+    a candle in the window are left out.
+    Returns the same columns as fetch_daily_candles_from_table: ticker, threshold_type, threshold,
+    yes_ask, day, event_ticker.
+    """
+    req = request_table.set_index("event_ticker")
+    c = candles[candles["event_ticker"].isin(req.index)]
+    ts = c["end_period_ts"].to_numpy(dtype="int64")
+    inside = ((ts >= c["event_ticker"].map(req["start_ts"]).to_numpy(dtype="int64"))
+              & (ts <= c["event_ticker"].map(req["end_ts"]).to_numpy(dtype="int64")))
+    c, ts = c[inside], ts[inside]
+    target = c["event_ticker"].map(req["target_ts"]).to_numpy(dtype="int64")
+    # codes number the markets in the order the API returns them
+    codes, _ = pd.factorize(c["ticker"])
+    valid = ts <= target
+    # per market: valid candles rank above invalid ones; among valid the latest wins, among invalid the earliest
+    order = np.lexsort((np.where(valid, ts, -ts), valid, codes))
+    last_of_market = np.r_[codes[order][1:] != codes[order][:-1], True]
+    picked = c.iloc[order[last_of_market]]
+
+    parts = picked["ticker"].str.extract(r"-([TB])(\d+(?:\.\d+)?)$")
+    return pd.DataFrame({
+        "ticker": picked["ticker"].to_numpy(),
+        "threshold_type": parts[0].to_numpy(),
+        "threshold": parts[1].astype("float64").to_numpy(),
+        "yes_ask": picked["yes_ask"].to_numpy(dtype="float64"),
+        "day": picked["day"].to_numpy(),
+        "event_ticker": picked["event_ticker"].to_numpy(),
+    })
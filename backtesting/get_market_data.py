@@ -3,22 +3,59 @@ import re
 import pandas as pd
 from datetime import datetime, date, time, timedelta, timezone
 import time
+import sys
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "inference_KLAX"))
+from kalshi_client import KALSHI_API, KALSHI_READ_RATE, KalshiClient, public_client
 
 market_ticker = "KXHIGHLAX"
 
-def get_event_candles(series_ticker, event_ticker, start_ts, end_ts, target_ts=None):
+def get_event_candles(series_ticker, event_ticker, start_ts, end_ts, target_ts=None, client=None):
     """
     Get candles for an event. If target_ts is provided, returns the candle
     closest to but not after the target timestamp.
     """
-    url = f"https://api.elections.kalshi.com/trade-api/v2/series/{series_ticker}/events/{event_ticker}/candlesticks"
+    response = get_event_candlesticks(series_ticker, event_ticker, start_ts, end_ts, client)
+    return parse_event_candles(response, target_ts)
+
+
+def get_event_candlesticks(series_ticker, event_ticker, start_ts, end_ts, client=None):
+    """
+    Raw 1-minute candlesticks response for every market of an event between start_ts and end_ts.
+    """
+    client = client or public_client()
     params = {"start_ts": int(start_ts), "end_ts": int(end_ts), "period_interval": 1}
+    return client.get(f"/series/{series_ticker}/events/{event_ticker}/candlesticks", params=params)
+
 
-    r = requests.get(url, params=params)
-    r.raise_for_status()
+def _close(c, field):
+    v = (c.get(field) or {}).get("close_dollars")
+    return float(v) if v is not None else float("nan")
 
-    response = r.json()
 
+def parse_candle_history(response):
+    """
+    Every candle of a candlesticks response as one flat frame:
+    ticker, end_period_ts, yes_ask, yes_bid, price, volume, open_interest.
+    """
+    rows = []
+    for ticker, candles in zip(response["market_tickers"], response["market_candlesticks"]):
+        for c in candles or []:
+            rows.append((ticker, c["end_period_ts"], _close(c, "yes_ask"), _close(c, "yes_bid"),
+                         _close(c, "price"), c.get("volume"), c.get("open_interest")))
+    df = pd.DataFrame(rows, columns=["ticker", "end_period_ts", "yes_ask", "yes_bid", "price", "volume", "open_interest"])
+    df["end_period_ts"] = df["end_period_ts"].astype("int64")
+    for c in ["volume", "open_interest"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce").astype("float64")
+    return df
+
+
+def parse_event_candles(response, target_ts=None):
+    """
+    One row per market from a candlesticks response: the candle picked as in get_event_candles.
+    """
     rows = []
 
     for ticker, candles in zip(response["market_tickers"], response["market_candlesticks"]):
@@ -101,24 +138,52 @@ def make_daily_request_table(series_ticker: str, start_date, end_date, target_hh
 
     return pd.DataFrame(rows)
 
-def fetch_daily_candles_from_table(request_table: pd.DataFrame):
+def fetch_daily_candles_from_table(request_table: pd.DataFrame, **kwargs):
+    """
+    Fetches one candle set per row of request_table (see fetch_daily_candles) and returns one combined
+    DataFrame containing all markets for all days (one candle/day/market, using the last candle <= target_ts).
+    Days that failed are printed and left out.
+    """
+    candles, failed = fetch_daily_candles(request_table, **kwargs)
+    if not failed.empty:
+        print(f"{len(failed)} day(s) failed to download:")
+        print(failed.to_string(index=False))
+    return candles
+
+def fetch_daily_candles(request_table: pd.DataFrame, max_workers=8, rate=KALSHI_READ_RATE, client=None, raw=False):
     """
-    Calls get_event_candles once per row and returns one combined DataFrame
-    containing all markets for all days (one candle/day/market, using the last candle <= target_ts).
+    Concurrent version of fetch_daily_candles_from_table: up to max_workers days in flight over one
+    pooled KalshiClient, whose read limiter keeps all requests under rate per second and which
+    retries 429/5xx with jittered backoff. A day that still fails does not stop the others.
+    With raw=True every candle in each day's window is kept (see parse_candle_history) instead of
+    the one picked at target_ts.
+    Returns (candles, failed) where failed has one row per day that could not be fetched.
     """
-    out = []
-    for _, r in request_table.iterrows():
-        time.sleep(0.5) 
-        df_day = get_event_candles(
+    client = client or KalshiClient(pool_size=max_workers, read_rate=rate)
+    rows = request_table.to_dict("records")
+
+    def fetch(r):
+        response = get_event_candlesticks(
             r["series_ticker"],
             r["event_ticker"],
             r["start_ts"],
             r["end_ts"],
-            target_ts=r["target_ts"],
+            client=client,
         )
+        df_day = parse_candle_history(response) if raw else parse_event_candles(response, r["target_ts"])
         df_day["day"] = r["day"]
         df_day["event_ticker"] = r["event_ticker"]
-        out.append(df_day)
-
-    return pd.concat(out, ignore_index=True)
-
+        return df_day
+
+    out, failed = [], []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(fetch, r) for r in rows]
+        # collect in table order so the result matches the serial version
+        for r, f in zip(rows, futures):
+            try:
+                out.append(f.result())
+            except Exception as e:
+                failed.append({"day": r["day"], "event_ticker": r["event_ticker"], "error": repr(e)})
+
+    candles = pd.concat(out, ignore_index=True) if out else pd.DataFrame()
+    return candles, pd.DataFrame(failed, columns=["day", "event_ticker", "error"])
@@ -1,4 +1,4 @@
-from get_weather_data import get_text, normalize_cli_text, extract_cli_yesterday, extract_cli_today, get_forecast, merge_data, save_results
+from get_weather_data import get_text, normalize_cli_text, extract_cli_yesterday, extract_cli_today, get_forecast, merge_data
 from model_copy import feature_engineering, make_prediction, get_ev
 
 
@@ -1,9 +1,15 @@
 import pandas as pd
-import math
 import numpy as np
 
 from xgboost import XGBRegressor
 import xgboost as xgb
+import sys
+from pathlib import Path
+
+# the EV engine is shared with the inference bot
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "inference_KLAX"))
+import ev
+from model import load_booster, predict_errors, predict_batch
 
 def feature_engineering(df):
     """
@@ -44,11 +50,10 @@ def feature_engineering(df):
 def make_prediction(df, best_model_path):
     """
     Makes a prediction using the trained model and adjusts the forecast.
+    For more than a handful of rows use predict_batch, which scores the whole frame at once.
     """
     inference_df = df
-    booster = xgb.Booster()
-    booster.load_model(best_model_path)
-    pred_error = booster.predict(xgb.DMatrix(inference_df))[0]
+    pred_error = predict_errors(inference_df, best_model_path)[0]
 
     forecast = df["forecasted_TMAX"].iloc[0]
     adjusted_forecast = forecast  + pred_error
@@ -56,9 +61,7 @@ def make_prediction(df, best_model_path):
     return adjusted_forecast
 
 
-
-
-def get_ev(markets: pd.DataFrame, mu: float, sigma: float) -> pd.DataFrame:
+def get_ev(markets: pd.DataFrame, mu, sigma) -> pd.DataFrame:
     """
     For each Kalshi contract row, compute:
       - p_yes: model-implied probability that YES settles to 1
@@ -70,61 +73,7 @@ def get_ev(markets: pd.DataFrame, mu: float, sigma: float) -> pd.DataFrame:
       - floor present only   -> unilateral: T >= floor
       - cap present only     -> unilateral: T < cap
 
-    Prices in the input are assumed to be in cents (0..100).
+    Prices in the input (candle closes) are assumed to be in dollars (0..1).
+    mu and sigma may be scalars or arrays aligned with the rows (see ev.get_ev).
     """
-
-    def norm_cdf(x: float) -> float:
-        # Standard normal CDF using erf (no scipy dependency)
-        return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
-
-    def prob_yes(row) -> float:
-        floor = row.get("floor")
-        cap = row.get("cap")
-
-        has_floor = pd.notna(floor)
-        has_cap = pd.notna(cap)
-
-        if has_floor and has_cap:
-            # P(floor <= T < cap)
-            z_u = (cap - mu) / sigma
-            z_l = (floor - mu) / sigma
-            p = norm_cdf(z_u) - norm_cdf(z_l)
-        elif has_floor and not has_cap:
-            # P(T >= floor)
-            z = (floor - mu) / sigma
-            p = 1.0 - norm_cdf(z)
-        elif has_cap and not has_floor:
-            # P(T < cap)
-            z = (cap - mu) / sigma
-            p = norm_cdf(z)
-        else:
-            # If both missing, cannot interpret the contract
-            p = float("nan")
-
-        # Numerical safety
-        if pd.notna(p):
-            p = max(0.0, min(1.0, p))
-        return p
-
-    out = markets.copy()
-
-    out["p_yes"] = out.apply(prob_yes, axis=1)
-    out["p_no"] = 1.0 - out["p_yes"]
-
-    # Maximum you're willing to pay (in cents)
-    out["max_yes_cents"] = ( out["p_yes"]).round(2)
-    out["max_no_cents"] = ( out["p_no"]).round(2)
-
-    # Compare to current asks (also in cents)
-    if "yes_ask" in out.columns:
-        out["edge_yes_cents"] = (out["max_yes_cents"] - out["yes_ask"]).round(2)
-    if "no_ask" in out.columns:
-        out["edge_no_cents"] = (out["max_no_cents"] - out["no_ask"]).round(2)
-
-    # Handy boolean suggestions (strictly positive edge)
-    if "yes_ask" in out.columns:
-        out["buy_yes"] = out["edge_yes_cents"] > 0
-    if "no_ask" in out.columns:
-        out["buy_no"] = out["edge_no_cents"] > 0
-
-    return out
\ No newline at end of file
+    return ev.get_ev(markets, mu, sigma, ask_scale=1.0, price_decimals=2)
@@ -0,0 +1,242 @@
+"""
+NBM reforecast history for KLAX from the gribstream history API, downloaded in multi-day windows
+by concurrent workers under a rate limit and checkpointed one day at a time, so an interrupted
+pull resumes where it stopped.
+
+Each day D is the forecast as of D-1 at asof_hour_utc, as in fetch_nextday_tmax_lax: for every
+hour of D, the latest NBM run issued at or before that time. One windowed request asks for the
+runs whose lead time can reach D from its as-of time (minHorizon/maxHorizon) and the as-of
+filtering is done here from each row's forecasted_at.
+
+    python backtesting/reforecast.py 2021-01-01 2025-08-01 --asof-hour 20
+"""
+import argparse
+import datetime as dt
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import StringIO
+from pathlib import Path
+import pandas as pd
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "inference_KLAX"))
+from columnar import write_columns, read_partitions, is_partition
+from http_utils import TokenBucket, make_session, request_with_retry
+
+GRIBSTREAM_URL = "https://gribstream.com/api/v2/nbm/history"
+TOKEN_ENV = "PRIVATE_KEY_reforecast"
+GRIBSTREAM_RATE = 2         # requests per second
+WINDOW_DAYS = 7             # days per request
+HORIZON_SLACK = 6           # hours: also accept runs up to this much older than the as-of time
+LAT_LAX, LON_LAX = 33.942, -118.408
+
+STORE_DIR = Path(__file__).resolve().parent / "reforecast_store"   # backtesting/reforecast_store/
+HOURLY_COLUMNS = ["forecasted_at", "forecasted_time", "tempK"]
+DAILY_COLUMNS = ["date_utc", "asof_utc", "tmax_K", "tmax_C", "tmax_F"]
+
+
+def gribstream_token():
+    """
+    API token from the environment (or a local .env).
+    """
+    load_dotenv()
+    token = os.getenv(TOKEN_ENV)
+    if not token:
+        raise ValueError(f"Missing {TOKEN_ENV} (set as environment variable or in .env)")
+    return token
+
+
+def _utc(d, hour=0):
+    return dt.datetime(d.year, d.month, d.day, hour, tzinfo=dt.timezone.utc)
+
+
+def _iso(t):
+    return t.isoformat().replace("+00:00", "Z")
+
+
+def asof_time(d, asof_hour_utc):
+    """
+    The as-of time of day d's forecast: the day before at asof_hour_utc.
+    """
+    return _utc(d - dt.timedelta(days=1), asof_hour_utc)
+
+
+class ReforecastStore:
+    """
+    Hourly NBM temperatures, one columnar partition per as-of hour and day:
+      <root>/asof<HH>/<YYYY-MM-DD>/<column>.npy
+    A day the API had no data for is stored with zero rows, so it is not asked for again.
+    """
+
+    def __init__(self, root=STORE_DIR, asof_hour_utc=12):
+        self.root = Path(root) / f"asof{asof_hour_utc:02d}"
+        self.asof_hour_utc = asof_hour_utc
+
+    def _partition(self, d):
+        return self.root / d.isoformat()
+
+    def days(self):
+        if not self.root.exists():
+            return []
+        return sorted(dt.date.fromisoformat(p.name) for p in self.root.iterdir() if is_partition(p))
+
+    def missing_days(self, start_date, end_date):
+        have = set(self.days())
+        n = (end_date - start_date).days + 1
+        return [d for d in (start_date + dt.timedelta(days=i) for i in range(n)) if d not in have]
+
+    def write_day(self, d, hourly):
+        write_columns(self._partition(d), hourly[HOURLY_COLUMNS].reset_index(drop=True))
+
+    def read(self, start_date, end_date):
+        paths = [self._partition(d) for d in self.days() if start_date <= d <= end_date]
+        return read_partitions(paths, HOURLY_COLUMNS)
+
+    def daily_tmax(self, start_date, end_date):
+        """
+        One row per stored day with data: date_utc, asof_utc and the day's max temperature in K, C and F
+        (the frame fetch_nextday_tmax_lax returns).
+        """
+        hourly = self.read(start_date, end_date)
+        if hourly.empty:
+            return pd.DataFrame(columns=DAILY_COLUMNS)
+        day = pd.to_datetime(hourly["forecasted_time"]).dt.date
+        tmax_K = hourly.groupby(day)["tempK"].max()
+        out = pd.DataFrame({"date_utc": [d.isoformat() for d in tmax_K.index],
+                            "asof_utc": [_iso(asof_time(d, self.asof_hour_utc)) for d in tmax_K.index],
+                            "tmax_K": tmax_K.to_numpy()})
+        out["tmax_C"] = out["tmax_K"] - 273.15
+        out["tmax_F"] = out["tmax_C"] * 9 / 5 + 32
+        return out
+
+
+def windows(days, window_days=WINDOW_DAYS):
+    """
+    Splits sorted days into runs of consecutive days, at most window_days long.
+    """
+    out = []
+    for d in days:
+        if out and d - out[-1][-1] == dt.timedelta(days=1) and len(out[-1]) < window_days:
+            out[-1].append(d)
+        else:
+            out.append([d])
+    return out
+
+
+def _empty_hourly():
+    return pd.DataFrame({"forecasted_at": pd.Series(dtype="datetime64[ns]"),
+                         "forecasted_time": pd.Series(dtype="datetime64[ns]"),
+                         "tempK": pd.Series(dtype="float64")})
+
+
+def window_payload(days, asof_hour_utc, lat=LAT_LAX, lon=LON_LAX):
+    """
+    One history request covering every hour of days: runs from HORIZON_SLACK hours before the
+    first day's as-of time up to the last day's end.
+    """
+    first, last = days[0], days[-1]
+    return {
+        "fromTime": _iso(_utc(first)),
+        "untilTime": _iso(_utc(last + dt.timedelta(days=1))),
+        # lead times from the as-of time to the start / end of the day
+        "minHorizon": 24 - asof_hour_utc,
+        "maxHorizon": 48 - asof_hour_utc + HORIZON_SLACK,
+        "coordinates": [{"lat": lat, "lon": lon, "name": "KLAX"}],
+        "variables": [{"name": "TMP", "level": "2 m above ground", "info": "", "alias": "tempK"}],
+    }
+
+
+def split_days(df, days, asof_hour_utc):
+    """
+    The as-of rows of every day: for each forecasted hour, the latest run issued by the day's as-of time.
+    """
+    if df.empty:
+        return {d: _empty_hourly() for d in days}
+    df = df.assign(forecasted_at=pd.to_datetime(df["forecasted_at"], utc=True),
+                   forecasted_time=pd.to_datetime(df["forecasted_time"], utc=True))
+    day = df["forecasted_time"].dt.date
+    asof = pd.to_datetime(day.map(lambda d: asof_time(d, asof_hour_utc)), utc=True)
+    df = df[df["forecasted_at"] <= asof]
+    df = df.sort_values(["forecasted_time", "forecasted_at"]).drop_duplicates("forecasted_time", keep="last")
+    df = df.assign(forecasted_at=df["forecasted_at"].dt.tz_localize(None),
+                   forecasted_time=df["forecasted_time"].dt.tz_localize(None))
+    by_day = {d: part for d, part in df.groupby(df["forecasted_time"].dt.date)}
+    return {d: by_day.get(d, _empty_hourly()) for d in days}
+
+
+def _fetch_window(session, url, headers, days, asof_hour_utc, limiter, retries):
+    r = request_with_retry(session, "POST", url, retries=retries, limiter=limiter, timeout=60,
+                           json=window_payload(days, asof_hour_utc), headers=headers)
+    text = r.text
+    df = pd.read_csv(StringIO(text)) if text.strip() else _empty_hourly()
+    return split_days(df, days, asof_hour_utc)
+
+
+def download(start_date, end_date, asof_hour_utc=12, store=None, window_days=WINDOW_DAYS, max_workers=4,
+             rate=GRIBSTREAM_RATE, token=None, url=GRIBSTREAM_URL, retries=3, session=None):
+    """
+    Downloads every day in [start_date, end_date] not in the store yet and checkpoints each day as
+    soon as its window arrives. Returns a DataFrame of the days that failed (day, error); they stay
+    missing and are retried by the next call.
+    """
+    store = store or ReforecastStore(asof_hour_utc=asof_hour_utc)
+    missing = store.missing_days(start_date, end_date)
+    failed = []
+    if not missing:
+        return pd.DataFrame(failed, columns=["day", "error"])
+    token = token or gribstream_token()
+    headers = {"Content-Type": "application/json", "Accept": "text/csv", "Authorization": f"Bearer {token}"}
+    session = session or make_session(pool_size=max_workers)
+    limiter = TokenBucket(rate, capacity=1)
+    batches = windows(missing, window_days)
+    done = 0
+    print(f"{len(missing)} day(s) missing, {len(batches)} request(s)")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_fetch_window, session, url, headers, days, asof_hour_utc, limiter, retries): days
+                   for days in batches}
+        for f in as_completed(futures):
+            days = futures[f]
+            try:
+                for d, part in f.result().items():
+                    store.write_day(d, part)
+            except Exception as e:
+                failed.extend((d, f"{type(e).__name__}: {e}") for d in days)
+            done += len(days)
+            print(f"\rFetched {done}/{len(missing)} days ({len(failed)} failed) ...", end="", flush=True)
+    print()
+    return pd.DataFrame(failed, columns=["day", "error"]).sort_values("day", ignore_index=True)
+
+
+def fetch_nextday_tmax_lax(start_date, end_date, asof_hour_utc=12, **kwargs):
+    """
+    Next-day max temperature forecast for KLAX for every day in the range (see download),
+    downloading only the days that are not stored yet. Lists the days that are still missing.
+    """
+    store = kwargs.pop("store", None) or ReforecastStore(asof_hour_utc=asof_hour_utc)
+    failed = download(start_date, end_date, asof_hour_utc, store=store, **kwargs)
+    if not failed.empty:
+        print(f"{len(failed)} day(s) failed to download:")
+        print(failed.to_string(index=False))
+    return store.daily_tmax(start_date, end_date)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("start", type=dt.date.fromisoformat)
+    parser.add_argument("end", type=dt.date.fromisoformat)
+    parser.add_argument("--asof-hour", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--out", default=None, help="also write the daily table to this CSV")
+    args = parser.parse_args()
+    daily = fetch_nextday_tmax_lax(args.start, args.end, args.asof_hour, max_workers=args.workers)
+    store = ReforecastStore(asof_hour_utc=args.asof_hour)
+    missing = store.missing_days(args.start, args.end)
+    print(f"{len(daily)} day(s) with data, {len(missing)} missing")
+    if args.out:
+        daily.to_csv(args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Parameter sweep of the trading strategy over the full backtest history.
+
+Knobs: sigma, price_offset (cents over the model's fair value of send_order's limit order, its +2: a
+picked leg only trades if the ask is within it), target_hhmm (time of the price snapshot, as in
+make_daily_request_table), rule and min_edge (entry rule; -1 trades the day's pick whatever its
+edge, like send_order, which is where price_offset decides the fill). Every snapshot's
+BacktestData is joined once and placed in shared memory; a process pool evaluates the parameter
+sets against it and each result is appended to a JSON-lines file as it arrives, so an interrupted
+sweep resumes where it stopped.
+
+    python backtesting/sweep.py --predictions results.csv --realized backtesting_data.csv \
+        --start 2025-01-01 --end 2025-12-31 --sample 500
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from backtest import BacktestData, backtest, best_edge, all_positive
+from candle_store import CandleStore, candles_asof
+from get_market_data import make_daily_request_table
+
+RESULTS_PATH = Path(__file__).resolve().parent / "sweep_results.jsonl"
+
+DEFAULT_GRID = {
+    "sigma": [float(s) for s in np.arange(1.5, 4.01, 0.25)],
+    "price_offset": [0, 1, 2, 3],           # cents over fair value, the limit price
+    "target_hhmm": ["08:00", "12:00", "16:00", "20:00"],
+    "rule": ["best_no", "best_both", "all"],
+    "min_edge": [-1.0, 0.0, 0.02, 0.05, 0.1],
+}
+
+RULES = {
+    "best_no": lambda m: best_edge("no", m),
+    "best_yes": lambda m: best_edge("yes", m),
+    "best_both": lambda m: best_edge("both", m),
+    "all": lambda m: all_positive(min_edge=m),
+}
+
+
+def param_grid(grid):
+    """
+    Every combination of the grid's values, as dicts.
+    """
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def param_sample(grid, n, seed=0):
+    """
+    n distinct combinations drawn at random from the grid (all of them if the grid is smaller).
+    """
+    params = param_grid(grid)
+    return random.Random(seed).sample(params, min(n, len(params)))
+
+
+def param_key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+class SharedArrays:
+    """
+    A dict of NumPy arrays copied once into one shared memory block. spec is small and picklable;
+    attach(spec) in another process maps the same block without copying.
+    """
+
+    def __init__(self, arrays):
+        layout, offset = {}, 0
+        for k, a in arrays.items():
+            a = np.ascontiguousarray(a)
+            layout[k] = (offset, a.dtype.str, a.shape)
+            offset += -(-a.nbytes // 8) * 8   # keep every array 8-byte aligned
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.spec = (self.shm.name, layout)
+        for k, a in arrays.items():
+            off, dtype, shape = layout[k]
+            np.ndarray(shape, dtype, buffer=self.shm.buf, offset=off)[...] = a
+
+    @staticmethod
+    def attach(spec):
+        """
+        (shm, arrays): keep shm referenced for as long as the arrays are used.
+        """
+        name, layout = spec
+        shm = shared_memory.SharedMemory(name=name)
+        arrays = {k: np.ndarray(shape, dtype, buffer=shm.buf, offset=off) for k, (off, dtype, shape) in layout.items()}
+        return shm, arrays
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# per worker process: snapshot time -> BacktestData over shared memory
+_DATA = {}
+_SHM = []
+
+
+def _init_worker(specs):
+    for hhmm, spec in specs.items():
+        shm, arrays = SharedArrays.attach(spec)
+        _SHM.append(shm)
+        _DATA[hhmm] = BacktestData.from_arrays(arrays)
+
+
+def evaluate(data, params, fee=None):
+    """
+    Backtest summary of one parameter set on data.
+    """
+    rule = RULES[params["rule"]](params["min_edge"])
+    kwargs = {} if fee is None else {"fee": fee}
+    _, summary = backtest(data, params["sigma"], rule, price_offset=params["price_offset"] / 100, **kwargs)
+    return summary
+
+
+def _evaluate_chunk(chunk):
+    return [dict(params, **evaluate(_DATA[params["target_hhmm"]], params)) for params in chunk]
+
+
+def load_results(path=RESULTS_PATH):
+    """
+    Results written so far, one row per parameter set.
+    """
+    path = Path(path)
+    if not path.exists():
+        return pd.DataFrame()
+    with open(path) as f:
+        return pd.DataFrame([json.loads(line) for line in f if line.strip()])
+
+
+def ranked(results, metric="pnl", top=None):
+    """
+    Results sorted by metric, best first.
+    """
+    if results.empty:
+        return results
+    out = results.sort_values(metric, ascending=False, kind="stable").reset_index(drop=True)
+    return out if top is None else out.head(top)
+
+
+def _done_keys(path, keys):
+    results = load_results(path)
+    if results.empty:
+        return set()
+    return {param_key({k: r[k] for k in keys}) for r in results.to_dict("records")}
+
+
+def run_sweep(datasets, params, path=RESULTS_PATH, max_workers=None, chunksize=16, metric="pnl",
+              progress_every=5.0):
+    """
+    Evaluates every parameter set not yet in path on a process pool and appends each result as it arrives.
+
+    datasets maps target_hhmm to its BacktestData; they are placed in shared memory once and
+    attached by the workers. Progress (done, rate, ETA, best metric so far) is printed every
+    progress_every seconds. Returns the ranked table of everything in path.
+    """
+    path = Path(path)
+    done = _done_keys(path, params[0].keys()) if params else set()
+    todo = [p for p in params if param_key(p) not in done]
+    print(f"{len(params)} parameter sets, {len(params) - len(todo)} already done, {len(todo)} to run")
+    if not todo:
+        return ranked(load_results(path), metric)
+
+    missing = {p["target_hhmm"] for p in todo} - set(datasets)
+    if missing:
+        raise KeyError(f"no data for target_hhmm {sorted(missing)}")
+    shared = {hhmm: SharedArrays(data.arrays()) for hhmm, data in datasets.items()}
+    specs = {hhmm: s.spec for hhmm, s in shared.items()}
+    chunks = [todo[i:i + chunksize] for i in range(0, len(todo), chunksize)]
+    start = last = time.perf_counter()
+    n_done, best = 0, -np.inf
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as out, ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                                          initializer=_init_worker, initargs=(specs,)) as pool:
+            for future in as_completed([pool.submit(_evaluate_chunk, c) for c in chunks]):
+                for row in future.result():
+                    out.write(json.dumps(row) + "\n")
+                    n_done += 1
+                    if not np.isnan(row[metric]):
+                        best = max(best, row[metric])
+                out.flush()
+                now = time.perf_counter()
+                if now - last >= progress_every or n_done == len(todo):
+                    last = now
+                    rate = n_done / (now - start)
+                    print(f"{n_done}/{len(todo)} ({rate:.0f}/s, ETA {(len(todo) - n_done) / rate:.0f}s), "
+                          f"best {metric} {best:.3f}")
+    finally:
+        for s in shared.values():
+            s.close()
+    return ranked(load_results(path), metric)
+
+
+def load_datasets(predictions, realized, series_ticker, start_date, end_date, hhmms, store=None):
+    """
+    BacktestData for every snapshot time, from the locally stored candle history (no download).
+    """
+    candles = (store or CandleStore()).read(series_ticker, start_date, end_date)
+    out = {}
+    for hhmm in hhmms:
+        table = make_daily_request_table(series_ticker, start_date, end_date, target_hhmm=hhmm)
+        out[hhmm] = BacktestData(candles_asof(candles, table), predictions, realized)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--predictions", required=True, help="CSV with DATE and adjusted_forecast")
+    parser.add_argument("--realized", required=True, help="CSV with DATE and TMAX")
+    parser.add_argument("--series", default="KXHIGHLAX")
+    parser.add_argument("--start", required=True)
+    parser.add_argument("--end", required=True)
+    parser.add_argument("--sample", type=int, default=None, help="random parameter sets instead of the full grid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--metric", default="pnl")
+    parser.add_argument("--out", default=str(RESULTS_PATH))
+    args = parser.parse_args()
+
+    params = param_grid(DEFAULT_GRID) if args.sample is None else param_sample(DEFAULT_GRID, args.sample, args.seed)
+    datasets = load_datasets(pd.read_csv(args.predictions), pd.read_csv(args.realized), args.series,
+                             args.start, args.end, DEFAULT_GRID["target_hhmm"])
+    table = run_sweep(datasets, params, args.out, max_workers=args.workers, metric=args.metric)
+    print(table.head(20).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Full-history backtest on synthetic KXHIGHLAX-style data: the notebook path (add_floor_cap per
+event, compute_daily_evs, idxmax per event, merge with TMAX, PnL cells) against
+backtest.BacktestData + backtest.backtest. Checks that both pick the same legs and settle them
+to the same PnL (get_ev rounds edges to the cent, so the notebook breaks ties by row order;
+picks are compared on their rounded edge and PnL against a plain per-day loop), and that
+add_bounds places every market as add_floor_cap does: on the synthetic history, on odd event
+layouts (a T threshold inside the buckets, events without buckets) and on the locally stored
+candle history (candle_store.CandleStore) if there is one.
+
+    python benchmarks/bench_backtest.py --days 365 --store backtesting/candle_store
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backtesting"))
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+import pandas as pd
+import ev
+from backtest import BacktestData, add_bounds, backtest, best_edge, all_positive, threshold, settles_yes
+
+SIGMA = 2.5324872296670837
+
+
+def synthetic_history(days, seed=0):
+    """
+    as-of prices (candles_asof layout), predictions and realized TMAX for `days` days.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2025-01-01", periods=days, freq="D")
+    tmax = np.round(70 + 6 * np.sin(np.arange(days) / 58) + rng.normal(0, 3, days))
+    mu = tmax + rng.normal(0, 2.5, days)
+    market_mu = tmax + rng.normal(0, 3.0, days)
+    rows = []
+    for d, day in enumerate(dates):
+        event = f"KXHIGHLAX-{day.strftime('%y%b%d').upper()}"
+        base = int(round(market_mu[d])) - 4
+        specs = [("T", base)] + [("B", base + 2 * i + 0.5) for i in range(4)] + [("T", base + 7)]
+        for kind, thr in specs:
+            rows.append({"ticker": f"{event}-{kind}{thr:g}", "threshold_type": kind, "threshold": float(thr),
+                         "day": day.date().isoformat(), "event_ticker": event})
+    prices = pd.DataFrame(rows)
+    bounded = add_bounds(prices)
+    p = ev.prob_yes(bounded["floor"], bounded["cap"], np.repeat(market_mu, 6), 3.0)
+    prices["yes_ask"] = np.clip(np.round(p + rng.normal(0.02, 0.03, len(p)), 2), 0.01, 0.99)
+    predictions = pd.DataFrame({"DATE": dates, "adjusted_forecast": mu})
+    realized = pd.DataFrame({"DATE": dates, "TMAX": tmax})
+    return prices, predictions, realized
+
+
+def add_floor_cap(df, group_cols=("day", "event_ticker")):
+    # backtesting.ipynb cell 8
+    out = df.copy()
+    out["floor"] = np.nan
+    out["cap"] = np.nan
+    is_B = out["threshold_type"].eq("B")
+    out.loc[is_B, "floor"] = out.loc[is_B, "threshold"] - 0.5
+    out.loc[is_B, "cap"] = out.loc[is_B, "threshold"] + 0.5
+
+    def _assign_tails(g):
+        g = g.copy()
+        t_idx = g.index[g["threshold_type"].eq("T")]
+        if len(t_idx) == 0:
+            return g
+        b = g[g["threshold_type"].eq("B")]
+        if not b.empty:
+            min_b_floor = (b["threshold"] - 0.5).min()
+            max_b_cap = (b["threshold"] + 0.5).max()
+            for i in t_idx:
+                thr = float(g.loc[i, "threshold"])
+                if thr <= min_b_floor + 1e-9:
+                    g.loc[i, "floor"] = np.nan
+                    g.loc[i, "cap"] = thr
+                elif thr >= max_b_cap - 1e-9:
+                    g.loc[i, "floor"] = thr
+                    g.loc[i, "cap"] = np.nan
+            return g
+        t_vals = g.loc[t_idx, "threshold"].astype(float)
+        t_min, t_max = t_vals.min(), t_vals.max()
+        g.loc[t_idx[t_vals.eq(t_min)], "cap"] = t_min
+        g.loc[t_idx[t_vals.eq(t_max)], "floor"] = t_max
+        return g
+
+    return out.groupby(list(group_cols), group_keys=False).apply(_assign_tails)
+
+
+def notebook_backtest(prices, predictions, realized, sigma):
+    # cells 8-10, 12 (compute_daily_evs, unrounded edges), 15-23
+    markets_df = add_floor_cap(prices)
+    markets_df["no_ask"] = 1 - markets_df["yes_ask"]
+    markets = markets_df.copy()
+    markets["day"] = pd.to_datetime(markets["day"]).dt.date
+    day_mu = predictions.assign(DATE=pd.to_datetime(predictions["DATE"]).dt.date).set_index("DATE")["adjusted_forecast"]
+    markets = markets.sort_values("day", kind="stable")
+    mu = markets["day"].map(day_mu)
+    ev_df = ev.get_ev(markets, mu.to_numpy(), sigma, ask_scale=1.0)
+    df_max = ev_df.loc[ev_df.groupby("event_ticker")["edge_no_cents"].idxmax()]
+    df_pnl = df_max[["day", "ticker", "edge_no_cents", "floor", "cap", "no_ask"]].rename(columns={"day": "DATE"})
+    df_pnl["DATE"] = pd.to_datetime(df_pnl["DATE"])
+    df_pnl = df_pnl.merge(realized, on="DATE")
+    df_pnl["fee"] = 0.02
+    # the notebook's outcome cell only handles buckets; settle like the engine to compare PnL
+    df_pnl["outcome"] = (~settles_yes(df_pnl["floor"].to_numpy(), df_pnl["cap"].to_numpy(),
+                                      df_pnl["TMAX"].to_numpy())).astype(int)
+    df_pnl["pnl_1_contract"] = df_pnl["outcome"] - df_pnl["no_ask"] - df_pnl["fee"]
+    return df_pnl
+
+
+def odd_layouts():
+    """
+    Events add_floor_cap handles specially: a T threshold between the buckets, T markets only.
+    """
+    rows = []
+    for event, specs in [("ODD-A", [("T", 60), ("B", 61.5), ("T", 63), ("B", 65.5), ("T", 67)]),
+                         ("ODD-B", [("T", 60), ("T", 64), ("T", 70)]),
+                         ("ODD-C", [("T", 62)])]:
+        for kind, thr in specs:
+            rows.append({"ticker": f"{event}-{kind}{thr:g}", "threshold_type": kind, "threshold": float(thr),
+                         "day": "2025-01-01", "event_ticker": event})
+    return pd.DataFrame(rows)
+
+
+def check_bounds(prices):
+    """
+    add_bounds against add_floor_cap, row for row; returns the number of markets left unplaced.
+    """
+    new, legacy = add_bounds(prices), add_floor_cap(prices).loc[prices.index]
+    pd.testing.assert_frame_equal(new[["floor", "cap"]], legacy[["floor", "cap"]])
+    return int((new["floor"].isna() & new["cap"].isna()).sum())
+
+
+def stored_prices(root, series_ticker="KXHIGHLAX"):
+    """
+    The 12:00 UTC as-of prices of every day in the local candle store, None if it holds nothing.
+    """
+    from candle_store import CandleStore, candles_asof
+    from get_market_data import make_daily_request_table
+    store = CandleStore(root)
+    days = store.days(series_ticker)
+    if not len(days):
+        return None
+    candles = store.read(series_ticker, min(days), max(days))
+    return candles_asof(candles, make_daily_request_table(series_ticker, min(days), max(days)))
+
+
+def reference_pnl(data, edge_no, fee=0.02):
+    # one day at a time: buy the NO with the highest edge, settle it on TMAX
+    total = 0.0
+    for d in range(data.n_days):
+        rows = np.flatnonzero(data.day == d)
+        i = rows[np.argmax(edge_no[rows])]
+        total += (not data.yes_wins[i]) - data.no_ask[i] - fee
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--store", default=None, help="candle store to check add_bounds on (default backtesting/candle_store)")
+    args = parser.parse_args()
+    prices, predictions, realized = synthetic_history(args.days)
+
+    assert check_bounds(prices) == 0
+    odd = odd_layouts()
+    assert check_bounds(odd) == 2   # ODD-A-T63 and ODD-B-T64
+    stored = stored_prices(args.store or ROOT / "backtesting" / "candle_store")
+    stored_note = "no local candle store" if stored is None else \
+        f"stored history: {len(stored)} markets match add_floor_cap, {check_bounds(stored)} left unplaced"
+
+    t0 = time.perf_counter()
+    df_pnl = notebook_backtest(prices, predictions, realized, SIGMA)
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    data = BacktestData(prices, predictions, realized)
+    t_join = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        daily, summary = backtest(data, SIGMA, best_edge("no"))
+    t_run = (time.perf_counter() - t0) / args.repeat
+
+    edge_yes, edge_no = data.edges(SIGMA)
+    picked = best_edge("no")(data.day, edge_yes, edge_no)[1]
+    assert picked.sum() == len(df_pnl)
+    assert np.allclose(np.round(edge_no[picked], 2), df_pnl.sort_values("DATE")["edge_no_cents"])
+    assert np.isclose(summary["pnl"], reference_pnl(data, edge_no))
+
+    print("------------------")
+    print(f"{args.days} days, {len(data)} market-days")
+    print(f"notebook cells:           {t_legacy * 1000:8.1f} ms")
+    print(f"BacktestData (join once): {t_join * 1000:8.1f} ms")
+    print(f"backtest per run:         {t_run * 1000:8.2f} ms")
+    print(stored_note)
+    rules = {"best NO": best_edge("no"), "best either side": best_edge("both"),
+             "all positive": all_positive(), "best NO > 0.2": threshold(0.2)}
+    table = pd.DataFrame({name: backtest(data, SIGMA, rule)[1] for name, rule in rules.items()}).T
+    print(table.round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
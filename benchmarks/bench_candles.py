@@ -0,0 +1,88 @@
+"""
+One-year candle pull: the old serial loop (sleep 0.5 + unpooled requests.get per day) against
+the rate-limited concurrent fetch_daily_candles, both against a local mock Kalshi endpoint.
+Also checks that candle_store.candles_asof on whole-window histories picks what the per-day
+requests picked, and drops a market with no candle in the day's request window.
+
+    python benchmarks/bench_candles.py --days 365 --latency 0.05
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backtesting"))
+
+import pandas as pd
+import requests
+from stubs import KalshiStub
+from get_market_data import make_daily_request_table, parse_event_candles, fetch_daily_candles
+from candle_store import candles_asof, history_request_table
+from kalshi_client import KalshiClient
+
+
+def legacy_fetch(request_table, base_url, pause):
+    out = []
+    for _, r in request_table.iterrows():
+        time.sleep(pause)
+        url = f"{base_url}/series/{r['series_ticker']}/events/{r['event_ticker']}/candlesticks"
+        resp = requests.get(url, params={"start_ts": r["start_ts"], "end_ts": r["end_ts"], "period_interval": 1})
+        resp.raise_for_status()
+        df_day = parse_event_candles(resp.json(), r["target_ts"])
+        df_day["day"] = r["day"]
+        df_day["event_ticker"] = r["event_ticker"]
+        out.append(df_day)
+    return pd.concat(out, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=20, help="client-side requests/second")
+    parser.add_argument("--legacy-days", type=int, default=20, help="days timed on the serial path")
+    args = parser.parse_args()
+
+    req = make_daily_request_table("KXHIGHLAX", "2025-01-01", pd.Timestamp("2025-01-01").date() + pd.Timedelta(days=args.days - 1))
+    fail = set(req["event_ticker"].iloc[[10, 200]]) if args.days > 200 else set()
+
+    with KalshiStub(latency=args.latency, rate=20) as stub:
+        t0 = time.perf_counter()
+        legacy = legacy_fetch(req.iloc[:args.legacy_days], stub.api_url, pause=0.5)
+        t_legacy = (time.perf_counter() - t0) / args.legacy_days * args.days
+
+    with KalshiStub(latency=args.latency, fail_events=fail, flaky=0.05, rate=20) as stub:
+        t0 = time.perf_counter()
+        client = KalshiClient(base_url=stub.api_url, pool_size=args.workers, read_rate=args.rate)
+        candles, failed = fetch_daily_candles(req, max_workers=args.workers, client=client)
+        t_new = time.perf_counter() - t0
+        throttled = stub.throttled
+
+    with KalshiStub(latency=0) as stub:
+        days = pd.to_datetime(req["day"].iloc[:args.legacy_days]).dt.date
+        history, _ = fetch_daily_candles(history_request_table("KXHIGHLAX", days),
+                                         client=KalshiClient(base_url=stub.api_url), raw=True)
+
+    legacy = legacy[~legacy["event_ticker"].isin(fail)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(candles[candles["day"].isin(legacy["day"])].reset_index(drop=True), legacy)
+    assert set(failed["event_ticker"]) == fail
+
+    asof = candles_asof(history, req)
+    pd.testing.assert_frame_equal(asof[~asof["event_ticker"].isin(fail)].reset_index(drop=True),
+                                  legacy[candles.columns].reset_index(drop=True), check_dtype=False)
+    # a market whose candles all lie outside the day's request window is dropped, not priced from them
+    r = req.iloc[0]
+    gone = legacy["ticker"].iloc[0]
+    outside = (history["ticker"] == gone) & history["end_period_ts"].between(r["start_ts"], r["end_ts"])
+    assert gone not in set(candles_asof(history[~outside], req)["ticker"])
+    print("------------------")
+    print(f"{args.days} days, {args.latency}s latency, server limit 20 req/s, 5% transient 503s")
+    print(f"serial + sleep(0.5) (extrapolated): {t_legacy:7.1f}s")
+    print(f"fetch_daily_candles:                {t_new:7.1f}s ({args.days / t_new:.1f} days/s, {throttled} throttled)")
+    print(f"failed days reported: {sorted(failed['day'])}")
+
+
+if __name__ == "__main__":
+    main()
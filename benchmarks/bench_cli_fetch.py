@@ -0,0 +1,54 @@
+"""
+Serial vs concurrent extract_cli_yesterday against a local CLI stub with per-request latency.
+
+    python benchmarks/bench_cli_fetch.py --latency 0.2 --workers 8
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import pandas as pd
+from stubs import cli_stub, make_cli_versions, CLI_PATH
+from get_data import extract_cli_yesterday
+
+
+def timed(fn, **kwargs):
+    t0 = time.perf_counter()
+    df = fn(**kwargs)
+    return time.perf_counter() - t0, df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds the stub waits per request")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--versions", type=int, default=50)
+    parser.add_argument("--min-dates", type=int, default=7)
+    args = parser.parse_args()
+
+    texts = make_cli_versions(args.versions - 1)
+    with cli_stub(texts, latency=args.latency) as stub:
+        url = stub.url + CLI_PATH
+        t_serial, df_serial = timed(extract_cli_yesterday, version=args.versions, url=url)
+        t_conc, df_conc = timed(extract_cli_yesterday, version=args.versions, url=url,
+                                concurrent=True, max_workers=args.workers)
+        before = stub.requests
+        t_early, df_early = timed(extract_cli_yesterday, version=args.versions, url=url,
+                                  concurrent=True, max_workers=args.workers, min_dates=args.min_dates)
+        early_requests = stub.requests - before
+
+    pd.testing.assert_frame_equal(df_serial, df_conc)
+    pd.testing.assert_frame_equal(df_serial.iloc[:len(df_early)], df_early)
+    print("------------------")
+    print(f"latency {args.latency}s, {args.versions - 1} versions, {args.workers} workers")
+    print(f"serial:                 {t_serial:.2f}s")
+    print(f"concurrent:             {t_conc:.2f}s ({t_serial / t_conc:.1f}x)")
+    print(f"concurrent, {args.min_dates} dates:    {t_early:.2f}s ({early_requests} requests)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Throughput of the single-pass CLI parser against the old normalize + per-field re.search path.
+
+    python benchmarks/bench_cli_parser.py                                   # generated corpus
+    python benchmarks/bench_cli_parser.py --corpus inference_KLAX/cli_cache/raw
+"""
+import argparse
+import datetime as dt
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+from stubs import make_cli_text
+from get_data import normalize_cli_text
+from cli_parser import parse_cli_report, parse_cli_reports
+
+# the parsing code as it was before cli_parser, kept here as the baseline
+LEGACY_YESTERDAY = {
+    "DATE": r"CA CLIMATE SUMMARY FOR (\w+ \d{1,2} \d{4})",
+    "TMAX": r"YESTERDAY\s+MAXIMUM\s+(\d+)",
+    "TMIN": r"MINIMUM\s+(\d+)",
+    "PRCP": r"PRECIPITATION\s*\(IN\)\s*YESTERDAY\s+([0-9]+(?:\.[0-9]+)?)",
+    "AWND": r"AVERAGE WIND SPEED\s+([\d.]+)",
+    "WDF2": r"HIGHEST WIND DIRECTION\s+\w+\s+\((\d+)\)",
+    "WSF2": r"HIGHEST WIND SPEED\s+(\d+)",
+}
+LEGACY_TODAY = dict(LEGACY_YESTERDAY, TMAX=r"TODAY\s+MAXIMUM\s+(\d+)",
+                    PRCP=r"PRECIPITATION\s*\(IN\)\s*TODAY\s+([0-9]+(?:\.[0-9]+)?)")
+
+
+def legacy_parse(text):
+    text = normalize_cli_text(text)
+    yesterday = today = None
+    if re.search(r"YESTERDAY", text):
+        yesterday = {k: (m.group(1) if (m := re.search(p, text, flags=re.MULTILINE | re.DOTALL)) else None)
+                     for k, p in LEGACY_YESTERDAY.items()}
+    if re.search(r"TEMPERATURE\s*\(F\)[\s\S]*?\bTODAY\b", text):
+        today = {k: (m.group(1) if (m := re.search(p, text, flags=re.IGNORECASE | re.MULTILINE | re.DOTALL)) else None)
+                 for k, p in LEGACY_TODAY.items()}
+    return yesterday, today
+
+
+def same_row(legacy, new):
+    if legacy is None or new is None:
+        return legacy is new
+    for k, v in legacy.items():
+        if k == "DATE":
+            ok = dt.datetime.strptime(v, "%B %d %Y").date().isoformat() == new[k]
+        else:
+            ok = (v is None and new[k] is None) or float(v) == new[k]
+        if not ok:
+            return False
+    return True
+
+
+def make_corpus(n, seed=0):
+    rng = random.Random(seed)
+    start = dt.date(2015, 1, 1)
+    texts = []
+    for i in range(n):
+        day = start + dt.timedelta(days=i // 2)
+        text = make_cli_text(day, rng.randint(55, 100), rng.randint(40, 65), rng.choice([0.0, 0.0, 0.31]),
+                             section="YESTERDAY" if i % 2 else "TODAY")
+        texts.append(text.replace("\n", "\r\n") if i % 3 == 0 else text)   # some raw, some already clean
+    return texts
+
+
+def rate(fn, texts):
+    t0 = time.perf_counter()
+    fn(texts)
+    return len(texts) / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", type=Path, help="directory of saved CLI .txt reports")
+    parser.add_argument("-n", type=int, default=5000, help="generated corpus size")
+    args = parser.parse_args()
+
+    texts = [p.read_text() for p in sorted(args.corpus.glob("*.txt"))] if args.corpus else make_corpus(args.n)
+
+    for text in texts:
+        y, t = legacy_parse(text)
+        rec = parse_cli_report(text)
+        assert same_row(y, rec.yesterday()) and same_row(t, rec.today()), text
+
+    legacy = rate(lambda ts: [legacy_parse(t) for t in ts], texts)
+    single = rate(lambda ts: [parse_cli_report(t) for t in ts], texts)
+    bulk = rate(parse_cli_reports, texts)
+    print("------------------")
+    print(f"{len(texts)} reports, parsed identically by both paths")
+    print(f"legacy normalize + re.search: {legacy:10.0f} reports/s")
+    print(f"parse_cli_report:             {single:10.0f} reports/s ({single / legacy:.1f}x)")
+    print(f"parse_cli_reports (frame):    {bulk:10.0f} reports/s ({bulk / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Multi-city inference: the engine run city by city (what running main.py once per series amounts to)
+against one run_cities call over all of them, on local stand-ins for weather.gov and Kalshi.
+Caches and feature states start empty in both runs. A fourth city with no CLI reports checks that
+a failing city doesn't hold up the others.
+
+    python benchmarks/bench_engine.py --cities 6 --latency 0.2
+"""
+import argparse
+import datetime as dt
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import pandas as pd
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from stubs import KalshiStub, nws_stub, make_cli_versions, CLI_PATH_TEMPLATE
+from kalshi_client import KalshiClient
+from cities import CITIES
+from engine import run_cities
+
+NAMES = ["LAX", "NYC", "CHI", "MIA", "AUS", "DEN", "PHIL", "SFO"]
+
+
+def make_cities(n, nws_url, root, broken=True):
+    cities = []
+    for i, name in enumerate(NAMES[:n] + (["BAD"] if broken else [])):
+        city = dict(CITIES[0], name=name, series_ticker=f"KXHIGH{name}", cli_issuedby=name,
+                    tz="UTC", office=None, grid=None, lat=30 + i, lon=-100 - i, trade=(i == 0),
+                    cli_cache=root / name / "cli_cache", state=root / name / "feature_state.json",
+                    forecast_cache=root / name / "forecast_cache", obs_store=root / name / "obs_store")
+        city["cli_url"] = nws_url + CLI_PATH_TEMPLATE.format(site="STB", issuedby=name)
+        cities.append(city)
+    return cities
+
+
+def timed_run(cities, nws_url, client, per_city):
+    t0 = time.perf_counter()
+    if per_city:
+        statuses = [run_cities([c], client=client, nws_api=nws_url)[1] for c in cities]
+        status = pd.concat(statuses, ignore_index=True)
+    else:
+        status = run_cities(cities, client=client, nws_api=nws_url)[1]
+    return time.perf_counter() - t0, status
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cities", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    today = dt.datetime.now(dt.timezone.utc).date()
+    texts = {name: make_cli_versions(today=today, seed=i) for i, name in enumerate(NAMES[:args.cities])}
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode("utf-8")
+
+    results = {}
+    with nws_stub(texts, latency=args.latency) as nws, \
+            KalshiStub(latency=args.latency, public_key=key.public_key(), rate=20) as kalshi:
+        for label, per_city in [("city by city", True), ("run_cities", False)]:
+            root = Path(tempfile.mkdtemp())
+            try:
+                cities = make_cities(args.cities, nws.url, root)
+                client = KalshiClient(key_id="key-id", private_key_pem=pem, base_url=kalshi.api_url)
+                results[label] = timed_run(cities, nws.url, client, per_city)
+            finally:
+                shutil.rmtree(root)
+        orders = len(kalshi.orders)
+
+    print("------------------")
+    print(f"{args.cities} cities + 1 broken, {args.latency}s latency on every request")
+    for label, (seconds, status) in results.items():
+        print(f"{label:14s} {seconds:6.2f}s, ok: {', '.join(status.loc[status['ok'], 'city'])}")
+    status = results["run_cities"][1]
+    assert status.set_index("city")["ok"].drop("BAD").all() and not status.set_index("city").loc["BAD", "ok"]
+    # the trading city's legs are placed once: the second run reuses the same client order ids
+    first, second = (results[k][1].set_index("city").loc["LAX", "orders"] for k in results)
+    assert orders == first and second == 0, (orders, first, second)
+    cols = ["city", "ok", "stage", "adjusted_forecast", "markets", "orders", "weather_s", "markets_s", "order_s"]
+    print(status[cols].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Row-wise (DataFrame.apply + math.erf) get_ev against the vectorized ev.get_ev.
+
+    python benchmarks/bench_ev.py --rows 1000 100000 10000000
+"""
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+import pandas as pd
+import ev
+
+LEGACY_MAX_ROWS = 100_000   # the apply path takes minutes beyond this
+
+
+def legacy_get_ev(markets, mu, sigma):
+    # get_ev as it was in inference_KLAX/model.py
+    def norm_cdf(x):
+        return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+    def prob_yes(row):
+        floor, cap = row.get("floor"), row.get("cap")
+        has_floor, has_cap = pd.notna(floor), pd.notna(cap)
+        if has_floor and has_cap:
+            p = norm_cdf((cap - mu) / sigma) - norm_cdf((floor - mu) / sigma)
+        elif has_floor:
+            p = 1.0 - norm_cdf((floor - mu) / sigma)
+        elif has_cap:
+            p = norm_cdf((cap - mu) / sigma)
+        else:
+            p = float("nan")
+        if pd.notna(p):
+            p = max(0.0, min(1.0, p))
+        return p
+
+    out = markets.copy()
+    out["p_yes"] = out.apply(prob_yes, axis=1)
+    out["p_no"] = 1.0 - out["p_yes"]
+    out["max_yes_cents"] = out["p_yes"]
+    out["max_no_cents"] = out["p_no"]
+    out["edge_yes_cents"] = (out["max_yes_cents"] - (out["yes_ask"] / 100)).round(2)
+    out["edge_no_cents"] = (out["max_no_cents"] - (out["no_ask"] / 100)).round(2)
+    out["buy_yes"] = out["edge_yes_cents"] > 0
+    out["buy_no"] = out["edge_no_cents"] > 0
+    return out
+
+
+def make_markets(n, seed=0):
+    """
+    Six-contract events like KXHIGHLAX: lower tail, four 2-degree buckets, upper tail.
+    """
+    rng = np.random.default_rng(seed)
+    base = rng.integers(60, 85, size=n // 6 + 1).repeat(6)[:n].astype("float64")
+    slot = np.tile(np.arange(6), n // 6 + 1)[:n]
+    floor = np.where(slot == 0, np.nan, base + 2 * (slot - 1) - 0.5)
+    cap = np.where(slot == 5, np.nan, base + 2 * slot - 0.5)
+    yes_ask = rng.integers(1, 99, size=n).astype("float64")
+    return pd.DataFrame({"floor": floor, "cap": cap, "yes_ask": yes_ask, "no_ask": 100 - yes_ask + 1})
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return time.perf_counter() - t0, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 10_000_000])
+    parser.add_argument("--sigmas", type=int, default=50, help="sigma candidates in the broadcast run")
+    args = parser.parse_args()
+    mu, sigma = 72.3, 2.5324872296670837
+
+    print("------------------")
+    for n in args.rows:
+        markets = make_markets(n)
+        t_new, new = timed(ev.get_ev, markets, mu, sigma)
+        if n <= LEGACY_MAX_ROWS:
+            t_old, old = timed(legacy_get_ev, markets, mu, sigma)
+            np.testing.assert_allclose(new["p_yes"], old["p_yes"], rtol=0, atol=1e-12)
+            # edges are rounded to 2 decimals, so ulp differences may flip a value sitting on a boundary
+            assert (new["edge_no_cents"] - old["edge_no_cents"]).abs().max() <= 0.01 + 1e-12
+            assert list(new.columns) == list(old.columns)
+            print(f"{n:>10,} rows: row-wise {t_old:8.3f}s  vectorized {t_new:8.4f}s  ({t_old / t_new:,.0f}x)")
+        else:
+            print(f"{n:>10,} rows: row-wise  skipped   vectorized {t_new:8.4f}s")
+
+    # days x markets x sigma candidates in one broadcasted call
+    days = 365
+    markets = make_markets(days * 6)
+    mus = np.random.default_rng(1).normal(72, 5, size=days).repeat(6)
+    sigmas = np.linspace(1.5, 4.0, args.sigmas)[:, None]
+    t_grid, (p_yes, _, edge_no) = timed(ev.ev_grid, markets["floor"], markets["cap"], mus, sigmas,
+                                        markets["yes_ask"], markets["no_ask"])
+    print(f"{days} days x 6 markets x {args.sigmas} sigmas = {p_yes.size:,} prices in {t_grid:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Order execution for every positive-edge leg of several events' EV tables, against a local mock
+order endpoint: one POST after another (a loop over send_order) vs execution.submit_orders
+concurrently vs through the batch endpoint. Also checks that re-submitting the same run is
+rejected as duplicate and that fills are tracked.
+
+    python benchmarks/bench_execution.py --series 5 --latency 0.15
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import pandas as pd
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from stubs import KalshiStub
+import ev
+from kalshi_client import KalshiClient
+from markets import list_markets
+from execution import build_orders, submit_orders, track_fills, _submit_one
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.15)
+    parser.add_argument("--write-rate", type=float, default=10, help="client write limit (Kalshi Basic: 10/s)")
+    args = parser.parse_args()
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode("utf-8")
+    series = [f"KXHIGHS{i}" for i in range(args.series)]
+    rows = []
+    with KalshiStub(latency=args.latency, public_key=key.public_key(), market_days=1, fill_delay=0.5) as stub:
+        client = KalshiClient(key_id="key-id", private_key_pem=pem, base_url=stub.api_url, write_rate=args.write_rate)
+        markets = list_markets(series, client=client)
+        # the stub's asks ignore the forecast, so most NO legs have edge
+        ev_df = ev.get_ev(markets, markets.groupby("series_ticker")["floor"].transform("median"), 6.0)
+
+        for label, run_id, fn in [
+            ("one by one", "seq", lambda legs: _sequential(client, legs)),
+            ("concurrent", "conc", lambda legs: submit_orders(client, legs)),
+            ("batched", "batch", lambda legs: submit_orders(client, legs, batch=True)),
+        ]:
+            legs = build_orders(ev_df, run_id, min_edge=0.0)
+            results, seconds = fn(legs)
+            rows.append((label, len(legs), seconds, results))
+
+        again, _ = submit_orders(client, build_orders(ev_df, "conc", min_edge=0.0))
+        n_orders = len(stub.orders)
+        time.sleep(0.5)
+        filled = track_fills(client, rows[1][3].copy(), timeout=5, interval=0.2)
+
+    print("------------------")
+    print(f"{len(markets)} markets in {args.series} events, {args.latency}s latency, client write limit {args.write_rate}/s")
+    for label, n, seconds, results in rows:
+        print(f"{label:11s} {n} legs in {seconds:5.2f}s, per order p50 {results['submit_ms'].median():6.1f} ms, "
+              f"statuses {results['status'].value_counts().to_dict()}")
+    assert (again["status"] == "duplicate").all() and n_orders == sum(r[1] for r in rows)
+    print(f"re-submitted run: {len(again)} duplicates, no new orders")
+    print(f"fills: {filled['status'].value_counts().to_dict()}, contracts filled {int(filled['fill_count'].sum())}")
+    print(filled.head(8).drop(columns=["client_order_id", "error"]).to_string(index=False))
+
+
+def _sequential(client, legs):
+    start = time.perf_counter()
+    outs = [dict(leg, **_submit_one(client, leg)) for leg in legs.to_dict("records")]
+    return pd.DataFrame(outs), time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Intraday polling of the weather.gov hourly forecast against a local stub whose forecast is revised
+every few polls: the old get_forecast (full payload every call, Python loop over the periods for
+tomorrow's max) vs nws_forecast.ForecastClient (conditional requests with a disk cache, daily
+max/min for every horizon in one grouped pass, revision history). Checks that tomorrow's max is
+the same on every poll and that every revision is recorded once.
+
+    python benchmarks/bench_forecast.py --polls 48 --revise-every 6 --latency 0.1
+"""
+import argparse
+import datetime as dt
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+from stubs import nws_stub
+from http_utils import make_session, request_with_retry
+from nws_forecast import ForecastClient, NWS_HEADERS
+import tracing
+
+OFFICE, GRID = "LOX", "149,41"
+
+
+def legacy_tomorrow_max(url, session, today):
+    # get_data.get_forecast before the forecast client
+    r = request_with_retry(session, "GET", url, headers=NWS_HEADERS, timeout=30)
+    periods = r.json()["properties"]["periods"]
+    tomorrow = (today + dt.timedelta(days=1)).isoformat()
+    tmax = -999
+    for p in periods:
+        if p["startTime"][:10] == tomorrow:
+            tmax = max(tmax, p["temperature"])
+    return tmax
+
+
+def http_bytes(tracer):
+    spans = [s for s in tracer.trace()["spans"] if s["name"].startswith("http")]
+    return sum(s.get("bytes", 0) for s in spans), [s.get("status") for s in spans]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--polls", type=int, default=48)
+    parser.add_argument("--revise-every", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+    today = dt.datetime.now(dt.timezone.utc).date()
+
+    with nws_stub({}, latency=args.latency) as nws, tempfile.TemporaryDirectory() as tmp:
+        url = f"{nws.url}/gridpoints/{OFFICE}/{GRID}/forecast/hourly"
+        session = make_session()
+        old, new = [], []
+        t_old = t_new = 0.0
+        client = ForecastClient(tmp, session=session, api=nws.url)
+        for mode in ("old", "new"):
+            tracing.start()
+            for i in range(args.polls):
+                nws.forecast_revision = i // args.revise_every
+                t0 = time.perf_counter()
+                if mode == "old":
+                    old.append(legacy_tomorrow_max(url, session, today))
+                    t_old += time.perf_counter() - t0
+                else:
+                    daily = client.daily(OFFICE, GRID, today=today)
+                    new.append(float(daily.loc[daily["horizon"] == 1, "tmax"].iloc[0]))
+                    t_new += time.perf_counter() - t0
+            if mode == "old":
+                bytes_old, _ = http_bytes(tracing.stop())
+            else:
+                bytes_new, statuses = http_bytes(tracing.stop())
+        history = client.history(OFFICE, GRID)
+        tomorrow = client.history(OFFICE, GRID, today + dt.timedelta(days=1))
+
+    revisions = -(-args.polls // args.revise_every)
+    assert np.array_equal(old, new)
+    assert tomorrow["update_time"].nunique() == revisions == len(tomorrow)
+    print("------------------")
+    print(f"{args.polls} polls, forecast revised every {args.revise_every} ({revisions} revisions), "
+          f"{args.latency}s latency")
+    print(f"old get_forecast:  {t_old:6.2f} s  {bytes_old / 1024:8.0f} KiB  {args.polls} full payloads")
+    print(f"ForecastClient:    {t_new:6.2f} s  {bytes_new / 1024:8.0f} KiB  {statuses.count(200)} x 200, "
+          f"{statuses.count(304)} x 304")
+    print(f"revision history: {len(history)} rows ({revisions} revisions x {history['target_date'].nunique()} days); "
+          f"tomorrow's max by revision: {tomorrow['tmax'].tolist()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Prediction journal over a synthetic history (one decision, market snapshot and order set per city
+and day): the cost of journaling a run, then reading one month back from a CSV log of the same
+rows (read whole, then filtered) vs the journal, first from its day partitions and then from the
+monthly chunks compact() rolls them into (memory-mapped, sliced by date).
+Checks the realized-TMAX join, that compaction leaves the rows read unchanged, and that a second
+pass of either adds nothing.
+
+    python benchmarks/bench_journal.py --days 730 --cities 2
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+import pandas as pd
+from feature_state import FEATURE_COLUMNS
+from execution import RESULT_COLUMNS
+from journal import Journal
+
+
+def synthetic_run(day, city, rng):
+    features = pd.DataFrame(rng.normal(60, 10, size=(1, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    caps = np.arange(60, 72, 2.0)
+    markets = pd.DataFrame({
+        "date": pd.Timestamp(day), "event_ticker": f"KXHIGH{city}-{day:%y%b%d}".upper(),
+        "market_ticker": [f"KXHIGH{city}-{day:%y%b%d}-B{c - 0.5}".upper() for c in caps],
+        "floor": caps - 2, "cap": caps, "yes_ask": rng.integers(1, 99, len(caps)),
+        "no_ask": rng.integers(1, 99, len(caps)), "p_yes": rng.random(len(caps)),
+    })
+    markets["p_no"] = 1 - markets["p_yes"]
+    markets["edge_yes_cents"] = (markets["p_yes"] - markets["yes_ask"] / 100).round(2)
+    markets["edge_no_cents"] = (markets["p_no"] - markets["no_ask"] / 100).round(2)
+    orders = pd.DataFrame({c: [None] * 2 for c in RESULT_COLUMNS})
+    orders["market_ticker"], orders["side"], orders["status"] = markets["market_ticker"].iloc[:2].to_numpy(), "yes", "executed"
+    orders["price"], orders["count"], orders["submit_ms"] = 40, 1, 120.0
+    return features, markets, orders
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--cities", type=int, default=2)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    cities = ["LAX", "NYC", "CHI", "MIA"][:args.cities]
+    days = pd.date_range("2024-01-01", periods=args.days, freq="D")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        journal = Journal(tmp / "journal")
+        csv_path = tmp / "prediction_log.csv"
+        record_s, csv_s = [], []
+        for day in days:
+            for city in cities:
+                features, markets, orders = synthetic_run(day, city, rng)
+                forecast = float(features["forecasted_TMAX"].iloc[0])
+                t0 = time.perf_counter()
+                journal.record(city, day, features, forecast, forecast + 1.0, 2.53, markets, orders)
+                record_s.append(time.perf_counter() - t0)
+                t0 = time.perf_counter()
+                row = markets.assign(city=city, forecast=forecast, adjusted_forecast=forecast + 1.0,
+                                     **features.iloc[0].to_dict())
+                row.to_csv(csv_path, mode="a", header=not csv_path.exists(), index=False)
+                csv_s.append(time.perf_counter() - t0)
+            # the next day's run sees the CLI's final TMAX for this one
+            for city in cities:
+                journal.record_realized(city, pd.DataFrame({"DATE": [day], "TMAX": [70.0]}), before=day + pd.Timedelta(days=1))
+
+        start, end = days[-60], days[-31]
+        t0 = time.perf_counter()
+        recent = journal.read("markets", start, end)
+        t_recent = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        rolled = journal.compact(before=days[-1])
+        t_compact = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        month = journal.read("markets", start, end)
+        t_journal = time.perf_counter() - t0
+        pd.testing.assert_frame_equal(month.reset_index(drop=True), recent.reset_index(drop=True), check_dtype=False)
+        assert journal.compact(before=days[-1]) == 0
+        t0 = time.perf_counter()
+        log = pd.read_csv(csv_path, parse_dates=["date"])
+        log_month = log[(log["date"] >= start) & (log["date"] <= end)]
+        t_csv = time.perf_counter() - t0
+        assert len(month) == len(log_month)
+
+        t0 = time.perf_counter()
+        joined = journal.decisions(start, end)
+        t_join = time.perf_counter() - t0
+        assert len(joined) == 30 * len(cities) and (joined["realized_TMAX"] == 70.0).all()
+        obs = pd.DataFrame({"DATE": days, "TMAX": 70.0})
+        assert journal.record_realized(cities[0], obs, before=days[-1] + pd.Timedelta(days=1)) == 0
+
+    print("------------------")
+    print(f"{args.days} days x {len(cities)} cities, {len(log)} market rows in total")
+    print(f"journal one run:   {np.median(record_s) * 1000:7.2f} ms median (CSV append {np.median(csv_s) * 1000:.2f} ms)")
+    print(f"read one month:    CSV log {t_csv * 1000:7.1f} ms   journal, day partitions {t_recent * 1000:7.1f} ms   "
+          f"journal, monthly chunks {t_journal * 1000:7.1f} ms ({len(month)} rows)")
+    print(f"compaction of {rolled} day partitions: {t_compact:.1f} s")
+    print(f"decisions + realized TMAX for the month: {t_join * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Market listing + order placement: the old path (unpooled requests per call, private key parsed
+and a new connection opened for every order) against one KalshiClient, on a local mock Kalshi API
+that verifies every order signature.
+
+    python benchmarks/bench_kalshi_client.py --calls 50 --latency 0.02
+"""
+import argparse
+import base64
+import sys
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import requests
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from stubs import KalshiStub
+from kalshi_client import KalshiClient
+
+
+def legacy_call(api_url, key_id, pem, ticker):
+    requests.get(f"{api_url}/markets?series_ticker=KXHIGHLAX&status=open").json()
+    path = "/trade-api/v2/portfolio/orders"
+    timestamp_ms = str(int(time.time() * 1000))
+    private_key = serialization.load_pem_private_key(pem.encode("utf-8"), password=None)
+    sig = private_key.sign(
+        f"{timestamp_ms}POST{path}".encode("utf-8"),
+        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+        hashes.SHA256(),
+    )
+    headers = {
+        "Content-Type": "application/json",
+        "KALSHI-ACCESS-KEY": key_id,
+        "KALSHI-ACCESS-TIMESTAMP": timestamp_ms,
+        "KALSHI-ACCESS-SIGNATURE": base64.b64encode(sig).decode("utf-8"),
+    }
+    payload = {"ticker": ticker, "side": "no", "action": "buy", "type": "limit", "count": 1,
+               "no_price": 50, "client_order_id": str(uuid.uuid4())}
+    resp = requests.post(api_url.replace("/trade-api/v2", "") + path, json=payload, headers=headers, timeout=30)
+    resp.raise_for_status()
+
+
+def client_call(client, ticker):
+    client.get("/markets", params={"series_ticker": "KXHIGHLAX", "status": "open"})
+    payload = {"ticker": ticker, "side": "no", "action": "buy", "type": "limit", "count": 1,
+               "no_price": 50, "client_order_id": str(uuid.uuid4())}
+    client.post("/portfolio/orders", json=payload)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--rate", type=float, default=1000,
+                        help="client read/write limit; the exchange's own is 20/10 per second, the old path has none")
+    args = parser.parse_args()
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode("utf-8")
+
+    with KalshiStub(latency=args.latency, public_key=key.public_key()) as stub:
+        # the stub only books orders on markets it lists
+        ticker = stub.open_markets("KXHIGHLAX")[0]["ticker"]
+        t0 = time.perf_counter()
+        for _ in range(args.calls):
+            legacy_call(stub.api_url, "key-id", pem, ticker)
+        t_legacy = time.perf_counter() - t0
+
+    with KalshiStub(latency=args.latency, public_key=key.public_key()) as stub:
+        ticker = stub.open_markets("KXHIGHLAX")[0]["ticker"]
+        t0 = time.perf_counter()
+        client = KalshiClient(key_id="key-id", private_key_pem=pem, base_url=stub.api_url,
+                              read_rate=args.rate, write_rate=args.rate)
+        for _ in range(args.calls):
+            client_call(client, ticker)
+        t_new = time.perf_counter() - t0
+        assert len(stub.orders) == args.calls
+
+    print("------------------")
+    print(f"{args.calls} x (list markets + place order), {args.latency}s server latency")
+    print(f"unpooled requests + key per order: {t_legacy:6.2f}s ({t_legacy / args.calls * 1000:.1f} ms/call)")
+    print(f"KalshiClient:                      {t_new:6.2f}s ({t_new / args.calls * 1000:.1f} ms/call)")
+    print(client.latency_stats().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Live mode against a simulated exchange whose quotes move every tick: decision latency (quote
+receipt to order sent), ack latency (quote receipt to exchange response), and the per-update
+cost of re-evaluating only the changed markets against recomputing the full EV table.
+The threshold sits just above the best starting edge, so only quote moves trigger orders.
+
+    python benchmarks/bench_live.py --seconds 10 --interval 0.1 --latency 0.01
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from stubs import SimulatedExchange
+import ev
+from kalshi_client import KalshiClient
+from markets import list_markets
+from live import LiveBook, run_live, latency_summary
+
+
+def update_cost(markets, mu, sigma, n=2000, movers=2, seed=0):
+    """
+    Seconds per quote update: LiveBook.update + edges on the changed markets vs ev.get_ev on the whole event.
+    """
+    rng = np.random.default_rng(seed)
+    book = LiveBook(markets, mu, sigma)
+    updates = []
+    for _ in range(n):
+        idx = rng.choice(len(markets), movers, replace=False)
+        ya = np.clip(markets["yes_ask"].to_numpy()[idx] + rng.integers(-3, 4, movers), 1, 99)
+        updates.append(list(zip(markets["market_ticker"].to_numpy()[idx], ya, 100 - ya + 2)))
+    t0 = time.perf_counter()
+    for quotes in updates:
+        idx = book.update(quotes)
+        book.edges(idx)
+    t_book = (time.perf_counter() - t0) / n
+    df = markets.copy()
+    t0 = time.perf_counter()
+    for quotes in updates:
+        for t, ya, na in quotes:
+            df.loc[df["market_ticker"] == t, ["yes_ask", "no_ask"]] = ya, na
+        ev.get_ev(df, mu, sigma)
+    t_full = (time.perf_counter() - t0) / n
+    return t_book, t_full
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--interval", type=float, default=0.1, help="quote poll interval")
+    parser.add_argument("--tick", type=float, default=0.05, help="exchange quote tick")
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--margin", type=float, default=0.02, help="threshold above the best starting edge")
+    parser.add_argument("--max-orders", type=int, default=6)
+    args = parser.parse_args()
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode("utf-8")
+
+    with SimulatedExchange(tick=args.tick, latency=args.latency, public_key=key.public_key(), market_days=1) as exchange:
+        client = KalshiClient(key_id="key-id", private_key_pem=pem, base_url=exchange.api_url)
+        markets = list_markets(["KXHIGHLAX"], client=client)
+        mu, sigma = markets["floor"].median() + 0.5, 2.5
+        book = LiveBook(markets, mu, sigma)
+        threshold = max(e.max() for e in book.edges(np.arange(len(book)))) + args.margin
+        decisions, stats = asyncio.run(run_live(
+            book, client, markets["event_ticker"].iloc[0], threshold=threshold,
+            interval=args.interval, max_orders=args.max_orders, duration=args.seconds,
+        ))
+
+    print("------------------")
+    print(f"{len(markets)} markets, quotes tick every {args.tick}s, polled every {args.interval}s, "
+          f"{args.latency}s exchange latency")
+    print(f"threshold {threshold:.3f}", stats)
+    if decisions.empty:
+        print("no edge crossed the threshold")
+        return
+    print(decisions[["market_ticker", "side", "price", "edge", "decision_latency_ms", "ack_latency_ms"]].to_string(index=False))
+    print(latency_summary(decisions).round(3).to_string())
+    t_book, t_full = update_cost(markets, mu, sigma)
+    print(f"per update: changed markets only {t_book * 1e6:.1f} us, full EV table {t_full * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Open-market listing for many temperature series: the old per-series loop (one unpooled request,
+first page only, strptime per row) against the concurrent, cursor-following list_markets,
+on a local mock Kalshi API.
+
+    python benchmarks/bench_markets.py --series 20 --days 30 --page 100 --latency 0.15
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import pandas as pd
+import requests
+from stubs import KalshiStub
+from kalshi_client import KalshiClient
+from markets import list_markets
+
+CITIES = ["LAX", "NY", "CHI", "MIA", "AUS", "DEN", "PHIL", "SFO", "SEA", "HOU",
+          "DC", "ATL", "BOS", "DAL", "LV", "MIN", "NOLA", "OKC", "PHX", "SATX"]
+
+
+def legacy_markets(api_url, series, page):
+    rows = []
+    for ticker in series:
+        markets_data = requests.get(f"{api_url}/markets?series_ticker={ticker}&status=open&limit={page}").json()
+        for market in markets_data["markets"]:
+            event_ticker = market.get("event_ticker")
+            dt = event_ticker.split("-")[1]
+            date = datetime.strptime("20" + dt, "%Y%b%d").date()
+            rows.append({"date": date, "event_ticker": event_ticker, "market_ticker": market.get("ticker"),
+                         "floor": market.get("floor_strike"), "cap": market.get("cap_strike"),
+                         "no_ask": market.get("no_ask"), "yes_ask": market.get("yes_ask")})
+    df = pd.DataFrame(rows)
+    df["date"] = pd.to_datetime(df["date"])
+    for c in ["floor", "cap", "no_ask", "yes_ask"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30, help="open events per series")
+    parser.add_argument("--page", type=int, default=100, help="markets per page")
+    parser.add_argument("--latency", type=float, default=0.15)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    series = [f"KXHIGH{c}" for c in (CITIES * (args.series // len(CITIES) + 1))[:args.series]]
+
+    with KalshiStub(latency=args.latency, market_days=args.days, rate=20) as stub:
+        t0 = time.perf_counter()
+        legacy = legacy_markets(stub.api_url, series, args.page)
+        t_legacy = time.perf_counter() - t0
+        n_legacy_requests = stub.requests
+
+    with KalshiStub(latency=args.latency, market_days=args.days, rate=20) as stub:
+        client = KalshiClient(base_url=stub.api_url, pool_size=args.workers)
+        t0 = time.perf_counter()
+        markets = list_markets(series, client=client, max_workers=args.workers, limit=args.page)
+        t_new = time.perf_counter() - t0
+        n_requests = stub.requests
+
+    expected = len(series) * args.days * 6
+    assert len(markets) == expected and markets["market_ticker"].is_unique
+    # every market the old loop saw on its first pages comes back identical
+    cols = list(legacy.columns)
+    new = markets[cols].set_index("market_ticker").loc[legacy["market_ticker"]].reset_index()[cols]
+    pd.testing.assert_frame_equal(new, legacy, check_dtype=False)
+
+    print("------------------")
+    print(f"{len(series)} series x {args.days} open events, {args.page} markets/page, {args.latency}s latency, server limit 20 req/s")
+    print(f"per-series loop, first page only: {t_legacy:6.2f}s ({n_legacy_requests} requests, {len(legacy)}/{expected} markets)")
+    print(f"list_markets:                     {t_new:6.2f}s ({n_requests} requests, {len(markets)}/{expected} markets)")
+    print(markets.dtypes.to_string())
+
+
+if __name__ == "__main__":
+    main()
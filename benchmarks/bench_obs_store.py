@@ -0,0 +1,127 @@
+"""
+Daily observation store (obs_store.ObsStore) on a synthetic NOAA daily CSV with gaps: the bulk
+backfill, then the feature window (HISTORY days) read from the CSV (read whole, then filtered),
+from a date-indexed DataFrame (boolean mask) and from the store (a slice of the memory-mapped
+columns), at growing history lengths. Checks that missing() finds exactly the dropped days, that
+the window keeps them as NaN rows, that CLI updates respect the source ranking, and that the
+feature row is refused over a missing day and lags by date once it is filled.
+
+    python benchmarks/bench_obs_store.py --years 5 30 100
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+import pandas as pd
+from feature_state import OBS_COLUMNS, HISTORY, LAGS
+from obs_store import ObsStore, SOURCES
+
+
+def synthetic_noaa(days, drop=0.01, seed=0):
+    """
+    A NOAA-style daily frame ending yesterday, with a fraction of the days left out.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end=pd.Timestamp.today().normalize() - pd.Timedelta(days=1), periods=days, freq="D")
+    doy = dates.dayofyear.to_numpy()
+    df = pd.DataFrame({
+        "STATION": "USW00023174", "DATE": dates.strftime("%Y-%m-%d"),
+        "TMAX": np.round(70 + 6 * np.sin(2 * np.pi * doy / 365.25) + rng.normal(0, 3, days)),
+        "TMIN": np.round(56 + 5 * np.sin(2 * np.pi * doy / 365.25) + rng.normal(0, 2, days)),
+        "PRCP": np.where(rng.random(days) < 0.1, rng.exponential(0.3, days).round(2), 0.0),
+        "AWND": rng.gamma(4, 1.8, days).round(1), "WDF2": rng.integers(1, 37, days) * 10.0,
+        "WSF2": rng.gamma(6, 2.5, days).round(1),
+    })
+    dropped = rng.random(days) < drop
+    dropped[-HISTORY:] = False
+    dropped[-5] = True   # one inside the feature window
+    return df[~dropped].reset_index(drop=True), pd.DatetimeIndex(dates[dropped])
+
+
+def best_of(fn, *args, repeat=20):
+    best = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, nargs="+", default=[5, 30, 100])
+    args = parser.parse_args()
+
+    print("------------------")
+    for years in args.years:
+        noaa, dropped = synthetic_noaa(int(years * 365.25))
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            csv_path = tmp / "noaa.csv"
+            noaa.to_csv(csv_path, index=False)
+            store = ObsStore(tmp / "obs")
+            t0 = time.perf_counter()
+            written = store.backfill_noaa(csv_path)
+            t_backfill = time.perf_counter() - t0
+            assert written == len(noaa) and store.missing().equals(dropped)
+
+            end = store.last_date
+            start = end - (HISTORY - 1)
+            t_store, window = best_of(store.arrays, start, end)
+            assert len(window["TMAX"]) == HISTORY and np.isnan(window["TMAX"][-5]) and window["source"][-5] == 0
+
+            def from_csv():
+                df = pd.read_csv(csv_path, usecols=["DATE"] + OBS_COLUMNS, parse_dates=["DATE"])
+                return df[(df["DATE"] >= pd.Timestamp(start)) & (df["DATE"] <= pd.Timestamp(end))]
+
+            t_csv, csv_window = best_of(from_csv, repeat=3)
+            indexed = pd.read_csv(csv_path, usecols=["DATE"] + OBS_COLUMNS, parse_dates=["DATE"])
+            t_mask, mask_window = best_of(
+                lambda: indexed[(indexed["DATE"] >= pd.Timestamp(start)) & (indexed["DATE"] <= pd.Timestamp(end))])
+            # the CSV window is a day short; the store keeps the gap as a NaN row
+            assert len(csv_window) == len(mask_window) == HISTORY - 1
+            frame = store.window(end, HISTORY)
+            np.testing.assert_array_equal(frame.dropna(subset=["TMAX"])["TMAX"].to_numpy(), csv_window["TMAX"].to_numpy())
+
+            # a run's CLI frame: the final reports of the last days and today's preliminary one
+            today = pd.Timestamp(end).date() + pd.Timedelta(days=1)
+            merged = pd.DataFrame({"DATE": pd.date_range(end=today, periods=4, freq="D")[::-1],
+                                   **{c: 1.0 for c in OBS_COLUMNS}})
+            t0 = time.perf_counter()
+            store.record_cli(merged, today)
+            t_cli = time.perf_counter() - t0
+            src = store.arrays(merged["DATE"].min(), today)["source"]
+            # the CLI does not replace NOAA rows, and today's row is preliminary until the next run
+            assert list(src) == [SOURCES["noaa"], SOURCES["noaa"], SOURCES["noaa"], SOURCES["cli_today"]]
+            assert store.missing(start, today).equals(dropped[dropped >= pd.Timestamp(start)])
+            merged["TMAX"] = 2.0
+            store.record_cli(merged, today + pd.Timedelta(days=1))
+            assert store.arrays(today, today)["source"][0] == SOURCES["cli"] and store.arrays(today, today)["TMAX"][0] == 2.0
+
+            # the feature window ending today still has the NOAA gap, and is refused until the day is filled
+            try:
+                store.features(today, 70.0)
+                raise AssertionError("features() over a missing day")
+            except ValueError:
+                pass
+            gap = store.missing(start, today)
+            store.write(pd.DataFrame({"DATE": gap, **{c: 3.0 for c in OBS_COLUMNS}}), "cli")
+            t_features, row = best_of(store.features, today, 70.0)
+            tmax = store.window(today, HISTORY).set_index("DATE")["TMAX"]
+            for k in LAGS:
+                assert row[f"TMAX_lag{k}"].iloc[0] == tmax[pd.Timestamp(today) - pd.Timedelta(days=k)]
+
+        print(f"{years:>4} years ({len(noaa):,} days, {len(dropped)} missing): backfill {t_backfill * 1000:7.1f} ms   "
+              f"CLI update {t_cli * 1000:5.2f} ms   features {t_features * 1000:5.2f} ms")
+        print(f"      {HISTORY}-day window: CSV {t_csv * 1000:8.2f} ms   DataFrame mask {t_mask * 1000:7.3f} ms   "
+              f"store {t_store * 1e6:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Backtest scoring: the old per-row make_prediction loop (fresh Booster + JSON load + one-row DMatrix
+every call) against one predict_batch call on the cached booster.
+
+    python benchmarks/bench_predict.py --rows 365
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from model import load_booster, predict_batch
+
+MODEL_PATH = ROOT / "backtesting" / "best_backtesting.json"
+
+
+def make_features(n, feature_names, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(65, 10, size=(n, len(feature_names))), columns=feature_names)
+    df["forecasted_TMAX"] = rng.normal(72, 6, size=n)
+    return df
+
+
+def legacy_loop(df, model_path):
+    out = []
+    for i in range(len(df)):
+        booster = xgb.Booster()
+        booster.load_model(model_path)
+        row = df.iloc[i:i + 1]
+        out.append(row["forecasted_TMAX"].iloc[0] + booster.predict(xgb.DMatrix(row))[0])
+    return np.array(out)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=365)
+    args = parser.parse_args()
+
+    names = load_booster(MODEL_PATH).feature_names
+    df = make_features(args.rows, names)
+    dates = pd.date_range("2025-01-01", periods=args.rows)
+
+    t0 = time.perf_counter()
+    old = legacy_loop(df, MODEL_PATH)
+    t_old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new = predict_batch(df, MODEL_PATH, dates=dates)
+    t_new = time.perf_counter() - t0
+
+    np.testing.assert_allclose(new.to_numpy(), old, rtol=0, atol=1e-4)
+    print("------------------")
+    print(f"{args.rows} rows")
+    print(f"per-row make_prediction loop: {t_old * 1000:9.1f} ms")
+    print(f"predict_batch (warm handle):  {t_new * 1000:9.1f} ms ({t_old / t_new:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
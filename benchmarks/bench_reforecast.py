@@ -0,0 +1,105 @@
+"""
+NBM reforecast download against a local stub of the gribstream history endpoint: the old
+fetch_nextday_tmax_lax (one POST per day, serial, errors skipped) vs reforecast.download (multi-day
+windows, concurrent, rate-limited, checkpointed per day). Some days fail once, some keep failing;
+checks that the new path retries, lists what is still missing and resumes without re-fetching.
+
+    python benchmarks/bench_reforecast.py --days 180 --latency 0.3
+"""
+import argparse
+import datetime as dt
+import sys
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backtesting"))
+
+import numpy as np
+import pandas as pd
+import requests
+from stubs import GribstreamStub
+from reforecast import ReforecastStore, download, fetch_nextday_tmax_lax
+
+
+def legacy_fetch(start_date, end_date, url, token, asof_hour_utc=12):
+    # backtesting/get_weather_data.py, with the URL and token as arguments
+    headers = {"Content-Type": "application/json", "Accept": "text/csv", "Authorization": f"Bearer {token}"}
+    rows = []
+    curr = start_date
+    while curr <= end_date:
+        from_dt = dt.datetime(curr.year, curr.month, curr.day, 0, 0, tzinfo=dt.timezone.utc)
+        until_dt = from_dt + dt.timedelta(days=1)
+        asof_dt = (from_dt - dt.timedelta(days=1)).replace(hour=asof_hour_utc)
+        payload = {
+            "fromTime": from_dt.isoformat().replace("+00:00", "Z"),
+            "untilTime": until_dt.isoformat().replace("+00:00", "Z"),
+            "asOf": asof_dt.isoformat().replace("+00:00", "Z"),
+            "coordinates": [{"lat": 33.942, "lon": -118.408, "name": "KLAX"}],
+            "variables": [{"name": "TMP", "level": "2 m above ground", "info": "", "alias": "tempK"}],
+        }
+        try:
+            resp = requests.post(url, json=payload, headers=headers, timeout=15)
+            resp.raise_for_status()
+            df = pd.read_csv(StringIO(resp.text))
+        except Exception:
+            curr += dt.timedelta(days=1)
+            continue
+        if not df.empty:
+            rows.append({"date_utc": curr.isoformat(), "tmax_K": df["tempK"].max()})
+        curr += dt.timedelta(days=1)
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    start = dt.date(2024, 1, 1)
+    end = start + dt.timedelta(days=args.days - 1)
+    flaky = [start + dt.timedelta(days=i) for i in (10, 45, 100)]     # fail once
+    down = [start + dt.timedelta(days=i) for i in (60, 61)]            # fail until the second run
+    no_data = [start + dt.timedelta(days=130)]
+
+    with GribstreamStub(latency=args.latency, fail_days=flaky, missing_days=no_data) as stub:
+        t0 = time.perf_counter()
+        old = legacy_fetch(start, end, stub.url + stub.PATH, stub.token)
+        t_old = time.perf_counter() - t0
+
+    # the "down" days keep failing through all 4 attempts of the first run
+    fail_days = {**{d: 1 for d in flaky}, **{d: 4 for d in down}}
+    with tempfile.TemporaryDirectory() as tmp, \
+            GribstreamStub(latency=args.latency, fail_days=fail_days, missing_days=no_data) as stub:
+        store = ReforecastStore(tmp)
+        kwargs = dict(store=store, url=stub.url + stub.PATH, token=stub.token, max_workers=args.workers)
+        t0 = time.perf_counter()
+        failed = download(start, end, retries=3, **kwargs)
+        t_new = time.perf_counter() - t0
+        requests_first = stub.requests
+        missing_after_first = store.missing_days(start, end)
+
+        t0 = time.perf_counter()
+        new = fetch_nextday_tmax_lax(start, end, **kwargs)
+        t_resume = time.perf_counter() - t0
+        requests_resume = stub.requests - requests_first
+        assert not store.missing_days(start, end)
+
+    both = old.merge(new, on="date_utc", suffixes=("_old", "_new"))
+    assert np.allclose(both["tmax_K_old"], both["tmax_K_new"])
+    assert set(failed["day"]) <= set(missing_after_first)
+    print("------------------")
+    print(f"{args.days} days, {args.latency}s latency, {len(flaky)} days fail once, {len(down)} days down, "
+          f"{len(no_data)} without data")
+    print(f"one POST per day, serial:   {t_old:6.1f} s  {len(old)} days, {args.days - len(old)} holes (silently)")
+    print(f"windows of 7, {args.workers} workers:    {t_new:6.1f} s  {requests_first} requests, "
+          f"{len(missing_after_first)} days listed missing: {sorted(d.isoformat() for d in missing_after_first)}")
+    print(f"resume:                     {t_resume:6.1f} s  {requests_resume} request(s) for the missing days only")
+    print(f"result: {len(new)} days with data, equal to the old path on the {len(both)} days both have")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Bucket probabilities from a residual CDF table (residual_cdf.ResidualCDF) against the Normal path
+(ev.prob_yes with one sigma) at backtest scale: BacktestData.edges for every market of a long
+synthetic history, and one call over a few million prices. Checks that a KDE table fitted on
+Normal residuals prices like the Normal it came from, that the probabilities of a partition of
+the temperature axis sum to 1, and that a seasonal table picks each row's month.
+
+    python benchmarks/bench_residual_cdf.py --days 3650 --residuals 3000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backtesting"))
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+import ev
+from backtest import BacktestData, backtest
+from residual_cdf import ResidualCDF, load_cdf
+from bench_backtest import SIGMA, synthetic_history
+
+
+def best_of(fn, *args, repeat=5, **kwargs):
+    best = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=3650)
+    parser.add_argument("--residuals", type=int, default=3000)
+    parser.add_argument("--prices", type=int, default=2_000_000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    # out-of-fold residuals: Normal(0, SIGMA), and a seasonal set wider in winter than in summer
+    residuals = rng.normal(0, SIGMA, args.residuals)
+    months = rng.integers(1, 13, args.residuals)
+    seasonal_res = residuals * np.where(np.isin(months, [12, 1, 2]), 1.5, 0.8)
+    t_fit, kde = best_of(ResidualCDF.fit, residuals, kind="kde", repeat=1)
+    t_fit_s, seasonal = best_of(ResidualCDF.fit, seasonal_res, months, kind="kde", seasonal=True, repeat=1)
+    empirical = ResidualCDF.fit(residuals, kind="empirical")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = seasonal.save(Path(tmp) / "residual_cdf.npz")
+        size = path.stat().st_size
+        t0 = time.perf_counter()
+        assert load_cdf(path) is load_cdf(path)
+        t_load = time.perf_counter() - t0
+
+    # the KDE of Normal residuals prices like the Normal, up to sampling noise and the kernel width
+    floor = np.arange(-10.0, 10.0, 0.5)
+    sigma_kde = np.sqrt(residuals.var(ddof=1) + kde.bandwidth ** 2)
+    diff_kde = np.abs(kde.prob_yes(floor, floor + 1, 0.0) - ev.prob_yes(floor, floor + 1, 0.0, sigma_kde)).max()
+    diff_emp = np.abs(empirical.prob_yes(floor, floor + 1, 0.0) - ev.prob_yes(floor, floor + 1, 0.0, SIGMA)).max()
+    assert diff_kde < 0.01 and diff_emp < 0.05, (diff_kde, diff_emp)
+
+    # a partition of the axis: lower tail, buckets, upper tail
+    cuts = np.sort(rng.uniform(60, 80, 9))
+    p_floor = np.concatenate([[np.nan], cuts])
+    p_cap = np.concatenate([cuts, [np.nan]])
+    for dist in (kde, empirical, seasonal):
+        for mu in (55.0, 70.3, 90.0):
+            p = dist.prob_yes(p_floor, p_cap, mu, month=1)
+            assert abs(p.sum() - 1) < 1e-9 and (p >= 0).all(), p
+
+    # seasonal rows: a winter month is wider than a summer one
+    z = np.array([-2.0, 2.0])
+    jan, jul = seasonal.cdf(z, 1), seasonal.cdf(z, 7)
+    assert (jan[1] - jan[0]) < (jul[1] - jul[0])
+    year = seasonal.cdf(z)
+    assert jan[1] - jan[0] < year[1] - year[0] < jul[1] - jul[0]
+    np.testing.assert_allclose(seasonal.cdf(z, np.array([1, 7])), [jan[0], jul[1]])
+
+    prices, predictions, realized = synthetic_history(args.days)
+    data = BacktestData(prices, predictions, realized)
+    t_normal, (ey_n, en_n) = best_of(data.edges, SIGMA)
+    t_table, (ey_t, en_t) = best_of(data.edges, kde)
+    t_season, _ = best_of(data.edges, seasonal)
+    assert np.abs(ey_t - data.edges(sigma_kde)[0]).max() < 0.03
+    _, normal_summary = backtest(data, SIGMA)
+    _, table_summary = backtest(data, kde)
+
+    n = args.prices
+    floor = np.where(np.arange(n) % 6 == 0, np.nan, rng.uniform(60, 80, n).round())
+    cap = np.where(np.arange(n) % 6 == 5, np.nan, floor + 1)
+    mu = rng.normal(70, 6, n)
+    month = rng.integers(1, 13, n)
+    t_big_normal, _ = best_of(ev.prob_yes, floor, cap, mu, SIGMA, repeat=3)
+    t_big_table, _ = best_of(ev.prob_yes, floor, cap, mu, kde, repeat=3)
+    t_big_season, _ = best_of(ev.prob_yes, floor, cap, mu, seasonal, month, repeat=3)
+
+    print("------------------")
+    print(f"fit on {args.residuals} residuals: kde {t_fit * 1000:.1f} ms, seasonal kde {t_fit_s * 1000:.1f} ms "
+          f"({seasonal.table.shape[0]} x {seasonal.table.shape[1]} table, {size / 1024:.0f} KiB, load {t_load * 1000:.1f} ms)")
+    print(f"max |p - Normal| over 1F buckets: kde {diff_kde:.4f}, empirical {diff_emp:.4f}")
+    print(f"BacktestData.edges, {len(data):,} rows ({data.n_days} days): Normal {t_normal * 1000:7.2f} ms   "
+          f"table {t_table * 1000:7.2f} ms   seasonal table {t_season * 1000:7.2f} ms")
+    print(f"prob_yes, {n:,} prices:               Normal {t_big_normal * 1000:7.1f} ms   "
+          f"table {t_big_table * 1000:7.1f} ms   seasonal table {t_big_season * 1000:7.1f} ms")
+    print(f"backtest pnl: Normal {normal_summary['pnl']:.2f}, kde table {table_summary['pnl']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
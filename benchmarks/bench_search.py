@@ -0,0 +1,63 @@
+"""
+Hyperparameter search for the forecast-error model on a synthetic training set: the notebooks'
+RandomizedSearchCV (n_iter candidates, TimeSeriesSplit(5), every candidate to n_estimators) vs
+search.successive_halving over the same candidates. Both winners are re-scored the same way
+(cv_mae, no early stopping, whole validation blocks) so their MAEs are comparable; halving's own
+ranking MAE comes from the half of each validation block its early stopping did not watch.
+
+    python benchmarks/bench_search.py --rows 1800 --n-iter 30
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "train_test"))
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+from sklearn.model_selection import TimeSeriesSplit, RandomizedSearchCV
+from xgboost import XGBRegressor
+from model import load_booster
+from bench_walk_forward import make_training_set, MODEL_PATH
+from search import PARAM_DIST, successive_halving, cv_mae
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1800)
+    parser.add_argument("--n-iter", type=int, default=30)
+    args = parser.parse_args()
+    X, y, _ = make_training_set(args.rows, load_booster(MODEL_PATH).feature_names)
+
+    t0 = time.perf_counter()
+    search = RandomizedSearchCV(
+        estimator=XGBRegressor(objective="reg:squarederror", eval_metric="mae", tree_method="hist", n_jobs=-1,
+                               random_state=42),
+        param_distributions=PARAM_DIST, n_iter=args.n_iter, scoring="neg_mean_absolute_error",
+        cv=TimeSeriesSplit(n_splits=5), random_state=42,
+    ).fit(X, y)
+    t_rscv = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    best_params, table, timeline = successive_halving(X, y, n_candidates=args.n_iter)
+    t_sh = time.perf_counter() - t0
+
+    rscv_mae = cv_mae(X, y, search.best_params_)
+    sh_mae = cv_mae(X, y, best_params)
+    print("------------------")
+    print(f"{args.rows} rows, {args.n_iter} candidates, TimeSeriesSplit(5)")
+    print(f"RandomizedSearchCV:  {t_rscv:7.1f} s  best CV MAE {-search.best_score_:.4f}  re-scored {rscv_mae:.4f}")
+    print(f"successive halving:  {t_sh:7.1f} s  best ranking-block MAE {timeline['best_mae'].iloc[-1]:.4f}  "
+          f"(early-stopping block {table['stop_mae'].iloc[0]:.4f})  re-scored {sh_mae:.4f}")
+    print(timeline.round(4).to_string(index=False))
+    print("RandomizedSearchCV best:", search.best_params_)
+    print("halving best:           ", best_params)
+    print(f"rounds trained (at most): halving {int(table['rounds'].sum() * 5)}, "
+          f"RandomizedSearchCV {int(sum(p['n_estimators'] for p in search.cv_results_['params']) * 5)}")
+    assert np.isfinite(sh_mae)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Strategy parameter sweep on a synthetic history with four price snapshots: re-running the notebook
+cells per parameter set vs sweep.run_sweep on a process pool over shared memory (and the same pool
+with the data pickled into every task). Also checks that an interrupted sweep resumes without
+re-running finished parameter sets.
+
+    python benchmarks/bench_sweep.py --days 365 --sample 400
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backtesting"))
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+from backtest import BacktestData
+from bench_backtest import synthetic_history, notebook_backtest
+from sweep import DEFAULT_GRID, param_sample, run_sweep, evaluate, load_results
+
+HHMMS = DEFAULT_GRID["target_hhmm"]
+
+
+def snapshots(days, seed=0):
+    """
+    One BacktestData per snapshot time: same markets and outcomes, asks re-drawn around the day's price.
+    """
+    prices, predictions, realized = synthetic_history(days, seed)
+    rng = np.random.default_rng(seed + 1)
+    out = {}
+    for hhmm in HHMMS:
+        p = prices.copy()
+        p["yes_ask"] = np.clip(np.round(p["yes_ask"] + rng.normal(0, 0.02, len(p)), 2), 0.01, 0.99)
+        out[hhmm] = BacktestData(p, predictions, realized)
+    return out, (prices, predictions, realized)
+
+
+def _pickled_chunk(args):
+    data, chunk = args
+    return [dict(params, **evaluate(data[params["target_hhmm"]], params)) for params in chunk]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--sample", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    datasets, raw = snapshots(args.days)
+    params = param_sample(DEFAULT_GRID, args.sample)
+
+    t0 = time.perf_counter()
+    for p in params[:3]:
+        notebook_backtest(*raw, p["sigma"])
+    t_notebook = (time.perf_counter() - t0) / 3
+
+    t0 = time.perf_counter()
+    serial = [dict(p, **evaluate(datasets[p["target_hhmm"]], p)) for p in params]
+    t_serial = time.perf_counter() - t0
+
+    chunks = [params[i:i + 16] for i in range(0, len(params), 16)]
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        pickled = [r for rows in pool.map(_pickled_chunk, [(datasets, c) for c in chunks]) for r in rows]
+    t_pickled = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sweep.jsonl"
+        t0 = time.perf_counter()
+        table = run_sweep(datasets, params, path, max_workers=args.workers)
+        t_shared = time.perf_counter() - t0
+
+        resume_path = Path(tmp) / "resume.jsonl"
+        half = len(params) // 2
+        run_sweep(datasets, params[:half], resume_path, max_workers=args.workers)
+        first = len(load_results(resume_path))
+        resumed = run_sweep(datasets, params, resume_path, max_workers=args.workers)
+
+    assert len(table) == len(pickled) == len(serial) and first == half
+    assert len(resumed) == len(params) and resumed[["sigma", "price_offset", "target_hhmm", "rule", "min_edge"]].duplicated().sum() == 0
+    by_key = {tuple(r[k] for k in params[0]): r["pnl"] for r in serial}
+    assert all(np.isclose(by_key[tuple(r[k] for k in params[0])], r["pnl"]) for r in table.to_dict("records"))
+
+    per_task = len(pickle.dumps(datasets))
+    print("------------------")
+    print(f"{args.days} days x {len(HHMMS)} snapshots, {len(params)} parameter sets, {args.workers} worker(s)")
+    print(f"notebook cells per set:     {t_notebook * 1000:8.1f} ms  (~{t_notebook * len(params):.0f}s for the sample)")
+    print(f"engine, serial:             {t_serial:8.2f} s")
+    print(f"pool, data pickled per task:{t_pickled:8.2f} s  ({per_task / 1e6:.1f} MB x {len(chunks)} tasks)")
+    print(f"pool, shared memory:        {t_shared:8.2f} s")
+    print(f"resume: {first} done in the first run, {len(resumed) - first} added by the second")
+    print(table.head(10)[["sigma", "price_offset", "target_hhmm", "rule", "min_edge", "pnl", "trades",
+                          "hit_rate", "return_on_capital", "max_drawdown"]].round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
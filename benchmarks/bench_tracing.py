@@ -0,0 +1,86 @@
+"""
+Tracing overhead and output: the cost of a span with tracing off and on, then run_cities on the
+local weather.gov / Kalshi stand-ins with tracing off and on (fresh caches each run), one JSON
+trace per traced run, and the p50/p95 per stage that tracing.summarize computes from them.
+
+    python benchmarks/bench_tracing.py --cities 3 --runs 3 --latency 0.05
+"""
+import argparse
+import datetime as dt
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from stubs import KalshiStub, nws_stub, make_cli_versions
+from kalshi_client import KalshiClient
+from engine import run_cities
+from bench_engine import NAMES, make_cities
+import tracing
+
+
+def span_cost(n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        with tracing.span("x", city="LAX"):
+            pass
+    return (time.perf_counter() - t0) / n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cities", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    off = span_cost(200_000)
+    tracing.start()
+    on = span_cost(200_000)
+    tracing.stop()
+
+    today = dt.datetime.now(dt.timezone.utc).date()
+    texts = {name: make_cli_versions(today=today, seed=i) for i, name in enumerate(NAMES[:args.cities])}
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode("utf-8")
+    trace_dir = Path(tempfile.mkdtemp())
+    seconds = {False: [], True: []}
+    with nws_stub(texts, latency=args.latency) as nws, \
+            KalshiStub(latency=args.latency, public_key=key.public_key(), rate=20) as kalshi:
+        for i in range(args.runs):
+            for traced in (False, True):
+                root = Path(tempfile.mkdtemp())
+                try:
+                    client = KalshiClient(key_id="key-id", private_key_pem=pem, base_url=kalshi.api_url)
+                    if traced:
+                        tracing.start(run_id=f"run{i}")
+                    t0 = time.perf_counter()
+                    run_cities(make_cities(args.cities, nws.url, root), client=client, nws_api=nws.url)
+                    seconds[traced].append(time.perf_counter() - t0)
+                    if traced:
+                        tracing.stop().write(trace_dir)
+                finally:
+                    shutil.rmtree(root)
+    summary = tracing.summarize(trace_dir)
+    traces = sorted(trace_dir.glob("*.json"))
+    size = traces[0].stat().st_size
+    shutil.rmtree(trace_dir)
+
+    print("------------------")
+    print(f"span, tracing off: {off * 1e9:7.0f} ns   on: {on * 1e9:7.0f} ns")
+    print(f"run_cities, {args.cities} cities + 1 broken, {args.latency}s latency: "
+          f"untraced {min(seconds[False]):.2f} s, traced {min(seconds[True]):.2f} s (best of {args.runs})")
+    print(f"{len(traces)} traces, {size / 1024:.0f} KiB each")
+    print(summary.round(1).to_string(index=False))
+    assert {"weather", "markets", "order", "features", "predict", "ev", "quote_to_order"} <= set(summary["name"])
+
+
+if __name__ == "__main__":
+    main()
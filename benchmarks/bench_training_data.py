@@ -0,0 +1,113 @@
+"""
+Daily training-data refresh on a synthetic NOAA + reforecast history: the notebook chain
+(data_prep_noaa.ipynb -> CSV -> merge_data_1.ipynb -> CSV -> model_forecast_1.ipynb features, all
+rebuilt from scratch) vs training_data.TrainingData appending one new day. Checks that the
+incrementally maintained features equal a full recompute.
+
+    python benchmarks/bench_training_data.py --years 27 --days 5
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "train_test"))
+
+import numpy as np
+import pandas as pd
+from training_data import TrainingData, read_noaa_csv, add_features, NOAA_COLUMNS, REFORECAST_COLUMNS
+
+
+def synthetic_sources(days, seed=0):
+    """
+    A raw NOAA daily frame (with the columns data_prep_noaa.ipynb drops) and the reforecast by as-of date.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("1998-01-01", periods=days, freq="D")
+    season = np.sin(2 * np.pi * dates.dayofyear.to_numpy() / 365.25)
+    tmax = np.round(70 + 8 * season + rng.normal(0, 3, days))
+    noaa = pd.DataFrame({
+        "STATION": "USW00023174", "NAME": "LOS ANGELES INTERNATIONAL AIRPORT, CA US",
+        "DATE": dates.strftime("%Y-%m-%d"),
+        "TMAX": tmax, "TMIN": tmax - np.round(rng.uniform(5, 20, days)),
+        "PRCP": np.where(rng.random(days) < 0.1, np.round(rng.exponential(0.3, days), 2), 0.0),
+        "AWND": np.round(rng.uniform(3, 15, days), 1),
+        "WDF2": rng.choice(np.arange(10, 370, 10), days).astype(float),
+        "WSF2": np.round(rng.uniform(8, 30, days), 1),
+        "TAVG": np.nan, "SNOW": 0.0,
+    })
+    noaa.loc[rng.random(days) < 0.01, "AWND"] = np.nan
+    reforecast = pd.DataFrame({"DATE": dates[-1700:], "forecasted_TMAX": np.roll(tmax, -1)[-1700:] + rng.normal(0, 2, 1700)})
+    return noaa, reforecast
+
+
+def notebook_rebuild(raw_csv, reforecast_csv, tmp):
+    # data_prep_noaa.ipynb
+    df = pd.read_csv(raw_csv)
+    df["DATE"] = pd.to_datetime(df["DATE"])
+    df = df[df["DATE"] >= "1998-01-01"]
+    df["year"] = df["DATE"].dt.year
+    df[NOAA_COLUMNS].to_csv(tmp / "training_weather_data.csv", index=False)
+    # merge_data_1.ipynb
+    weather_df = pd.read_csv(tmp / "training_weather_data.csv")
+    weather_df["DATE"] = pd.to_datetime(weather_df["DATE"])
+    reforecast_df = pd.read_csv(reforecast_csv)
+    reforecast_df["DATE"] = pd.to_datetime(reforecast_df["DATE"])
+    weather_df.merge(reforecast_df, how="left", on="DATE").to_csv(tmp / "training_data.csv", index=False)
+    # model_forecast_1.ipynb
+    data = pd.read_csv(tmp / "training_data.csv")
+    data["DATE"] = pd.to_datetime(data["DATE"])
+    return add_features(data.sort_values("DATE").reset_index(drop=True)).dropna()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=27)
+    parser.add_argument("--days", type=int, default=5, help="daily refreshes to time")
+    args = parser.parse_args()
+    total = args.years * 365
+    noaa, reforecast = synthetic_sources(total)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        noaa.to_csv(tmp / "raw.csv", index=False)
+        reforecast.to_csv(tmp / "reforecast.csv", index=False)
+        t0 = time.perf_counter()
+        expected = notebook_rebuild(tmp / "raw.csv", tmp / "reforecast.csv", tmp)
+        t_csv = time.perf_counter() - t0
+
+        # the store as of args.days days ago, then one day at a time
+        parsed = read_noaa_csv(tmp / "raw.csv")
+        split = len(parsed) - args.days
+        data = TrainingData(tmp / "store")
+        t0 = time.perf_counter()
+        data.update(parsed.iloc[:split], reforecast[reforecast["DATE"] < parsed["DATE"].iloc[split]])
+        t_initial = time.perf_counter() - t0
+        times = []
+        for i in range(split, len(parsed)):
+            day = parsed["DATE"].iloc[i]
+            t0 = time.perf_counter()
+            result = data.update(parsed.iloc[[i]], reforecast.loc[reforecast["DATE"] == day, REFORECAST_COLUMNS])
+            times.append(time.perf_counter() - t0)
+        rows = result["features"]
+
+        t0 = time.perf_counter()
+        X, y, _ = data.Xy()
+        t_load = time.perf_counter() - t0
+        got = data.frame().reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, expected.reset_index(drop=True), check_dtype=False)
+
+    print("------------------")
+    print(f"{total} days of NOAA history, {len(reforecast)} reforecast days, {len(expected)} complete rows")
+    print(f"notebook CSV chain, full rebuild:  {t_csv * 1000:8.1f} ms")
+    print(f"pipeline, initial build:           {t_initial * 1000:8.1f} ms")
+    print(f"pipeline, one new day:             {np.median(times) * 1000:8.1f} ms median over {len(times)} "
+          f"({rows} feature rows rewritten)")
+    print(f"pipeline, load X/y (memory-mapped): {t_load * 1000:7.1f} ms  X {X.shape}")
+    print("incremental features equal to the full recompute")
+
+
+if __name__ == "__main__":
+    main()
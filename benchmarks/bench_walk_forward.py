@@ -0,0 +1,93 @@
+"""
+Walk-forward OOF residuals on a synthetic training set shaped like training_data.csv: the notebook's
+compute_oof_residuals (fresh XGBRegressor per fold, serial, pandas slices) vs walk_forward.walk_forward
+(shared cut points, folds in parallel) and with warm start.
+
+    python benchmarks/bench_walk_forward.py --rows 2200 --n-estimators 800
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "train_test"))
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+
+import numpy as np
+import pandas as pd
+from xgboost import XGBRegressor
+from model import load_booster
+from walk_forward import walk_forward, oof_sigma
+
+MODEL_PATH = ROOT / "inference_KLAX" / "best1_1.json"
+
+
+def make_training_set(n, feature_names, seed=0):
+    """
+    Features with a seasonal cycle and a forecast error that depends on a few of them.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2019-01-01", periods=n, freq="D")
+    X = pd.DataFrame(rng.normal(0, 1, size=(n, len(feature_names))), columns=feature_names)
+    doy = dates.dayofyear.to_numpy()
+    X["doy"], X["doy_sin"], X["doy_cos"] = doy, np.sin(2 * np.pi * doy / 365.25), np.cos(2 * np.pi * doy / 365.25)
+    X["TMAX"] = 70 + 8 * X["doy_sin"] + rng.normal(0, 3, n)
+    X["forecasted_TMAX"] = X["TMAX"] + rng.normal(0, 2, n)
+    y = 1.5 * X["doy_cos"] - 0.4 * (X["forecasted_TMAX"] - X["TMAX"]) + 0.5 * X["AWND"] + rng.normal(0, 2, n)
+    return X, y, pd.Series(dates)
+
+
+def compute_oof_residuals(X, y, dates, best_params, min_train_size=365, step=30):
+    # model_forecast_1.ipynb
+    X = X.reset_index(drop=True)
+    y = pd.Series(y).reset_index(drop=True)
+    n = len(X)
+    oof_pred = np.full(n, np.nan)
+    train_end = min_train_size
+    while train_end < n:
+        test_end = min(train_end + step, n)
+        model = XGBRegressor(objective="reg:squarederror", eval_metric="mae", tree_method="hist", n_jobs=-1,
+                             random_state=42, **best_params)
+        model.fit(X.iloc[:train_end], y.iloc[:train_end])
+        oof_pred[train_end:test_end] = model.predict(X.iloc[train_end:test_end])
+        train_end = test_end
+    mask = ~np.isnan(oof_pred)
+    return y[mask].values - oof_pred[mask], oof_pred
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2200)
+    parser.add_argument("--n-estimators", type=int, default=800)
+    args = parser.parse_args()
+    params = {"n_estimators": args.n_estimators, "learning_rate": 0.03, "max_depth": 4, "min_child_weight": 5,
+              "subsample": 0.8, "colsample_bytree": 0.8, "reg_lambda": 5, "reg_alpha": 0.01}
+    X, y, dates = make_training_set(args.rows, load_booster(MODEL_PATH).feature_names)
+
+    t0 = time.perf_counter()
+    old_res, old_pred = compute_oof_residuals(X, y, dates, params)
+    t_old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new_pred, new_res, folds_df = walk_forward(X, y, dates, params)
+    t_new = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    warm_pred, warm_res, warm_df = walk_forward(X, y, dates, params, warm_start=True)
+    t_warm = time.perf_counter() - t0
+
+    assert np.array_equal(np.isnan(old_pred), np.isnan(new_pred))
+    # same model up to float32 inputs and shared cut points
+    corr = np.corrcoef(old_pred[~np.isnan(old_pred)], new_pred[~np.isnan(new_pred)])[0, 1]
+    assert corr > 0.97, corr
+    print("------------------")
+    print(f"{args.rows} rows, {len(folds_df)} folds, {args.n_estimators} trees")
+    print(f"notebook compute_oof_residuals: {t_old:6.2f} s  sigma {oof_sigma(old_res):.4f}  MAE {np.mean(np.abs(old_res)):.4f}")
+    print(f"walk_forward:                   {t_new:6.2f} s  sigma {oof_sigma(new_res):.4f}  MAE {np.mean(np.abs(new_res)):.4f}  (corr with notebook {corr:.4f})")
+    print(f"walk_forward, warm start:       {t_warm:6.2f} s  sigma {oof_sigma(warm_res):.4f}  MAE {np.mean(np.abs(warm_res)):.4f}")
+    print(warm_df[["fold", "train_end", "test_start_date", "rounds", "seconds", "mae"]].head(6).round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
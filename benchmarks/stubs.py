@@ -0,0 +1,494 @@
+"""
+Local stand-ins for the remote services the bot talks to, for benchmarks and offline runs.
+Each stub is a threaded HTTP server on 127.0.0.1 with a configurable per-request latency.
+"""
+import base64
+import datetime as dt
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class StubServer:
+    """
+    Serves handler(method, path, query, body, headers) -> (status, headers, payload) on a free local port.
+    payload may be str, bytes or anything json-serialisable. Use as a context manager.
+    """
+
+    def __init__(self, handler, latency=0.0):
+        self.handler = handler
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoints
+            # one buffered write per response with Nagle off, so keep-alive replies don't stall on delayed ACKs
+            wbufsize = 64 * 1024
+            disable_nagle_algorithm = True
+
+            def _serve(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, headers, payload = stub.handler(self.command, parsed.path, query, body, self.headers)
+                if isinstance(payload, str):
+                    data = payload.encode("utf-8")
+                    ctype = "text/plain"
+                elif isinstance(payload, bytes):
+                    data = payload
+                    ctype = "application/octet-stream"
+                else:
+                    data = json.dumps(payload).encode("utf-8")
+                    ctype = "application/json"
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_DELETE = _serve
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_cli_text(day, tmax, tmin, prcp=0.0, section="YESTERDAY", issued=None):
+    """
+    Renders a CLI report for day in the layout forecast.weather.gov serves for LAX.
+    section="YESTERDAY" gives the morning report, "TODAY" the afternoon one.
+    """
+    if issued is None:
+        # morning reports go out at 4:30 AM the next day, afternoon ones at 4:30 PM
+        issued = dt.datetime(day.year, day.month, day.day) + (
+            dt.timedelta(days=1, hours=4, minutes=30) if section == "YESTERDAY" else dt.timedelta(hours=16, minutes=30))
+    stamp = issued.strftime("%I%M %p").lstrip("0") + " PDT " + issued.strftime("%a %b %d %Y").upper()
+    header = "VALID TODAY AS OF 0400 PM LOCAL TIME.\n\n" if section == "TODAY" else ""
+    return (
+        "\n000\nCDUS46 KLOX {ts}\nCLILAX\n\nCLIMATE REPORT\n"
+        "NATIONAL WEATHER SERVICE LOS ANGELES/OXNARD CA\n{stamp}\n\n"
+        "...................................\n\n"
+        "...THE LOS ANGELES AIRPORT CA CLIMATE SUMMARY FOR {summary}...\n{header}\n"
+        "CLIMATE NORMAL PERIOD 1991 TO 2020\nCLIMATE RECORD PERIOD 1944 TO 2025\n\n"
+        "WEATHER ITEM   OBSERVED TIME   RECORD YEAR NORMAL DEPARTURE LAST\n"
+        "                VALUE   (LST)  VALUE       VALUE  FROM      YEAR\n"
+        "...................................................................\n"
+        "TEMPERATURE (F)\n {section}\n"
+        "  MAXIMUM         {tmax}    1:41 PM 100    1958  75     -3       76\n"
+        "  MINIMUM         {tmin}    6:05 AM  48    1946  60      0       61\n"
+        "  AVERAGE         {tavg}                         68     -2       69\n\n"
+        "PRECIPITATION (IN)\n  {section}        {prcp:.2f}          0.45 1957   0.01  -0.01     0.00\n"
+        "  MONTH TO DATE    0.00                      0.18  -0.18     0.00\n\n"
+        "WIND (MPH)\n  HIGHEST WIND SPEED    16   HIGHEST WIND DIRECTION    W (270)\n"
+        "  HIGHEST GUST SPEED    21   HIGHEST GUST DIRECTION    W (260)\n"
+        "  AVERAGE WIND SPEED     7.9\n\n$$\n"
+    ).format(
+        ts=issued.strftime("%d%H%M"),
+        stamp=stamp,
+        summary=f"{day.strftime('%B').upper()} {day.day} {day.year}",
+        header=header,
+        section=section,
+        tmax=tmax,
+        tmin=tmin,
+        tavg=(tmax + tmin) // 2,
+        prcp=prcp,
+    )
+
+
+def make_cli_versions(n_versions=49, today=None, seed=0):
+    """
+    Builds {version: text} the way the CLI product list looks: version 1 is today's afternoon
+    report, then one morning report per previous day going back n_versions - 1 days.
+    """
+    rng = random.Random(seed)
+    today = today or dt.date.today()
+    texts = {1: make_cli_text(today, rng.randint(65, 85), rng.randint(50, 62), section="TODAY")}
+    for v in range(2, n_versions + 1):
+        day = today - dt.timedelta(days=v - 1)
+        texts[v] = make_cli_text(day, rng.randint(65, 85), rng.randint(50, 62), rng.choice([0.0, 0.0, 0.12]))
+    return texts
+
+
+def cli_stub(texts, latency=0.0):
+    """
+    Stub of forecast.weather.gov/product.php serving texts by their version query parameter.
+    Its url attribute plus CLI_PATH is a drop-in for get_data.CLI_URL.
+    """
+
+    def handler(method, path, query, body, headers):
+        text = texts.get(int(query.get("version", 1)))
+        if text is None:
+            return 404, None, "not found"
+        return 200, None, text
+
+    return StubServer(handler, latency=latency)
+
+
+CLI_PATH = "/product.php?site=LOX&issuedby=LAX&product=CLI&format=TXT&version={v}&glossary=0"
+
+
+class KalshiStub(StubServer):
+    """
+    Stand-in for the Kalshi trade API under /trade-api/v2, with synthetic KXHIGH* markets.
+
+      fail_events: event tickers that always answer 500
+      flaky:       probability that any request answers 503 (retryable)
+      rate:        server-side requests/second before it answers 429, like the real limiter
+      public_key:  if given, order requests must carry a valid KALSHI-ACCESS-SIGNATURE
+      market_days: open events listed per series by /markets, ending tomorrow
+      fill_delay:  seconds until an order priced at or above the ask shows as executed
+    """
+
+    def __init__(self, latency=0.0, fail_events=(), flaky=0.0, rate=None, seed=0, public_key=None, market_days=3, fill_delay=0.0):
+        self.fail_events = set(fail_events)
+        self.flaky = flaky
+        self.rate = rate
+        self.rng = random.Random(seed)
+        self.public_key = public_key
+        self.market_days = market_days
+        self.throttled = 0
+        self.fill_delay = fill_delay
+        self.orders = {}
+        self.orders_by_id = {}
+        self._window = []
+        self.routes = [
+            (r"/trade-api/v2/series/(?P<series>[^/]+)/events/(?P<event>[^/]+)/candlesticks", self.candlesticks),
+            (r"/trade-api/v2/markets", self.markets),
+            (r"/trade-api/v2/portfolio/orders", self.create_order),
+            (r"/trade-api/v2/portfolio/orders/batched", self.batch_orders),
+            (r"/trade-api/v2/portfolio/orders/(?P<order_id>[^/]+)", self.get_order),
+        ]
+        super().__init__(self.dispatch, latency=latency)
+        self.api_url = self.url + "/trade-api/v2"
+
+    def dispatch(self, method, path, query, body, headers):
+        with self._lock:
+            if self.rate is not None:
+                now = time.monotonic()
+                self._window = [t for t in self._window if now - t < 1.0]
+                if len(self._window) >= self.rate:
+                    self.throttled += 1
+                    return 429, {"Retry-After": "0"}, {"error": "too many requests"}
+                self._window.append(now)
+            if self.flaky and self.rng.random() < self.flaky:
+                return 503, None, {"error": "unavailable"}
+        for pattern, route in self.routes:
+            m = re.fullmatch(pattern, path)
+            if m:
+                return route(method, query, body, headers, **m.groupdict())
+        return 404, None, {"error": "not found"}
+
+    @staticmethod
+    def market_tickers(event):
+        """
+        Six markets per event, like KXHIGHLAX: lower tail, four 2-degree buckets, upper tail.
+        """
+        base = 60 + sum(map(ord, event)) % 20
+        return ([f"{event}-T{base}"] + [f"{event}-B{base + 2 * i + 0.5}" for i in range(4)]
+                + [f"{event}-T{base + 7}"])
+
+    def candlesticks(self, method, query, body, headers, series, event):
+        if event in self.fail_events:
+            return 500, None, {"error": "internal"}
+        start, end = int(query["start_ts"]), int(query["end_ts"])
+        tickers = self.market_tickers(event)
+        candles = []
+        for i, _ in enumerate(tickers):
+            price = 0.05 + 0.15 * i
+            candles.append([
+                {"end_period_ts": ts, "yes_ask": {"close_dollars": f"{price + (ts % 600) / 60000:.4f}"}}
+                for ts in range(start - start % 60 + 60, end + 1, 60)
+            ])
+        return 200, None, {"market_tickers": tickers, "market_candlesticks": candles}
+
+    def open_markets(self, series):
+        """
+        Market objects for the series' open events, one event per day up to tomorrow (UTC).
+        """
+        out = []
+        tomorrow = dt.datetime.now(dt.timezone.utc).date() + dt.timedelta(days=1)
+        for k in range(self.market_days - 1, -1, -1):
+            day = tomorrow - dt.timedelta(days=k)
+            event = f"{series}-{day.strftime('%y%b%d').upper()}"
+            for i, ticker in enumerate(self.market_tickers(event)):
+                strike = float(ticker.rsplit("-", 1)[1][1:])
+                if i == 0:
+                    floor, cap = None, strike
+                elif ticker.endswith(f"-T{strike:g}"):
+                    floor, cap = strike, None
+                else:
+                    floor, cap = strike - 0.5, strike + 0.5
+                yes_ask = 5 + 15 * i
+                out.append({
+                    "ticker": ticker, "event_ticker": event, "status": "active",
+                    "floor_strike": floor, "cap_strike": cap,
+                    "yes_ask": yes_ask, "yes_bid": yes_ask - 2, "no_ask": 102 - yes_ask, "no_bid": 100 - yes_ask,
+                    "close_time": f"{day + dt.timedelta(days=1)}T07:59:00Z",
+                })
+        return out
+
+    def markets(self, method, query, body, headers):
+        """
+        GET /markets?series_ticker=...&status=open (or event_ticker=...), paginated with limit and cursor like the real API.
+        """
+        event = query.get("event_ticker")
+        series = event.rsplit("-", 1)[0] if event else query.get("series_ticker", "KXHIGHLAX")
+        markets = [m for m in self.open_markets(series) if event is None or m["event_ticker"] == event]
+        start = int(query.get("cursor") or 0)
+        end = start + int(query.get("limit", 100))
+        return 200, None, {"markets": markets[start:end], "cursor": str(end) if end < len(markets) else ""}
+
+    def _check_signature(self, method, path, headers):
+        for h in ("KALSHI-ACCESS-KEY", "KALSHI-ACCESS-TIMESTAMP", "KALSHI-ACCESS-SIGNATURE"):
+            if not headers.get(h):
+                return False
+        if self.public_key is None:
+            return True
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+        msg = f"{headers['KALSHI-ACCESS-TIMESTAMP']}{method}{path}".encode("utf-8")
+        try:
+            self.public_key.verify(
+                base64.b64decode(headers["KALSHI-ACCESS-SIGNATURE"]), msg,
+                padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+                hashes.SHA256(),
+            )
+        except InvalidSignature:
+            return False
+        return True
+
+    def _place(self, order):
+        """
+        Books one order: rests, and fills fill_delay seconds later if its limit is at or above the ask.
+        Returns (status, body) like the single-order endpoint.
+        """
+        series, event = order["ticker"].split("-")[0], order["ticker"].rsplit("-", 1)[0]
+        quote = next((m for m in self.open_markets(series) if m["ticker"] == order["ticker"]), None)
+        if quote is None or event in self.fail_events:
+            return 400, {"error": "market_not_found"}
+        side = order["side"]
+        with self._lock:
+            if order["client_order_id"] in self.orders:
+                return 409, {"error": "order_already_exists"}
+            order_id = f"ord-{len(self.orders) + 1}"
+            booked = dict(order, order_id=order_id, created=time.monotonic(),
+                          marketable=order[f"{side}_price"] >= quote[f"{side}_ask"])
+            self.orders[order["client_order_id"]] = booked
+            self.orders_by_id[order_id] = booked
+        return 201, {"order": self._order_view(booked)}
+
+    def _order_view(self, booked):
+        filled = booked["marketable"] and time.monotonic() - booked["created"] >= self.fill_delay
+        view = {k: v for k, v in booked.items() if k not in ("created", "marketable")}
+        view.update(status="executed" if filled else "resting",
+                    fill_count=booked["count"] if filled else 0, remaining_count=0 if filled else booked["count"])
+        return view
+
+    def create_order(self, method, query, body, headers):
+        """
+        POST /portfolio/orders: rejects unsigned requests and repeated client_order_ids, like the exchange.
+        """
+        if method != "POST":
+            return 405, None, {"error": "method not allowed"}
+        if not self._check_signature(method, "/trade-api/v2/portfolio/orders", headers):
+            return 401, None, {"error": "unauthorized"}
+        status, payload = self._place(json.loads(body))
+        return status, None, payload
+
+    def batch_orders(self, method, query, body, headers):
+        """
+        POST /portfolio/orders/batched: up to 20 orders, one {"order"} or {"error"} entry each.
+        """
+        if not self._check_signature(method, "/trade-api/v2/portfolio/orders/batched", headers):
+            return 401, None, {"error": "unauthorized"}
+        orders = json.loads(body)["orders"]
+        if len(orders) > 20:
+            return 400, None, {"error": "too many orders"}
+        out = []
+        for order in orders:
+            status, payload = self._place(order)
+            out.append(payload if status == 201 else {"error": payload["error"]})
+        return 201, None, {"orders": out}
+
+    def get_order(self, method, query, body, headers, order_id):
+        if not self._check_signature(method, f"/trade-api/v2/portfolio/orders/{order_id}", headers):
+            return 401, None, {"error": "unauthorized"}
+        booked = self.orders_by_id.get(order_id)
+        if booked is None:
+            return 404, None, {"error": "not found"}
+        return 200, None, {"order": self._order_view(booked)}
+
+
+class SimulatedExchange(KalshiStub):
+    """
+    KalshiStub whose quotes move: every tick seconds `movers` random markets of the listed series
+    shift their yes ask by 1-3 cents (and the no ask the other way). Quotes only move between requests,
+    so a poller sees every change made since its last poll at once.
+    """
+
+    def __init__(self, tick=0.1, movers=2, **kwargs):
+        super().__init__(**kwargs)
+        self.tick = tick
+        self.movers = movers
+        self.offsets = {}
+        self._t0 = time.perf_counter()
+        self._ticks = 0
+
+    def _advance(self, tickers):
+        due = int((time.perf_counter() - self._t0) / self.tick)
+        while self._ticks < due:
+            self._ticks += 1
+            for _ in range(self.movers):
+                t = self.rng.choice(tickers)
+                self.offsets[t] = self.offsets.get(t, 0) + self.rng.choice([-3, -2, -1, 1, 2, 3])
+
+    def open_markets(self, series):
+        markets = super().open_markets(series)
+        with self._lock:
+            self._advance([m["ticker"] for m in markets])
+            for m in markets:
+                off = self.offsets.get(m["ticker"], 0)
+                m["yes_ask"] = min(99, max(1, m["yes_ask"] + off))
+                m["yes_bid"] = m["yes_ask"] - 2
+                m["no_ask"] = min(99, max(1, m["no_ask"] - off))
+                m["no_bid"] = m["no_ask"] - 2
+        return markets
+
+
+def nws_stub(cli_texts, latency=0.0, seed=0):
+    """
+    Stub of the weather.gov endpoints the engine reads, on one local server:
+      /product.php?...&issuedby=XXX&version=N  CLI report texts, cli_texts[issuedby][version]
+      /points/{lat},{lon}                     a gridpoint for any location
+      /gridpoints/{office}/{x},{y}/forecast/hourly  168 hourly periods starting today (UTC)
+    The hourly forecast is the same until the server's forecast_revision is bumped, and carries an
+    ETag and Last-Modified per revision; a request that sends the current ETag gets a 304.
+    Pass its url as nws_api and url + CLI_PATH_TEMPLATE as a city's cli_url.
+    """
+    start = dt.datetime.combine(dt.datetime.now(dt.timezone.utc).date(), dt.time())
+
+    def forecast(path, revision):
+        rng = random.Random(f"{seed}-{path}-{revision}")
+        # the fields api.weather.gov sends per period, so payload sizes are realistic
+        periods = [{"number": h + 1, "name": "", "startTime": (start + dt.timedelta(hours=h)).isoformat(),
+                    "endTime": (start + dt.timedelta(hours=h + 1)).isoformat(), "isDaytime": 6 <= h % 24 < 18,
+                    "temperature": rng.randint(60, 80), "temperatureUnit": "F", "temperatureTrend": "",
+                    "probabilityOfPrecipitation": {"unitCode": "wmoUnit:percent", "value": rng.randint(0, 20)},
+                    "dewpoint": {"unitCode": "wmoUnit:degC", "value": round(rng.uniform(5, 15), 2)},
+                    "relativeHumidity": {"unitCode": "wmoUnit:percent", "value": rng.randint(40, 90)},
+                    "windSpeed": f"{rng.randint(0, 15)} mph", "windDirection": "WSW",
+                    "icon": "https://api.weather.gov/icons/land/day/few?size=small",
+                    "shortForecast": "Sunny", "detailedForecast": ""} for h in range(168)]
+        updated = start + dt.timedelta(minutes=revision)
+        return {"properties": {"updateTime": updated.isoformat() + "+00:00", "periods": periods}}, updated
+
+    def handler(method, path, query, body, headers):
+        if path == "/product.php":
+            text = cli_texts.get(query.get("issuedby"), {}).get(int(query.get("version", 1)))
+            return (200, None, text) if text is not None else (404, None, "not found")
+        m = re.fullmatch(r"/points/([-\d.]+),([-\d.]+)", path)
+        if m:
+            x, y = int(abs(float(m.group(1))) * 3) % 200, int(abs(float(m.group(2))) * 3) % 200
+            return 200, None, {"properties": {"gridId": "STB", "gridX": x, "gridY": y}}
+        if re.fullmatch(r"/gridpoints/[^/]+/[^/]+/forecast/hourly", path):
+            revision = server.forecast_revision
+            etag = f'"{revision}-{abs(hash(path)) % 10**8}"'
+            payload, updated = forecast(path, revision)
+            validators = {"ETag": etag, "Last-Modified": updated.strftime("%a, %d %b %Y %H:%M:%S GMT")}
+            if headers.get("If-None-Match") == etag:
+                return 304, validators, b""
+            return 200, validators, payload
+        return 404, None, {"error": "not found"}
+
+    server = StubServer(handler, latency=latency)
+    server.forecast_revision = 0
+    return server
+
+
+CLI_PATH_TEMPLATE = "/product.php?site={site}&issuedby={issuedby}&product=CLI&format=TXT&version={{v}}&glossary=0"
+
+
+class GribstreamStub(StubServer):
+    """
+    Stub of the gribstream NBM history endpoint, POST /api/v2/nbm/history -> CSV
+    (forecasted_at, forecasted_time, lat, lon, name, tempK). There is one run per hour and each run
+    forecasts a diurnal cycle shifted by its own offset, so different as-of times give different answers.
+    A request with asOf gets the latest run at or before it (what fetch_nextday_tmax_lax sends), one
+    with minHorizon/maxHorizon every run in that lead-time range.
+    Requests for a window that touches one of fail_days answer 500 the first `failures` times (fail_days may
+    also map each day to its own number of failures); missing_days have no rows.
+    """
+    PATH = "/api/v2/nbm/history"
+
+    def __init__(self, token="stub-token", latency=0.0, fail_days=(), failures=1, missing_days=()):
+        self.token = token
+        self.fail_days = dict(fail_days) if isinstance(fail_days, dict) else {d: failures for d in fail_days}
+        self.missing_days = set(missing_days)
+        self.failed = {}
+        self.windows = []
+        super().__init__(self.dispatch, latency=latency)
+
+    @staticmethod
+    def temp_k(run, t):
+        hours = int(run.timestamp() // 3600)
+        offset = (hours * 7919 % 101) / 50 - 1
+        return round(288 + 6 * math.sin(2 * math.pi * (t.hour - 16) / 24) + 4 * math.sin(t.timetuple().tm_yday / 58) + offset, 3)
+
+    def dispatch(self, method, path, query, body, headers):
+        if path != self.PATH or method != "POST":
+            return 404, None, {"error": "not found"}
+        if headers.get("Authorization") != f"Bearer {self.token}":
+            return 401, None, {"error": "unauthorized"}
+        req = json.loads(body)
+        parse = lambda s: dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
+        start, until = parse(req["fromTime"]), parse(req["untilTime"])
+        days = {(start + dt.timedelta(days=i)).date() for i in range((until - start).days)}
+        with self._lock:
+            self.windows.append((start.date(), len(days)))
+            bad = sorted(d for d in days & self.fail_days.keys() if self.failed.get(d, 0) < self.fail_days[d])
+            for d in bad:
+                self.failed[d] = self.failed.get(d, 0) + 1
+        if bad:
+            return 500, None, {"error": f"upstream error for {bad[0]}"}
+
+        coord = req["coordinates"][0]
+        lines = ["forecasted_at,forecasted_time,lat,lon,name,tempK"]
+        t = start
+        while t < until:
+            if t.date() not in self.missing_days:
+                if "asOf" in req:
+                    runs = [parse(req["asOf"]).replace(minute=0, second=0, microsecond=0)]
+                else:
+                    runs = [t - dt.timedelta(hours=h) for h in range(req["minHorizon"], req["maxHorizon"] + 1)]
+                for run in runs:
+                    lines.append(f"{run.isoformat().replace('+00:00', 'Z')},{t.isoformat().replace('+00:00', 'Z')},"
+                                 f"{coord['lat']},{coord['lon']},{coord['name']},{self.temp_k(run, t)}")
+            t += dt.timedelta(hours=1)
+        return 200, None, "\n".join(lines) + "\n"
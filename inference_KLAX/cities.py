@@ -0,0 +1,87 @@
+"""
+Cities the inference engine runs, one Kalshi high-temperature series each.
+
+  series_ticker      Kalshi series whose open events are priced
+  cli_site/issuedby  NWS office and station of the CLI report the series settles on
+  office, grid       NWS gridpoint for the hourly forecast; if grid is None it is looked up from lat/lon
+  tz                 station time zone, defines "today" and "tomorrow" for that city
+  model_path         XGBoost forecast-error model (None = the KLAX model)
+  sigma              std of the adjusted forecast error, in F
+  residual_cdf       optional: a residual_cdf.ResidualCDF table (.npz) of the adjusted forecast error,
+                     used instead of Normal(0, sigma) to price the markets
+  cli_cache, state   where the city's CLI reports and rolling feature state are kept
+  obs_store          optional: obs_store.ObsStore of the city's daily observations, updated from the
+                     CLI every run; the feature row is built from it by date, and the city fails
+                     when a day of the feature window has no observation
+  forecast_cache     optional: where hourly forecasts and their revisions are kept, per gridpoint
+                     (default inference_KLAX/forecast_cache/)
+  trade              send orders (False = only log the EV table): one NO contract on the market with the
+                     best NO edge, limit 2 cents over fair value
+  multi_leg          optional: buy every market and side whose edge is above min_edge (in dollars,
+                     default 0.02) instead, the best max_legs of them (required) and, if max_notional
+                     is set, no more than max_notional dollars in total
+"""
+from pathlib import Path
+from cli_cache import CACHE_DIR
+from feature_state import STATE_PATH
+from obs_store import OBS_DIR
+
+STATE_DIR = Path(__file__).resolve().parent / "state"   # inference_KLAX/state/<city>/
+
+
+def _paths(name):
+    return {"cli_cache": STATE_DIR / name / "cli_cache", "state": STATE_DIR / name / "feature_state.json",
+            "obs_store": STATE_DIR / name / "obs_store"}
+
+
+CITIES = [
+    {
+        "name": "LAX",
+        "series_ticker": "KXHIGHLAX",
+        "cli_site": "LOX", "cli_issuedby": "LAX",
+        "office": "LOX", "grid": "149,41", "lat": 33.94, "lon": -118.401,
+        "tz": "America/Los_Angeles",
+        "model_path": None,
+        "sigma": 2.5324872296670837,
+        # LAX keeps the original locations so existing caches stay valid
+        "cli_cache": CACHE_DIR, "state": STATE_PATH, "obs_store": OBS_DIR,
+        "trade": True,
+    },
+    # NYC and CHI reuse the KLAX error model and sigma until they have their own,
+    # so they only log their EV tables.
+    {
+        "name": "NYC",
+        "series_ticker": "KXHIGHNY",
+        "cli_site": "OKX", "cli_issuedby": "NYC",
+        "office": None, "grid": None, "lat": 40.7789, "lon": -73.9692,   # Central Park
+        "tz": "America/New_York",
+        "model_path": None,
+        "sigma": 2.5324872296670837,
+        **_paths("NYC"),
+        "trade": False,
+    },
+    {
+        "name": "CHI",
+        "series_ticker": "KXHIGHCHI",
+        "cli_site": "LOT", "cli_issuedby": "MDW",
+        "office": None, "grid": None, "lat": 41.7868, "lon": -87.7522,   # Chicago Midway
+        "tz": "America/Chicago",
+        "model_path": None,
+        "sigma": 2.5324872296670837,
+        **_paths("CHI"),
+        "trade": False,
+    },
+]
+
+
+def get_cities(names=None):
+    """
+    The configured cities, or only those named (in config order).
+    """
+    if names is None:
+        return list(CITIES)
+    names = set(names)
+    unknown = names - {c["name"] for c in CITIES}
+    if unknown:
+        raise ValueError(f"unknown cities: {sorted(unknown)}")
+    return [c for c in CITIES if c["name"] in names]
@@ -0,0 +1,86 @@
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent / "cli_cache"   # inference_KLAX/cli_cache/
+KEY_FORMAT = "%Y%m%d%H%M"
+
+
+class CLICache:
+    """
+    Persistent store of raw and parsed CLI reports, keyed by the report's issuance time.
+
+    Layout:
+      raw/<YYYYmmddHHMM>.txt  - the report text as downloaded
+      index.json              - {key: {"yesterday": {...} | None, "today": {...} | None}}
+
+    Version numbers shift by one every time NWS issues a new report, issuance times don't,
+    so a run only needs to download versions until it reaches a report it already has.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_age_days=90):
+        self.root = Path(root)
+        self.raw_dir = self.root / "raw"
+        self.index_path = self.root / "index.json"
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._index = json.loads(self.index_path.read_text()) if self.index_path.exists() else {}
+        self._on_disk = set(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, issued):
+        return issued.strftime(KEY_FORMAT) in self._index
+
+    def newest(self):
+        """
+        Issuance time of the newest cached report, or None if the cache is empty.
+        """
+        return datetime.strptime(max(self._index), KEY_FORMAT) if self._index else None
+
+    def put(self, issued, text, record):
+        """
+        Stores a freshly downloaded report and its parsed record. Counts as a cache miss.
+        """
+        key = issued.strftime(KEY_FORMAT)
+        self.raw_dir.mkdir(parents=True, exist_ok=True)
+        (self.raw_dir / f"{key}.txt").write_text(text)
+        self._index[key] = record
+        self.misses += 1
+
+    def text(self, issued):
+        return (self.raw_dir / f"{issued.strftime(KEY_FORMAT)}.txt").read_text()
+
+    def records(self, limit=None):
+        """
+        Yields parsed records, newest first (the same order as CLI versions). Records read
+        that were already on disk when the cache was opened count as hits.
+        """
+        for k in sorted(self._index, reverse=True)[:limit]:
+            self.hits += k in self._on_disk
+            yield self._index[k]
+
+    def evict(self, max_age_days=None, now=None):
+        """
+        Drops reports issued more than max_age_days ago. Returns how many were removed.
+        """
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        cutoff = ((now or datetime.now()) - timedelta(days=max_age_days)).strftime(KEY_FORMAT)
+        old = [k for k in self._index if k < cutoff]
+        for k in old:
+            del self._index[k]
+            self._on_disk.discard(k)
+            (self.raw_dir / f"{k}.txt").unlink(missing_ok=True)
+        return len(old)
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._index, indent=1, sort_keys=True))
+        os.replace(tmp, self.index_path)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "reports": len(self._index)}
@@ -0,0 +1,146 @@
+import re
+from datetime import date, datetime
+import pandas as pd
+
+# One alternation for every field we read out of a CLI report, so a report is scanned once.
+# Every branch starts with a plain literal so re can skip straight to candidate positions,
+# and each ends in a named group that tells the scan loop which field it hit.
+# Longer tokens come before the bare YESTERDAY/TODAY labels so they win at the same position.
+# Separators are [ \t]+ / \s+ so raw text (\r\n line endings, runs of spaces) parses the same as normalized text.
+_CLI_TOKENS = re.compile(
+    r"""
+      CLIMATE[ \t]+SUMMARY[ \t]+FOR[ \t]+(?P<month>\w+)[ \t]+(?P<day>\d{1,2})[ \t]+(?P<year>\d{4})
+    | TEMPERATURE\s*\(F\)(?P<temp>)
+    | YESTERDAY\s+MAXIMUM\s+(?P<tmax_yesterday>\d+)
+    | TODAY\s+MAXIMUM\s+(?P<tmax_today>\d+)
+    | MINIMUM\s+(?P<tmin>\d+)
+    | PRECIPITATION\s*\(IN\)\s*(?:YESTERDAY\s+(?P<prcp_yesterday>[0-9]+(?:\.[0-9]+)?)|TODAY\s+(?P<prcp_today>[0-9]+(?:\.[0-9]+)?))
+    | AVERAGE[ \t]+WIND[ \t]+SPEED\s+(?P<awnd>[\d.]+)
+    | HIGHEST[ \t]+WIND[ \t]+(?:DIRECTION\s+\w+\s+\((?P<wdf2>\d+)\)|SPEED\s+(?P<wsf2>\d+))
+    | YESTERDAY(?P<yesterday>)
+    | TODAY\b(?P<today>)
+    """,
+    re.VERBOSE,
+)
+
+# the issuance line sits in the header, e.g. "430 AM PDT SAT OCT 18 2025"
+_ISSUED = re.compile(
+    r"^[ \t]*(\d{3,4})[ \t]+(AM|PM)[ \t]+[A-Z]{3}[ \t]+[A-Z]{3}[ \t]+([A-Z]{3})[ \t]+(\d{1,2})[ \t]+(\d{4})[ \t]*\r?$",
+    re.MULTILINE,
+)
+ISSUED_SEARCH_CHARS = 400
+
+_MONTHS = {m: i for i, m in enumerate(
+    ["JANUARY", "FEBRUARY", "MARCH", "APRIL", "MAY", "JUNE", "JULY",
+     "AUGUST", "SEPTEMBER", "OCTOBER", "NOVEMBER", "DECEMBER"], start=1)}
+_MONTHS.update({m[:3]: i for m, i in list(_MONTHS.items())})
+
+FIELDS = ["issued", "DATE", "has_yesterday", "has_today", "TMAX_yesterday", "TMAX_today",
+          "TMIN", "PRCP_yesterday", "PRCP_today", "AWND", "WDF2", "WSF2"]
+
+
+class CLIRecord:
+    """
+    Every field of one CLI report, for both the YESTERDAY and TODAY variants.
+    TMIN and the wind fields are shared: a report only carries one of the two sections.
+    Temperatures, wind direction and wind speed are ints, precipitation and average wind floats, missing values None.
+    """
+    __slots__ = ("issued", "date", "has_yesterday", "has_today", "tmax_yesterday", "tmax_today",
+                 "tmin", "prcp_yesterday", "prcp_today", "awnd", "wdf2", "wsf2")
+
+    def __init__(self):
+        self.issued = self.date = None
+        self.has_yesterday = self.has_today = False
+        self.tmax_yesterday = self.tmax_today = self.tmin = None
+        self.prcp_yesterday = self.prcp_today = None
+        self.awnd = self.wdf2 = self.wsf2 = None
+
+    def _row(self, tmax, prcp):
+        return {
+            "DATE": self.date.isoformat() if self.date else None,
+            "TMAX": tmax,
+            "TMIN": self.tmin,
+            "PRCP": prcp,
+            "AWND": self.awnd,
+            "WDF2": self.wdf2,
+            "WSF2": self.wsf2,
+        }
+
+    def yesterday(self):
+        """
+        The row extract_cli_yesterday builds, or None if the report has no YESTERDAY section.
+        """
+        return self._row(self.tmax_yesterday, self.prcp_yesterday) if self.has_yesterday else None
+
+    def today(self):
+        """
+        The row extract_cli_today builds, or None if the report has no TODAY section.
+        """
+        return self._row(self.tmax_today, self.prcp_today) if self.has_today else None
+
+    def values(self):
+        return (self.issued, self.date, self.has_yesterday, self.has_today, self.tmax_yesterday,
+                self.tmax_today, self.tmin, self.prcp_yesterday, self.prcp_today, self.awnd,
+                self.wdf2, self.wsf2)
+
+
+def parse_cli_report(text):
+    """
+    Parses a CLI report (raw or normalized) in a single scan. Each field keeps its first match,
+    like the per-field re.search calls it replaces. A report has a TODAY section if TODAY
+    shows up after the TEMPERATURE (F) header, and a YESTERDAY section if YESTERDAY shows up anywhere.
+    """
+    rec = CLIRecord()
+    m = _ISSUED.search(text, 0, ISSUED_SEARCH_CHARS)
+    if m:
+        hhmm, ampm, month, day, year = m.groups()
+        hour, minute = divmod(int(hhmm), 100)
+        hour = hour % 12 + (12 if ampm == "PM" else 0)
+        rec.issued = datetime(int(year), _MONTHS[month], int(day), hour, minute)
+
+    seen_temp = False
+    for m in _CLI_TOKENS.finditer(text):
+        kind = m.lastgroup
+        if kind in ("tmax_today", "prcp_today", "today"):
+            # TODAY needs a word boundary on the left too
+            start = m.start()
+            if start and (text[start - 1].isalnum() or text[start - 1] == "_"):
+                continue
+            rec.has_today = rec.has_today or seen_temp
+        elif kind in ("tmax_yesterday", "prcp_yesterday", "yesterday"):
+            rec.has_yesterday = True
+
+        if kind == "yesterday" or kind == "today":
+            continue
+        if kind == "temp":
+            seen_temp = True
+        elif kind == "year":
+            if rec.date is None:
+                month = _MONTHS.get(m["month"].upper())
+                if month:
+                    rec.date = date(int(m["year"]), month, int(m["day"]))
+        elif kind == "awnd":
+            if rec.awnd is None:
+                try:
+                    rec.awnd = float(m["awnd"])
+                except ValueError:
+                    pass
+        elif getattr(rec, kind) is None:
+            value = m[kind]
+            setattr(rec, kind, float(value) if kind.startswith("prcp") else int(value))
+    return rec
+
+
+def parse_cli_reports(texts):
+    """
+    Parses many CLI reports into one columnar frame with a column per FIELDS entry.
+    """
+    columns = list(zip(*(parse_cli_report(t).values() for t in texts))) or [()] * len(FIELDS)
+    df = pd.DataFrame({name: pd.Series(col, dtype=object) for name, col in zip(FIELDS, columns)})
+    df["issued"] = pd.to_datetime(df["issued"])
+    df["DATE"] = pd.to_datetime(df["DATE"])
+    for c in ["has_yesterday", "has_today"]:
+        df[c] = df[c].astype(bool)
+    for c in FIELDS[4:]:
+        df[c] = pd.to_numeric(df[c], errors="coerce").astype("float64")
+    return df
@@ -0,0 +1,176 @@
+import json
+import os
+import shutil
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+META = "_meta.json"
+
+
+def _to_array(s):
+    """
+    A column as a plain (memory-mappable) NumPy array: strings become fixed-width unicode.
+    """
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s.dt.tz_localize(None).to_numpy("datetime64[ns]") if s.dt.tz is not None else s.to_numpy("datetime64[ns]")
+    if s.dtype == object or pd.api.types.is_string_dtype(s):
+        return s.fillna("").astype(str).to_numpy(dtype=str)
+    if pd.api.types.is_bool_dtype(s):
+        return s.to_numpy(dtype=bool)
+    return s.to_numpy()
+
+
+def write_columns(path, df):
+    """
+    Writes df as one .npy file per column plus a _meta.json with the column order and row count.
+    The directory is built next to path and swapped in, so readers never see half a partition.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for c in df.columns:
+        np.save(tmp / f"{c}.npy", _to_array(df[c]))
+    (tmp / META).write_text(json.dumps({"columns": list(df.columns), "rows": len(df)}))
+    if path.exists():
+        shutil.rmtree(path)
+    os.replace(tmp, path)
+
+
+def is_partition(path):
+    return (Path(path) / META).exists()
+
+
+def partition_rows(path):
+    return json.loads((Path(path) / META).read_text())["rows"]
+
+
+def read_arrays(path, columns=None, mmap=True):
+    """
+    The partition's columns as NumPy arrays, memory-mapped (zero-copy, read-only) unless mmap=False.
+    """
+    path = Path(path)
+    meta = json.loads((path / META).read_text())
+    columns = meta["columns"] if columns is None else columns
+    mode = "r" if mmap else None
+    return {c: np.load(path / f"{c}.npy", mmap_mode=mode) for c in columns}
+
+
+def read_columns(path, columns=None, mmap=True):
+    """
+    The partition as a DataFrame, reading only the requested columns.
+    """
+    return pd.DataFrame(read_arrays(path, columns, mmap=mmap))
+
+
+def read_partitions(paths, columns=None, mmap=True):
+    """
+    Concatenates several partitions (e.g. one per day) into one frame.
+    """
+    frames = [read_columns(p, columns, mmap=mmap) for p in paths]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+class ColumnTable:
+    """
+    An append-only table stored as one raw binary file per column plus _meta.json (columns, dtypes,
+    row count and free-form attrs). Appending writes only the new rows; arrays() memory-maps every
+    column over the whole table without reading or copying it.
+
+    The row count in _meta.json is written last, so a crash mid-append leaves the table at its old length.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    @property
+    def meta(self):
+        meta_path = self.path / META
+        if not meta_path.exists():
+            return {"columns": [], "dtypes": {}, "rows": 0, "attrs": {}}
+        return json.loads(meta_path.read_text())
+
+    def _write_meta(self, meta):
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / (META + ".tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.path / META)
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    @property
+    def attrs(self):
+        return self.meta.get("attrs", {})
+
+    def set_attrs(self, **attrs):
+        meta = self.meta
+        meta.setdefault("attrs", {}).update(attrs)
+        self._write_meta(meta)
+
+    def append(self, df, **attrs):
+        """
+        Appends df's rows (same columns as the table; the first append defines them) and updates attrs.
+        A string column is widened (rewritten) when the new rows hold longer strings than it fits.
+        """
+        meta = self.meta
+        self.path.mkdir(parents=True, exist_ok=True)
+        if not meta["columns"]:
+            meta["columns"] = list(df.columns)
+            meta["dtypes"] = {c: _to_array(df[c]).dtype.str for c in df.columns}
+        for c in meta["columns"]:
+            a = _to_array(df[c])
+            if a.dtype.kind == "U" and np.dtype(meta["dtypes"][c]).kind == "U" \
+                    and a.dtype.itemsize > np.dtype(meta["dtypes"][c]).itemsize:
+                self._widen(meta, c, a.dtype)
+            a = a.astype(meta["dtypes"][c], copy=False)
+            with open(self.path / f"{c}.bin", "r+b" if (self.path / f"{c}.bin").exists() else "wb") as f:
+                # drop anything past the committed rows (an interrupted append), then add the new ones
+                f.truncate(meta["rows"] * a.dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(a).tobytes())
+        meta["rows"] += len(df)
+        meta.setdefault("attrs", {}).update(attrs)
+        self._write_meta(meta)
+        return len(df)
+
+    def _widen(self, meta, column, dtype):
+        # a string column holds fixed-width unicode: rewrite its committed rows at the wider width
+        path = self.path / f"{column}.bin"
+        old = np.dtype(meta["dtypes"][column])
+        rows = np.fromfile(path, dtype=old, count=meta["rows"]) if meta["rows"] else np.empty(0, dtype=old)
+        tmp = path.with_suffix(".tmp")
+        rows.astype(dtype).tofile(tmp)
+        os.replace(tmp, path)
+        meta["dtypes"][column] = dtype.str
+        self._write_meta(meta)
+
+    def truncate(self, rows):
+        """
+        Keeps the first rows rows (e.g. to rewrite a tail that has to be recomputed).
+        """
+        meta = self.meta
+        meta["rows"] = min(rows, meta["rows"])
+        self._write_meta(meta)
+
+    def arrays(self, columns=None, mode="r"):
+        """
+        Memory-mapped views of the columns, one NumPy array each: read-only, or with mode="r+"
+        writable in place (rows already committed only; new rows still go through append).
+        """
+        meta = self.meta
+        out = {}
+        for c in columns or meta["columns"]:
+            dtype = np.dtype(meta["dtypes"][c])
+            if meta["rows"] == 0:
+                out[c] = np.empty(0, dtype=dtype)
+            else:
+                out[c] = np.memmap(self.path / f"{c}.bin", dtype=dtype, mode=mode, shape=(meta["rows"],))
+        return out
+
+    def frame(self, columns=None):
+        """
+        The table as a DataFrame whose columns are the memory-mapped arrays (no copy).
+        """
+        return pd.DataFrame(self.arrays(columns), copy=False)
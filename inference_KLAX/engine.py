@@ -0,0 +1,295 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
+import ev
+import tracing
+from cli_cache import CLICache
+from execution import best_no_leg, execute
+from feature_state import FeatureState, HISTORY, check_feature_consistency
+from get_data import NWS_API, cli_url, extract_cli_yesterday, extract_cli_today, get_forecast, resolve_grid, merge_data
+from http_utils import make_session
+from kalshi_client import public_client
+from markets import list_markets
+from model import predict_errors, get_model_path
+from nws_forecast import ForecastClient, CACHE_DIR as FORECAST_CACHE_DIR
+from obs_store import ObsStore
+from residual_cdf import load_cdf
+
+STATUS_COLUMNS = ["city", "ok", "stage", "error", "forecast", "adjusted_forecast", "markets", "orders",
+                  "missing_obs", "weather_s", "markets_s", "order_s"]
+DEFAULT_MIN_EDGE = 0.02  # dollars, for cities whose config has no min_edge
+
+
+class CityRun:
+    """
+    One city's pass through the engine: what each stage produced, how long the network
+    stages took, and the first stage that failed (later stages are skipped for that city).
+    """
+    __slots__ = ("city", "today", "merged", "markets", "features", "forecast", "mu", "ev", "order",
+                 "missing", "stage", "error", "seconds")
+
+    def __init__(self, city):
+        self.city = city
+        self.today = datetime.now(ZoneInfo(city["tz"])).date()
+        self.merged = self.markets = self.features = self.ev = self.order = None
+        self.forecast = self.mu = np.nan
+        self.missing = None
+        self.stage = self.error = None
+        self.seconds = {}
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def fail(self, stage, error):
+        if self.ok:
+            self.stage, self.error = stage, f"{type(error).__name__}: {error}"
+            print(f"[{self.city['name']}] {stage} failed: {self.error}")
+
+    def status(self):
+        return {
+            "city": self.city["name"], "ok": self.ok, "stage": self.stage, "error": self.error,
+            "forecast": self.forecast, "adjusted_forecast": self.mu,
+            "markets": 0 if self.markets is None else len(self.markets),
+            "orders": 0 if self.order is None else int(self.order["order_id"].notna().sum()),
+            "missing_obs": np.nan if self.missing is None else len(self.missing),
+            **{f"{k}_s": self.seconds.get(k, np.nan) for k in ("weather", "markets", "order")},
+        }
+
+
+def fetch_weather(run, session, history_days=7, offline=False, nws_api=NWS_API):
+    """
+    CLI history, today's CLI report and tomorrow's forecast for one city, merged into the inference frame.
+    """
+    city = run.city
+    url = city.get("cli_url") or cli_url(city["cli_site"], city["cli_issuedby"])
+    cache = CLICache(city["cli_cache"])
+    with tracing.span("cli_yesterday", city=city["name"]):
+        yesterday = extract_cli_yesterday(concurrent=True, min_dates=history_days, url=url, cache=cache,
+                                          offline=offline, session=session)
+    with tracing.span("cli_today", city=city["name"]):
+        today = extract_cli_today(url=url, cache=cache, offline=offline, session=session)
+    with tracing.span("forecast", city=city["name"]):
+        office, grid = city["office"], city["grid"]
+        if grid is None:
+            office, grid = resolve_grid(city["lat"], city["lon"], session=session, api=nws_api)
+        forecasts = ForecastClient(city.get("forecast_cache") or FORECAST_CACHE_DIR, session=session, api=nws_api)
+        forecast = get_forecast(office, grid, today=run.today, client=forecasts)
+    return merge_data(yesterday, today, forecast)
+
+
+def fetch_city_markets(run, client):
+    """
+    The city's open markets on tomorrow's event (tomorrow in the city's own time zone).
+    """
+    tomorrow = pd.Timestamp(run.today + timedelta(days=1))
+    df = list_markets([run.city["series_ticker"]], client=client)
+    df = df[df["date"] == tomorrow]
+    if df.empty:
+        raise LookupError(f"no open {run.city['series_ticker']} markets for {tomorrow.date()}")
+    return df
+
+
+def _timed(run, stage, fn, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        with tracing.span(stage, city=run.city["name"]):
+            return fn(*args, **kwargs)
+    finally:
+        run.seconds[stage] = time.perf_counter() - start
+
+
+def _run_concurrently(runs, stage, fn, attr, max_workers, timeout=None):
+    """
+    Calls fn(run) for every run on a thread pool and stores the result in run.<attr>.
+    A run whose call raises, or is still going after timeout seconds, is marked failed at stage.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {pool.submit(_timed, run, stage, fn, run): run for run in runs}
+    try:
+        done, _ = wait(futures, timeout=timeout)
+        for f, run in futures.items():
+            if f not in done:
+                run.fail(stage, TimeoutError(f"still running after {timeout}s"))
+            elif f.exception() is not None:
+                run.fail(stage, f.exception())
+            else:
+                setattr(run, attr, f.result())
+    finally:
+        # don't hold the run up on calls that timed out
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def store_features(run):
+    """
+    Adds the run's CLI rows to the city's observation store and takes the feature row from the
+    store's HISTORY days up to the newest, by date. Raises if a day of that window is missing.
+    """
+    store = ObsStore(run.city["obs_store"])
+    store.record_cli(run.merged, run.today)
+    newest = pd.Timestamp(run.merged["DATE"].max())
+    run.missing = store.missing(newest - pd.Timedelta(days=HISTORY - 1), newest)
+    return store.features(newest, run.forecast)
+
+
+def build_features(runs, check_features=True):
+    """
+    Advances each city's rolling feature state with its inference frame and takes the feature row.
+    A city with an observation store takes it from the store instead, and fails here when a day of
+    the feature window has no observation rather than lagging the wrong day.
+    """
+    for run in runs:
+        try:
+            state_path = Path(run.city["state"])
+            state = FeatureState.load(state_path)
+            state.update_from_frame(run.merged)
+            run.forecast = float(run.merged["forecasted_TMAX"].iloc[0])
+            if check_features:
+                check_feature_consistency(run.merged, state)
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            state.save(state_path)
+            if run.city.get("obs_store"):
+                run.features = store_features(run)
+            else:
+                run.features = state.features(run.forecast)
+        except Exception as e:
+            run.fail("features", e)
+
+
+def predict_all(runs):
+    """
+    Adjusted forecasts for every city, one vectorized predict call per model file.
+    """
+    by_model = {}
+    for run in runs:
+        by_model.setdefault(run.city.get("model_path") or get_model_path(), []).append(run)
+    for model_path, group in by_model.items():
+        try:
+            X = pd.concat([r.features for r in group], ignore_index=True)
+            errors = predict_errors(X, model_path)
+        except Exception as e:
+            for r in group:
+                r.fail("predict", e)
+            continue
+        for r, err in zip(group, errors):
+            r.mu = r.forecast + float(err)
+
+
+def ev_all(runs):
+    """
+    EV table of every city's markets, one vectorized get_ev call per error distribution: the
+    Normal cities together with each city's mu and sigma per row, and the cities sharing a
+    residual_cdf table together, with the month of the target date per row.
+    """
+    groups = {}
+    for r in runs:
+        groups.setdefault(r.city.get("residual_cdf"), []).append(r)
+    for cdf_path, group in groups.items():
+        markets = pd.concat([r.markets.assign(city=r.city["name"]) for r in group], ignore_index=True)
+        counts = [len(r.markets) for r in group]
+        mu = np.repeat([r.mu for r in group], counts)
+        try:
+            if cdf_path is None:
+                out = ev.get_ev(markets, mu, np.repeat([r.city["sigma"] for r in group], counts))
+            else:
+                month = np.repeat([(r.today + timedelta(days=1)).month for r in group], counts)
+                out = ev.get_ev(markets, mu, load_cdf(cdf_path), month=month)
+        except Exception as e:
+            for r in group:
+                r.fail("ev", e)
+            continue
+        for r, part in zip(group, np.split(np.arange(len(out)), np.cumsum(counts)[:-1])):
+            r.ev = out.iloc[part]
+
+
+def place_orders(run, client):
+    """
+    The city's orders for the day: the single baseline leg, or with multi_leg the capped legs above min_edge.
+    """
+    city = run.city
+    run_id = f"{city['name']}-{run.today}"
+    if not city.get("multi_leg"):
+        return execute(run.ev, client, run_id, legs=best_no_leg(run.ev, run_id))
+    if not city.get("max_legs"):
+        raise ValueError(f"{city['name']}: multi_leg needs max_legs")
+    return execute(run.ev, client, run_id, min_edge=city.get("min_edge", DEFAULT_MIN_EDGE),
+                   max_legs=city["max_legs"], max_notional=city.get("max_notional"))
+
+
+def journal_all(runs, journal):
+    """
+    Journals every city that got an EV table (decision, markets, orders) and the realized TMAX
+    of the days its CLI history covers. A journal error is reported but fails no city.
+    """
+    for run in runs:
+        try:
+            if run.merged is not None:
+                journal.record_realized(run.city["name"], run.merged, before=run.today)
+            if run.ev is not None:
+                journal.record_run(run)
+        except Exception as e:
+            print(f"[{run.city['name']}] journal failed: {type(e).__name__}: {e}")
+    try:
+        journal.compact()
+    except Exception as e:
+        print(f"journal compaction failed: {type(e).__name__}: {e}")
+
+
+def run_cities(cities, client=None, session=None, history_days=7, offline=False, check_features=True,
+               trade=True, max_workers=16, timeout=None, nws_api=NWS_API, journal=None):
+    """
+    Runs the daily inference pipeline for every city in one process.
+
+    Network stages (CLI + forecast, markets, orders) run concurrently across cities over one shared
+    weather.gov session and one Kalshi client; CPU stages (features, predict, EV) are batched across
+    cities. A city that fails at any stage is reported and dropped from the later ones without
+    affecting the rest. timeout bounds the weather and market stages, in seconds (not the order
+    stage, whose outcome must be known before the city is reported).
+    Orders are only sent if trade is True and the city's config has trade enabled: one NO contract on
+    the best NO edge (execution.best_no_leg), or with multi_leg every market and side with an edge
+    above the city's min_edge, up to its max_legs and max_notional. Client order ids are fixed per
+    city and day so a re-run on the same day cannot double an order (see execution.execute).
+    If journal (journal.Journal) is given, every city's decision, market snapshot and orders are appended to it.
+
+    Returns (ev_df, status): the EV table of all cities (with a city column) and one status row per city.
+    """
+    runs = [CityRun(c) for c in cities]
+    client = client or public_client()
+    # each city's CLI download keeps up to 8 requests in flight
+    session = session or make_session(pool_size=max(max_workers, 8 * len(runs)))
+    live = lambda: [r for r in runs if r.ok]
+
+    _run_concurrently(runs, "weather", lambda r: fetch_weather(r, session, history_days, offline, nws_api),
+                      "merged", max_workers, timeout)
+    _run_concurrently(live(), "markets", lambda r: fetch_city_markets(r, client), "markets", max_workers, timeout)
+
+    with tracing.span("features"):
+        build_features(live(), check_features)
+    with tracing.span("predict"):
+        predict_all(live())
+    with tracing.span("ev"):
+        ev_all(live())
+
+    for r in live():
+        print("------------------")
+        print(f"[{r.city['name']}] forecast {r.forecast}, adjusted {r.mu:.2f}, sigma {r.city['sigma']:.2f}")
+        print(r.ev[["market_ticker", "floor", "cap", "edge_yes_cents", "edge_no_cents", "p_yes", "p_no"]])
+
+    if trade:
+        traders = [r for r in live() if r.city.get("trade")]
+        # no timeout: a thread still sending orders can't be stopped, and a city it gave up on would be
+        # reported failed while its orders still go out; each request is bounded by the client's timeout
+        _run_concurrently(traders, "order", lambda r: place_orders(r, client), "order", max_workers)
+
+    if journal is not None:
+        with tracing.span("journal"):
+            journal_all(runs, journal)
+
+    evs = [r.ev for r in runs if r.ev is not None]
+    ev_df = pd.concat(evs, ignore_index=True) if evs else pd.DataFrame()
+    status = pd.DataFrame([r.status() for r in runs], columns=STATUS_COLUMNS)
+    return ev_df, status
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+
+def prob_yes(floor, cap, mu, sigma, month=None):
+    """
+    Model-implied probability that YES settles to 1, for T ~ Normal(mu, sigma), or T = mu + error
+    with error drawn from sigma's table if sigma is a residual_cdf.ResidualCDF (month, 1..12 and
+    broadcast like mu, picks its seasonal row).
+
+    Contract encoding (NaN = missing):
+      - floor & cap present  -> bucket: floor <= T < cap
+      - floor present only   -> unilateral: T >= floor
+      - cap present only     -> unilateral: T < cap
+      - both missing         -> NaN
+
+    All arguments broadcast against each other, so one call can price every market of every
+    day (mu aligned to the rows) for a whole grid of sigmas (e.g. sigma of shape (k, 1)).
+    """
+    if hasattr(sigma, "prob_yes"):
+        return sigma.prob_yes(floor, cap, mu, month)
+    floor = np.asarray(floor, dtype="float64")
+    cap = np.asarray(cap, dtype="float64")
+    mu = np.asarray(mu, dtype="float64")
+    sigma = np.asarray(sigma, dtype="float64")
+
+    has_floor = ~np.isnan(floor)
+    has_cap = ~np.isnan(cap)
+    # a missing edge is an open end of the interval: CDF 0 below, 1 above
+    upper = np.where(has_cap, ndtr((cap - mu) / sigma), 1.0)
+    lower = np.where(has_floor, ndtr((floor - mu) / sigma), 0.0)
+    p = np.clip(upper - lower, 0.0, 1.0)
+    return np.where(has_floor | has_cap, p, np.nan)
+
+
+def get_ev(markets: pd.DataFrame, mu, sigma, ask_scale=100.0, price_decimals=None, month=None) -> pd.DataFrame:
+    """
+    Vectorized EV table for Kalshi contract rows: p_yes, p_no, max_*_cents, edge_*_cents and buy_*.
+    mu and sigma may be scalars or arrays aligned with the rows of markets; sigma may also be a
+    ResidualCDF (see prob_yes), with month aligned the same way.
+
+    ask_scale converts the yes_ask/no_ask columns to dollars (100 for API quotes in cents,
+    1 for candle prices already in dollars). price_decimals rounds max_*_cents before the
+    edges are taken, if set.
+    """
+    out = markets.copy()
+    floor = out["floor"].to_numpy(dtype="float64") if "floor" in out.columns else np.full(len(out), np.nan)
+    cap = out["cap"].to_numpy(dtype="float64") if "cap" in out.columns else np.full(len(out), np.nan)
+
+    p_yes = prob_yes(floor, cap, mu, sigma, month)
+    out["p_yes"] = p_yes
+    out["p_no"] = 1.0 - p_yes
+
+    # Maximum you're willing to pay
+    max_yes = out["p_yes"] if price_decimals is None else out["p_yes"].round(price_decimals)
+    max_no = out["p_no"] if price_decimals is None else out["p_no"].round(price_decimals)
+    out["max_yes_cents"] = max_yes
+    out["max_no_cents"] = max_no
+
+    # Compare to current asks
+    if "yes_ask" in out.columns:
+        out["edge_yes_cents"] = (out["max_yes_cents"] - (out["yes_ask"] / ask_scale)).round(2)
+    if "no_ask" in out.columns:
+        out["edge_no_cents"] = (out["max_no_cents"] - (out["no_ask"] / ask_scale)).round(2)
+
+    # Handy boolean suggestions (strictly positive edge)
+    if "yes_ask" in out.columns:
+        out["buy_yes"] = out["edge_yes_cents"] > 0
+    if "no_ask" in out.columns:
+        out["buy_no"] = out["edge_no_cents"] > 0
+
+    return out
+
+
+def ev_grid(floor, cap, mu, sigma, yes_ask, no_ask, ask_scale=100.0, month=None):
+    """
+    Raw-array EV for parameter searches: broadcasts like prob_yes and returns
+    (p_yes, edge_yes, edge_no) arrays without building a DataFrame. Edges are not rounded.
+    """
+    p_yes = prob_yes(floor, cap, mu, sigma, month)
+    edge_yes = p_yes - np.asarray(yes_ask, dtype="float64") / ask_scale
+    edge_no = (1.0 - p_yes) - np.asarray(no_ask, dtype="float64") / ask_scale
+    return p_yes, edge_yes, edge_no
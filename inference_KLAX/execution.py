@@ -0,0 +1,195 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from requests import HTTPError
+
+# namespace of the deterministic client order ids (uuid5 of run id, ticker and side)
+ORDER_NAMESPACE = uuid.UUID("6f1c2b9e-4d1a-5c3e-9b7a-2e8d0f4a6c11")
+BATCH_LIMIT = 20  # orders per /portfolio/orders/batched call
+OPEN_STATUSES = {"resting", "pending"}
+
+LEG_COLUMNS = ["market_ticker", "side", "price", "count", "edge", "client_order_id"]
+RESULT_COLUMNS = LEG_COLUMNS + ["order_id", "status", "error", "submit_ms", "fill_count", "remaining_count"]
+
+
+def client_order_id(run_id, ticker, side):
+    """
+    The same run, market and side always map to the same id, so a retried or re-run submission
+    is rejected by the exchange instead of doubling the position.
+    """
+    return str(uuid.uuid5(ORDER_NAMESPACE, f"{run_id}:{ticker}:{side}"))
+
+
+def build_orders(ev_df, run_id, min_edge=0.0, count=1, sides=("yes", "no")):
+    """
+    One limit order per market and side whose edge (edge_yes_cents / edge_no_cents) is above min_edge,
+    priced at the current ask in cents, best edge first.
+    """
+    legs = []
+    for side in sides:
+        edge = ev_df[f"edge_{side}_cents"].to_numpy(dtype="float64")
+        pick = ev_df[edge > min_edge]
+        legs.append(pd.DataFrame({
+            "market_ticker": pick["market_ticker"].to_numpy(),
+            "side": side,
+            "price": pick[f"{side}_ask"].to_numpy(dtype="float64"),
+            "count": count,
+            "edge": edge[edge > min_edge],
+        }))
+    legs = pd.concat(legs, ignore_index=True)
+    legs = legs[(legs["price"] >= 1) & (legs["price"] <= 99)]
+    legs["price"] = legs["price"].astype(int)
+    legs["client_order_id"] = [client_order_id(run_id, t, s) for t, s in zip(legs["market_ticker"], legs["side"])]
+    return legs.sort_values("edge", ascending=False, kind="stable").reset_index(drop=True)[LEG_COLUMNS]
+
+
+def best_no_leg(ev_df, run_id, count=1, offset=2):
+    """
+    The baseline order (create_orders.send_order) as a leg: count NO contracts on the market with
+    the highest NO edge, limit offset cents over fair value (p_no), within 1..99.
+    """
+    best = ev_df.loc[ev_df["edge_no_cents"].idxmax()]
+    price = min(99, max(1, int(round(float(best["p_no"]) * 100)) + offset))
+    return pd.DataFrame([{
+        "market_ticker": best["market_ticker"], "side": "no", "price": price, "count": count,
+        "edge": float(best["edge_no_cents"]), "client_order_id": client_order_id(run_id, best["market_ticker"], "no"),
+    }], columns=LEG_COLUMNS)
+
+
+def cap_legs(legs, max_legs=1, max_notional=None):
+    """
+    The first legs (build_orders sorts them best edge first) within max_legs orders and, if
+    max_notional is set, within max_notional dollars of cost (price * count) in total.
+    """
+    keep = np.arange(len(legs)) < max_legs
+    if max_notional is not None:
+        keep &= (legs["price"] * legs["count"] / 100.0).cumsum().to_numpy() <= max_notional
+    return legs[keep].reset_index(drop=True)
+
+
+def _payload(leg):
+    return {
+        "ticker": leg["market_ticker"],
+        "side": leg["side"],
+        "action": "buy",
+        "type": "limit",
+        "count": int(leg["count"]),
+        f"{leg['side']}_price": int(leg["price"]),
+        "client_order_id": leg["client_order_id"],
+    }
+
+
+def _ack(order):
+    return {"order_id": order.get("order_id"), "status": order.get("status"),
+            "fill_count": order.get("fill_count", 0), "remaining_count": order.get("remaining_count")}
+
+
+def order_error(e):
+    """
+    The status (and error) of a failed order request; a 409 means the client_order_id was already used.
+    """
+    if isinstance(e, HTTPError) and e.response is not None and e.response.status_code == 409:
+        # same client_order_id already placed, e.g. by an earlier run
+        return {"status": "duplicate"}
+    return {"status": "rejected", "error": f"{type(e).__name__}: {e}"}
+
+
+def _submit_one(client, leg):
+    start = time.perf_counter()
+    try:
+        out = _ack(client.post("/portfolio/orders", json=_payload(leg)).get("order", {}))
+    except Exception as e:
+        out = order_error(e)
+    out["submit_ms"] = (time.perf_counter() - start) * 1000
+    return out
+
+
+def _submit_batch(client, legs):
+    start = time.perf_counter()
+    try:
+        resp = client.post("/portfolio/orders/batched", json={"orders": [_payload(l) for l in legs]})
+    except Exception as e:
+        outs = [order_error(e) for _ in legs]
+    else:
+        outs = []
+        for item in resp.get("orders", []):
+            if item.get("error"):
+                error = str(item["error"])
+                # the batch endpoint reports a used client_order_id per order instead of a 409
+                outs.append({"status": "duplicate"} if "order_already_exists" in error
+                            else {"status": "rejected", "error": error})
+            else:
+                outs.append(_ack(item.get("order", {})))
+    ms = (time.perf_counter() - start) * 1000
+    for out in outs:
+        out["submit_ms"] = ms
+    return outs
+
+
+def submit_orders(client, legs, max_workers=8, batch=False):
+    """
+    Submits every leg: concurrently one POST each, or with batch=True through the batch endpoint
+    (BATCH_LIMIT legs per call, the calls themselves concurrent). Failed legs are reported, not raised.
+    Returns (results, seconds) with one row per leg (ack status, order id, submit latency).
+    """
+    records = legs.to_dict("records")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        if batch:
+            chunks = [records[i:i + BATCH_LIMIT] for i in range(0, len(records), BATCH_LIMIT)]
+            outs = [o for chunk_outs in pool.map(lambda c: _submit_batch(client, c), chunks) for o in chunk_outs]
+        else:
+            outs = list(pool.map(lambda l: _submit_one(client, l), records))
+    seconds = time.perf_counter() - start
+    results = pd.DataFrame([dict(leg, **out) for leg, out in zip(records, outs)], columns=RESULT_COLUMNS)
+    return results, seconds
+
+
+def track_fills(client, results, timeout=30.0, interval=1.0, max_workers=8):
+    """
+    Polls GET /portfolio/orders/{order_id} for the orders still open until they fill, are canceled or
+    timeout seconds pass, updating status, fill_count and remaining_count in place. Returns results.
+    """
+    deadline = time.perf_counter() + timeout
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while True:
+            open_rows = results.index[results["status"].isin(OPEN_STATUSES) & results["order_id"].notna()]
+            if not len(open_rows) or time.perf_counter() >= deadline:
+                break
+            orders = list(pool.map(lambda oid: client.get(f"/portfolio/orders/{oid}", auth=True).get("order", {}),
+                                   results.loc[open_rows, "order_id"]))
+            for i, order in zip(open_rows, orders):
+                ack = _ack(order)
+                for k in ("status", "fill_count", "remaining_count"):
+                    results.at[i, k] = ack[k]
+            if results["status"].isin(OPEN_STATUSES).any():
+                time.sleep(min(interval, max(0.0, deadline - time.perf_counter())))
+    return results
+
+
+def execute(ev_df, client, run_id, min_edge=0.0, count=1, batch=False, max_workers=8, fill_timeout=0.0,
+            max_legs=1, max_notional=None, legs=None):
+    """
+    Builds the qualifying legs of an EV table (or takes legs, e.g. best_no_leg), keeps the best ones
+    within max_legs orders and max_notional dollars (cap_legs), submits them, then optionally waits
+    up to fill_timeout seconds for fills. Prints a summary and returns the per-leg results.
+    """
+    legs = build_orders(ev_df, run_id, min_edge=min_edge, count=count) if legs is None else legs
+    capped = cap_legs(legs, max_legs, max_notional)
+    if len(capped) < len(legs):
+        print(f"{len(legs)} legs qualify, sending the best {len(capped)} "
+              f"(max_legs {max_legs}, max_notional {max_notional})")
+    legs = capped
+    if legs.empty:
+        print(f"no leg with edge above {min_edge} within the caps")
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    results, seconds = submit_orders(client, legs, max_workers=max_workers, batch=batch)
+    if fill_timeout:
+        track_fills(client, results, timeout=fill_timeout, max_workers=max_workers)
+    ms = results["submit_ms"].to_numpy()
+    print(f"{len(results)} orders in {seconds * 1000:.0f} ms "
+          f"(per order p50 {np.percentile(ms, 50):.0f} ms, p95 {np.percentile(ms, 95):.0f} ms): "
+          + ", ".join(f"{k} {v}" for k, v in results["status"].value_counts().items()))
+    return results
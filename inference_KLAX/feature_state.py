@@ -0,0 +1,178 @@
+import json
+import math
+import os
+from collections import deque
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from model import feature_engineering
+
+STATE_PATH = Path(__file__).resolve().parent / "feature_state.json"   # inference_KLAX/feature_state.json
+
+OBS_COLUMNS = ["TMAX", "TMIN", "PRCP", "AWND", "WDF2", "WSF2"]
+LAGS = [1, 2, 3, 7]
+PRCP_LAGS = [1, 2, 3, 4]
+HISTORY = max(LAGS + PRCP_LAGS) + 1   # rows needed for the longest lag of the current row
+
+# the column order the booster was trained with (see booster.feature_names)
+FEATURE_COLUMNS = (
+    OBS_COLUMNS + ["year", "forecasted_TMAX", "doy", "dow", "month", "doy_sin", "doy_cos",
+                   "diurnal_range", "wind_dir_sin", "wind_dir_cos"]
+    + [f"{c}_lag{k}" for c in ["TMAX", "TMIN", "diurnal_range"] for k in LAGS]
+    + [f"PRCP_lag_{k}" for k in PRCP_LAGS]
+    + ["rolling_3", "rolling_7"]
+)
+
+
+def _isnan(v):
+    return v is None or (isinstance(v, float) and math.isnan(v))
+
+
+class FeatureState:
+    """
+    Ring buffers holding the last HISTORY days of CLI observations (forward-filled on the way in)
+    and their diurnal range, enough to emit the inference feature vector without re-running
+    feature_engineering over the whole merged frame.
+
+    Rows must arrive in date order. An update for the newest date replaces it, so tonight's
+    preliminary TODAY report is overwritten by tomorrow's final YESTERDAY report for the same day.
+    """
+
+    def __init__(self, history=HISTORY):
+        self.dates = deque(maxlen=history)
+        self.obs = {c: deque(maxlen=history) for c in OBS_COLUMNS}
+        self.diurnal = deque(maxlen=history)
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def last_date(self):
+        return self.dates[-1] if self.dates else None
+
+    def update(self, date, obs):
+        """
+        Adds one day's observation (a mapping with OBS_COLUMNS). O(1).
+        """
+        date = pd.Timestamp(date).normalize()
+        if self.dates and date < self.dates[-1]:
+            raise ValueError(f"FeatureState.update(): {date.date()} is older than {self.dates[-1].date()}")
+        if self.dates and date == self.dates[-1]:
+            self.dates.pop()
+            self.diurnal.pop()
+            for buf in self.obs.values():
+                buf.pop()
+        self.dates.append(date)
+        for c, buf in self.obs.items():
+            v = obs.get(c)
+            v = float("nan") if _isnan(v) else float(v)
+            # forward-fill, like feature_engineering does on the sorted frame
+            if math.isnan(v) and buf:
+                v = buf[-1]
+            buf.append(v)
+        self.diurnal.append(self.obs["TMAX"][-1] - self.obs["TMIN"][-1])
+
+    def update_from_frame(self, df):
+        """
+        Feeds the rows of a merged CLI frame that are not older than the newest day held.
+        """
+        df = df.sort_values("DATE", kind="stable")
+        if self.dates:
+            df = df[df["DATE"] >= self.dates[-1]]
+        for row in df.to_dict("records"):
+            self.update(row["DATE"], row)
+
+    @staticmethod
+    def _lag(buf, k):
+        return buf[-1 - k] if len(buf) > k else float("nan")
+
+    @staticmethod
+    def _mean(buf, n):
+        if len(buf) < n:
+            return float("nan")
+        return sum(buf[-i] for i in range(1, n + 1)) / n
+
+    def features(self, forecasted_tmax):
+        """
+        The inference feature row for the newest day, as a one-row DataFrame in FEATURE_COLUMNS order.
+        """
+        if not self.dates:
+            raise ValueError("FeatureState.features(): no observations yet")
+        date = self.dates[-1]
+        tmax, tmin, prcp = self.obs["TMAX"], self.obs["TMIN"], self.obs["PRCP"]
+        doy = date.dayofyear
+        wdf2 = self.obs["WDF2"][-1]
+        row = {c: self.obs[c][-1] for c in OBS_COLUMNS}
+        row.update({
+            "year": date.year,
+            "forecasted_TMAX": float(forecasted_tmax),
+            "doy": doy,
+            "dow": date.dayofweek,
+            "month": date.month,
+            "doy_sin": np.sin(2*np.pi*doy/365.25),
+            "doy_cos": np.cos(2*np.pi*doy/365.25),
+            "diurnal_range": self.diurnal[-1],
+            "wind_dir_sin": np.sin(np.deg2rad(wdf2)),
+            "wind_dir_cos": np.cos(np.deg2rad(wdf2)),
+        })
+        for name, buf in [("TMAX", tmax), ("TMIN", tmin), ("diurnal_range", self.diurnal)]:
+            for k in LAGS:
+                row[f"{name}_lag{k}"] = self._lag(buf, k)
+        for k in PRCP_LAGS:
+            row[f"PRCP_lag_{k}"] = self._lag(prcp, k)
+        row["rolling_3"] = self._mean(tmax, 3)
+        row["rolling_7"] = self._mean(tmax, 7)
+        return pd.DataFrame([row], columns=FEATURE_COLUMNS)
+
+    def to_dict(self):
+        nan_to_none = lambda vals: [None if math.isnan(v) else v for v in vals]
+        return {
+            "history": self.dates.maxlen,
+            "dates": [d.date().isoformat() for d in self.dates],
+            "obs": {c: nan_to_none(buf) for c, buf in self.obs.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(history=data.get("history", HISTORY))
+        for i, date in enumerate(data["dates"]):
+            state.update(date, {c: vals[i] for c, vals in data["obs"].items()})
+        return state
+
+    def save(self, path=STATE_PATH):
+        path = Path(path)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=1))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=STATE_PATH):
+        """
+        Loads the saved state, or returns an empty one if there is none yet.
+        """
+        path = Path(path)
+        return cls.from_dict(json.loads(path.read_text())) if path.exists() else cls()
+
+
+def check_feature_consistency(merged, state=None, atol=1e-9):
+    """
+    Compares the state's feature row with feature_engineering(merged) and raises ValueError
+    naming every feature where they disagree. With state=None a fresh state is built from merged.
+    """
+    expected = feature_engineering(merged)
+    forecast = expected["forecasted_TMAX"].iloc[0]
+    if state is None:
+        state = FeatureState()
+        state.update_from_frame(merged)
+    got = state.features(forecast)
+    missing = [c for c in FEATURE_COLUMNS if c not in expected.columns]
+    if missing:
+        raise ValueError(f"feature_engineering() no longer produces {missing}")
+    bad = [
+        f"{c}: state={got[c].iloc[0]!r} pandas={expected[c].iloc[0]!r}"
+        for c in FEATURE_COLUMNS
+        if not np.isclose(float(got[c].iloc[0]), float(expected[c].iloc[0]), rtol=0, atol=atol, equal_nan=True)
+    ]
+    if bad:
+        raise ValueError("feature drift between FeatureState and feature_engineering():\n  " + "\n  ".join(bad))
+    return got
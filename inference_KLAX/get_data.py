@@ -2,17 +2,61 @@ import requests
 import pandas as pd
 import re
 import datetime as dt
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from http_utils import make_session, request_with_retry
+from cli_parser import parse_cli_report
+from markets import list_markets
+import numpy as np
+from nws_forecast import NWS_API, NWS_HEADERS, daily_extremes
 
+CLI_URL_TEMPLATE = "https://forecast.weather.gov/product.php?site={site}&issuedby={issuedby}&product=CLI&format=TXT&version={{v}}&glossary=0"
 
-def get_text(v):
+
+def cli_url(site, issuedby):
+    """
+    CLI product URL for a station (e.g. site="LOX", issuedby="LAX"), with {v} left for the version.
+    """
+    return CLI_URL_TEMPLATE.format(site=site, issuedby=issuedby)
+
+CLI_URL = cli_url("LOX", "LAX")
+
+
+def get_text(v, session=None, url=CLI_URL, retries=0):
     """
     Fetches the CLI report text for a given version number.
     """
-    URL = f"https://forecast.weather.gov/product.php?site=LOX&issuedby=LAX&product=CLI&format=TXT&version={v}&glossary=0"
-    r = requests.get(URL, timeout=30)
-    r.raise_for_status()
-    return r.text
+    URL = url.format(v=v)
+    if session is None:
+        r = requests.get(URL, timeout=30)
+        r.raise_for_status()
+        return r.text
+    return request_with_retry(session, "GET", URL, retries=retries, timeout=30).text
+
+
+def fetch_cli_texts(versions, max_workers=8, session=None, url=CLI_URL, retries=3, should_stop=None):
+    """
+    Downloads CLI report texts concurrently over one keep-alive session, at most max_workers in flight.
+    Yields (version, text) in version order. should_stop(version, text) is called on each text in
+    that order; once it returns True nothing else is requested and the outstanding downloads are dropped.
+    """
+    versions = list(versions)
+    session = session or make_session(pool_size=max_workers)
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    # keep a window of max_workers requests ahead of the next version we hand out
+    futures = {}
+    submitted = 0
+    try:
+        for i in range(len(versions)):
+            while submitted < len(versions) and submitted < i + max_workers:
+                futures[submitted] = pool.submit(get_text, versions[submitted], session, url, retries)
+                submitted += 1
+            text = futures.pop(i).result()
+            yield versions[i], text
+            if should_stop is not None and should_stop(versions[i], text):
+                return
+    finally:
+        # don't wait on downloads nobody will read
+        pool.shutdown(wait=False, cancel_futures=True)
 
 def normalize_cli_text(text: str) -> str:
     """
@@ -24,37 +68,87 @@ def normalize_cli_text(text: str) -> str:
     text = re.sub(r"\n{2,}", "\n\n", text)
     return text.strip()
 
-def extract_cli_yesterday(version = 50):
+def parse_cli_yesterday(text):
+    """
+    Parses yesterday's weather data out of a CLI report, or returns None if it has no YESTERDAY section.
+    """
+    return parse_cli_report(text).yesterday()
+
+def cli_issued_at(text):
+    """
+    Returns the issuance time printed under the CLI report header (e.g. "430 AM PDT SAT OCT 18 2025"), or None.
+    """
+    return parse_cli_report(text).issued
+
+def sync_cli_cache(cache, version = 50, concurrent = False, max_workers = 8, url = CLI_URL, session = None):
+    """
+    Downloads CLI versions newest first until reaching a report the cache already holds,
+    then stores the new reports (raw text and both parsed sections) and evicts old ones.
+    """
+    newest = cache.newest()
+    fresh = []
+
+    def collect(n, raw):
+        rec = parse_cli_report(raw)
+        if rec.issued is None:
+            print(f"no issuance time in version {n}, not caching it")
+            return False
+        if newest is not None and rec.issued <= newest:
+            return True
+        fresh.append((raw, rec))
+        return False
+
+    if concurrent:
+        for _ in fetch_cli_texts(range(1, version), max_workers=max_workers, session=session, url=url, should_stop=collect):
+            pass
+    else:
+        for n in range(1, version):
+            if collect(n, get_text(n, session=session, url=url)):
+                break
+    for raw, rec in fresh:
+        cache.put(rec.issued, raw, {"yesterday": rec.yesterday(), "today": rec.today()})
+    cache.evict()
+    cache.save()
+
+def extract_cli_yesterday(version = 50, concurrent = False, max_workers = 8, min_dates = None, url = CLI_URL, cache = None, offline = False, session = None):
     """
     Extracts yesterday's weather data from CLI reports up to the specified version number.
+    With concurrent=True the versions are downloaded in parallel over one pooled session (with retries),
+    and if min_dates is set the download stops once that many distinct dates have been collected.
+    With a CLICache only reports newer than the newest cached one are downloaded (none if offline=True)
+    and the rest are read from disk. Rows come back in version order either way.
+    session lets several callers share one connection pool.
     """
-    rows = []  
-    # patterns to extract data
-    patterns = {
-        "DATE": r"CA CLIMATE SUMMARY FOR (\w+ \d{1,2} \d{4})",
-        "TMAX": r"YESTERDAY\s+MAXIMUM\s+(\d+)",
-        "TMIN": r"MINIMUM\s+(\d+)",
-        "PRCP": r"PRECIPITATION\s*\(IN\)\s*YESTERDAY\s+([0-9]+(?:\.[0-9]+)?)",
-        "AWND": r"AVERAGE WIND SPEED\s+([\d.]+)",
-        "WDF2": r"HIGHEST WIND DIRECTION\s+\w+\s+\((\d+)\)",
-        "WSF2": r"HIGHEST WIND SPEED\s+(\d+)"
-    }
-    # iterate through versions to collect data, checking if it contains yesterday's report
-    for n in range(1, version):
-        text = normalize_cli_text(get_text(n))
+    rows = []
+    dates = set()
 
-        # Match object or None
-        valid_yesterday = re.search(r"YESTERDAY", text)
-        if not valid_yesterday:
+    def collect(n, out):
+        if out is None:
             print(f"no report available for version {n}")
-            continue
+            return False
         print("downloading yesterday's report")
-
-        out = {}
-        for k, p in patterns.items():
-            m = re.search(p, text, flags=re.MULTILINE | re.DOTALL)
-            out[k] = m.group(1) if m else None
         rows.append(out)
+        dates.add(out["DATE"])
+        return min_dates is not None and len(dates) >= min_dates
+
+    # iterate through versions to collect data, checking if it contains yesterday's report
+    if cache is not None:
+        if not offline:
+            sync_cli_cache(cache, version, concurrent=concurrent, max_workers=max_workers, url=url, session=session)
+        for n, record in enumerate(cache.records(limit=version - 1), start=1):
+            if collect(n, record["yesterday"]):
+                break
+        print("CLI cache:", cache.stats())
+    elif concurrent:
+        def collect_text(n, text):
+            return collect(n, parse_cli_yesterday(text))
+
+        for _ in fetch_cli_texts(range(1, version), max_workers=max_workers, session=session, url=url, should_stop=collect_text):
+            pass
+    else:
+        for n in range(1, version):
+            if collect(n, parse_cli_yesterday(get_text(n, session=session, url=url))):
+                break
     # create DataFrame from collected rows and clean data types
     df = pd.DataFrame(rows)
     df["DATE"] = pd.to_datetime(df["DATE"], format = "mixed")
@@ -64,60 +158,70 @@ def extract_cli_yesterday(version = 50):
     return df
 
 
-def extract_cli_today(version = 1):
+def parse_cli_today(text):
+    """
+    Parses today's weather data out of a CLI report, or returns None if it has no TODAY section.
+    """
+    return parse_cli_report(text).today()
+
+def extract_cli_today(version = 1, url = CLI_URL, cache = None, offline = False, session = None):
     """
     Extracts today's weather data from the CLI report for the specified version number. Same structure as extract_cli_yesterday but for today's data.
     """
     print("downloading today's report")
-    patterns = {
-        "DATE": r"CA CLIMATE SUMMARY FOR (\w+ \d{1,2} \d{4})",
-        "TMAX": r"TODAY\s+MAXIMUM\s+(\d+)", #change to TODAY
-        "TMIN": r"MINIMUM\s+(\d+)",
-        "PRCP": r"PRECIPITATION\s*\(IN\)\s*TODAY\s+([0-9]+(?:\.[0-9]+)?)",
-        "AWND": r"AVERAGE WIND SPEED\s+([\d.]+)",
-        "WDF2": r"HIGHEST WIND DIRECTION\s+\w+\s+\((\d+)\)",
-        "WSF2": r"HIGHEST WIND SPEED\s+(\d+)"
-        ,
-    }
-    text = normalize_cli_text(get_text(version))
-    valid_today = re.search(r"TEMPERATURE\s*\(F\)[\s\S]*?\bTODAY\b", text)
-    if not valid_today:
+    if cache is not None:
+        if not offline:
+            sync_cli_cache(cache, version + 1, url=url, session=session)
+        records = list(cache.records(limit=version))
+        out = records[-1]["today"] if len(records) == version else None
+    else:
+        out = parse_cli_today(get_text(version, session=session, url=url))
+    if out is None:
         raise Exception("No report available for today")  
-    out = {}
-    for k, p in patterns.items():
-        m = re.search(p, text, flags=re.IGNORECASE | re.MULTILINE | re.DOTALL)
-        out[k] = m.group(1) if m else None
     df = pd.DataFrame([out])  # one row
     df["DATE"] = pd.to_datetime(df["DATE"], errors="coerce")
     for c in ["TMAX", "TMIN", "WSF2", "WDF2", "PRCP", "AWND"]:
         df[c] = pd.to_numeric(df[c], errors="coerce")
     return df
 
-def get_forecast(office, grid):
+def resolve_grid(lat, lon, session=None, api=NWS_API):
     """
-    Fetches the forecasted maximum temperature for tomorrow from the weather.gov API by scraping the hourly forecast data.
+    NWS forecast office and "x,y" gridpoint covering a latitude/longitude.
+    """
+    URL = f"{api}/points/{lat:.4f},{lon:.4f}"
+    if session is None:
+        r = requests.get(URL, headers=NWS_HEADERS, timeout=30)
+        r.raise_for_status()
+    else:
+        r = request_with_retry(session, "GET", URL, headers=NWS_HEADERS, timeout=30)
+    props = r.json()["properties"]
+    return props["gridId"], f"{props['gridX']},{props['gridY']}"
+
+def get_forecast(office, grid, session=None, today=None, api=NWS_API, client=None):
+    """
+    Tomorrow's forecasted maximum temperature from the weather.gov hourly forecast, as a one-row frame
+    (DATE = today). today is the station's local date (defaults to the machine's). With client
+    (nws_forecast.ForecastClient) the request is conditional and cached; otherwise session adds pooling
+    and retries. forecasted_TMAX is NaN if the forecast doesn't cover tomorrow.
     """
     print("Fetching forecast")
-    LAT, LON = 33.94, -118.401
-    HEADERS = {"User-Agent": "giulio"}
-    URL = f"https://api.weather.gov/gridpoints/{office}/{grid}/forecast/hourly"
-    tomorrow = (dt.date.today() + dt.timedelta(days=1)).isoformat() 
-    today = dt.date.today().isoformat()
-    r = requests.get(URL, headers=HEADERS)
-    periods = r.json()["properties"]["periods"]
-    tmax = -999
-    
-    for p in periods:
-        if p["startTime"][:10] == tomorrow:
-            tmax = max(tmax, p["temperature"])
-    if tmax == -999:
+    today = today or dt.date.today()
+    if client is not None:
+        daily = client.daily(office, grid, today=today)
+    else:
+        URL = f"{api}/gridpoints/{office}/{grid}/forecast/hourly"
+        if session is None:
+            r = requests.get(URL, headers=NWS_HEADERS, timeout=30)
+            r.raise_for_status()
+        else:
+            r = request_with_retry(session, "GET", URL, headers=NWS_HEADERS, timeout=30)
+        daily = daily_extremes(r.json()["properties"]["periods"], today)
+    tomorrow = daily.loc[daily["horizon"] == 1, "tmax"]
+    tmax = float(tomorrow.iloc[0]) if len(tomorrow) else np.nan
+    if np.isnan(tmax):
         print("Cannot fetch forecast")
     else: print("forecast downloaded")
-    max_temp_today = {"DATE": today, "forecasted_TMAX": tmax}
-    df = pd.DataFrame([max_temp_today])
-    df["DATE"] = pd.to_datetime(df["DATE"], format = "mixed")
-    df["forecasted_TMAX"] = pd.to_numeric(df["forecasted_TMAX"], errors = "coerce")
-    return df
+    return pd.DataFrame({"DATE": [pd.Timestamp(today)], "forecasted_TMAX": [tmax]})
 
 def merge_data(yesterday, today, forecast):
     """merges yesterday's and today's CLI data with the forecasted maximum temperature for tomorrow."""
@@ -137,36 +241,15 @@ def merge_data(yesterday, today, forecast):
         )
     return df_inference
 
-def get_markets_data(ticker):
-    markets_url = f"https://api.elections.kalshi.com/trade-api/v2/markets?series_ticker={ticker}&status=open"
-    markets_response = requests.get(markets_url)
-    markets_data = markets_response.json()
-    rows = []
-    for market in markets_data['markets']:
-        event_ticker = market.get("event_ticker")
-        dt = event_ticker.split("-")[1]
-        date = datetime.strptime("20" + dt, "%Y%b%d").date()
-        market_ticker = market.get("ticker")
-        floor = market.get("floor_strike")
-        cap = market.get("cap_strike")
-        no_ask = market.get("no_ask")
-        yes_ask = market.get("yes_ask")
-        data = {"date": date, "event_ticker": event_ticker, "market_ticker": market_ticker, "floor": floor, "cap": cap, "no_ask": no_ask, "yes_ask": yes_ask}
-        rows.append(data)
-    df = pd.DataFrame(rows)
-    df["date"] = pd.to_datetime(df["date"])
-    for c in ["floor", "cap", "no_ask", "yes_ask"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-    #print(json.dumps(markets_data, indent=4))
+def get_markets_data(ticker, client=None):
+    """
+    Open markets of the series for tomorrow's event, sorted by cap.
+    """
+    df = list_markets([ticker], client=client)
     tomorrow = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
     df = df[df["date"] == tomorrow]
     df = df.sort_values(by = "cap")
-    return df
-
-def save_results(path, wether_data, adjusted_forecast):
-    data = wether_data.iloc[[0]]
-    data["correction"] = correction
-    data["adjusted_forecast"] = adjusted_forecast
-    data.to_csv(path, mode = "a", header = False, index = False)
+    return df[["date", "event_ticker", "market_ticker", "floor", "cap", "no_ask", "yes_ask"]]
 
-print(get_markets_data("KXHIGHLAX"))
\ No newline at end of file
+if __name__ == "__main__":
+    print(get_markets_data("KXHIGHLAX"))
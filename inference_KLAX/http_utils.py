@@ -0,0 +1,93 @@
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+import tracing
+
+# status codes worth retrying: rate limited or a transient server error
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def make_session(pool_size=10, headers=None):
+    """
+    Creates a keep-alive session whose connection pool can serve pool_size concurrent requests.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def backoff_delay(attempt, backoff=0.5):
+    """
+    Exponential backoff with full jitter: a random delay in [0.5, 1.5) * backoff * 2**attempt.
+    """
+    return backoff * (2 ** attempt) * (0.5 + random.random())
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at rate tokens per second up to capacity,
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n=1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                wait = (n - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _retry_after(r):
+    try:
+        return float(r.headers.get("Retry-After", ""))
+    except ValueError:
+        return 0.0
+
+
+def request_with_retry(session, method, url, retries=3, backoff=0.5, timeout=30, limiter=None, headers_fn=None, **kwargs):
+    """
+    Sends a request, retrying connection errors, timeouts and RETRY_STATUS responses with backoff
+    (at least as long as a 429's Retry-After). Every attempt first takes a token from limiter, if given,
+    and gets fresh headers from headers_fn(), if given (e.g. a timestamped signature).
+    Raises for any other error status, or once the retries are used up.
+    The whole call, retries included, is one tracing span with the final status, bytes and retries.
+    """
+    with tracing.http_span(method, url) as span:
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                limiter.acquire()
+            if headers_fn is not None:
+                kwargs["headers"] = headers_fn()
+            wait = 0.0
+            span.set(retries=attempt)
+            try:
+                r = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries:
+                    raise
+            else:
+                span.set(status=r.status_code)
+                if r.status_code not in RETRY_STATUS or attempt == retries:
+                    r.raise_for_status()
+                    span.set(bytes=len(r.content))
+                    return r
+                wait = _retry_after(r)
+            time.sleep(max(wait, backoff_delay(attempt, backoff)))
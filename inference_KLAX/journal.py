@@ -0,0 +1,201 @@
+"""
+Append-only journal of what every run saw and decided, in columnar partitions (columnar.py):
+
+  <root>/decisions/<target date>/<city>-<run id>/   one row: forecast, predicted error, adjusted
+                                                    forecast, the pricing distribution and the
+                                                    full feature vector
+  <root>/markets/<target date>/<city>-<run id>/     the market snapshot with p_yes/p_no and edges
+  <root>/orders/<target date>/<city>-<run id>/      the legs sent and how each went
+  <root>/realized/<date>/<city>/                    the CLI's final TMAX for the date
+  <root>/<table>/chunks/<YYYY-MM>/                  a past month of the table, sorted by date
+
+A run only adds its own partitions; compact() later rolls each finished month into one chunk.
+Reads take a date range, memory-map the chunks it overlaps and slice them by date (searchsorted)
+plus the day partitions in range, so nothing outside the range is read. The realized TMAX is added
+once per city and date from the CLI history every run already downloads, and decisions() joins it
+back onto the decisions.
+"""
+import datetime as dt
+import shutil
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from columnar import write_columns, read_arrays, read_partitions, is_partition
+from residual_cdf import load_cdf
+
+JOURNAL_DIR = Path(__file__).resolve().parent / "journal"   # inference_KLAX/journal/
+TABLES = ("decisions", "markets", "orders", "realized")
+DATE_COLUMN = {"decisions": "target_date", "markets": "target_date", "orders": "target_date", "realized": "DATE"}
+CHUNKS = "chunks"
+
+
+def _date(d):
+    return pd.Timestamp(d).date()
+
+
+class Journal:
+    """
+    The journal under root; see the module docstring for the layout.
+    """
+
+    def __init__(self, root=JOURNAL_DIR):
+        self.root = Path(root)
+
+    def _dir(self, table, date):
+        return self.root / table / _date(date).isoformat()
+
+    def dates(self, table):
+        """
+        The dates that have day partitions (not yet compacted) in table.
+        """
+        path = self.root / table
+        if not path.exists():
+            return []
+        return sorted(dt.date.fromisoformat(p.name) for p in path.iterdir() if p.is_dir() and p.name != CHUNKS)
+
+    def chunks(self, table):
+        path = self.root / table / CHUNKS
+        if not path.exists():
+            return []
+        return sorted(p for p in path.iterdir() if is_partition(p))
+
+    def partitions(self, table, start=None, end=None):
+        """
+        The day partitions of table with start <= date <= end (either bound optional), in date order.
+        """
+        start = _date(start) if start is not None else dt.date.min
+        end = _date(end) if end is not None else dt.date.max
+        return [p for d in self.dates(table) if start <= d <= end
+                for p in sorted(self._dir(table, d).iterdir()) if is_partition(p)]
+
+    def _chunk_rows(self, table, start, end):
+        lo = pd.Timestamp(start) if start is not None else pd.Timestamp.min
+        hi = pd.Timestamp(end) if end is not None else pd.Timestamp.max
+        frames = []
+        for path in self.chunks(table):
+            month = pd.Period(path.name, "M")
+            if month.end_time < lo or month.start_time > hi:
+                continue
+            arrays = read_arrays(path)
+            dates = arrays[DATE_COLUMN[table]]
+            i = np.searchsorted(dates, lo.to_datetime64(), "left")
+            j = np.searchsorted(dates, hi.to_datetime64(), "right")
+            frames.append(pd.DataFrame({c: a[i:j] for c, a in arrays.items()}, copy=False))
+        return frames
+
+    def read(self, table, start=None, end=None, columns=None):
+        """
+        table's rows dated between start and end, memory-mapped.
+        """
+        if table not in TABLES:
+            raise ValueError(f"Journal.read(): unknown table {table!r}, expected one of {TABLES}")
+        frames = self._chunk_rows(table, start, end)
+        recent = self.partitions(table, start, end)
+        if recent:
+            frames.append(read_partitions(recent))
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        return df if columns is None else df[columns]
+
+    def compact(self, before=None):
+        """
+        Rolls the day partitions of every month before before's month (default: today) into that
+        month's chunk. Safe to re-run after an interruption: rows already in the chunk are not added twice.
+        Returns the number of day partitions rolled up.
+        """
+        current = pd.Period(_date(before or dt.date.today()), "M")
+        rolled = 0
+        for table in TABLES:
+            by_month = {}
+            for d in self.dates(table):
+                if pd.Period(d, "M") < current:
+                    by_month.setdefault(pd.Period(d, "M"), []).append(d)
+            for month, days in by_month.items():
+                chunk = self.root / table / CHUNKS / str(month)
+                parts = [p for d in days for p in sorted(self._dir(table, d).iterdir()) if is_partition(p)]
+                frames = [read_partitions([chunk], mmap=False)] if is_partition(chunk) else []
+                frames.append(read_partitions(parts, mmap=False))
+                df = pd.concat(frames, ignore_index=True).drop_duplicates(ignore_index=True)
+                chunk.parent.mkdir(parents=True, exist_ok=True)
+                write_columns(chunk, df.sort_values(DATE_COLUMN[table], kind="stable", ignore_index=True))
+                for d in days:
+                    shutil.rmtree(self._dir(table, d))
+                rolled += len(parts)
+        return rolled
+
+    def record(self, city, target_date, features, forecast, adjusted_forecast, sigma, markets=None,
+               orders=None, run_id=None, residual_cdf=None):
+        """
+        Appends one city's decision for target_date: the feature row, the forecasts, and the market
+        snapshot (EV table) and order results if given. Returns the run id.
+
+        The decision records what priced the markets: pricing "normal" with sigma, or, if residual_cdf
+        (a table path) is given, pricing "residual_cdf" with the table's path and kind and sigma NaN.
+        """
+        run_id = run_id or dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        name = f"{city}-{run_id}"
+        tag = {"run_id": run_id, "city": city, "target_date": pd.Timestamp(target_date)}
+        decision = pd.DataFrame([{
+            **tag,
+            "forecast": float(forecast), "pred_error": float(adjusted_forecast) - float(forecast),
+            "adjusted_forecast": float(adjusted_forecast),
+            "pricing": "normal" if residual_cdf is None else "residual_cdf",
+            "sigma": float(sigma) if residual_cdf is None else np.nan,
+            "residual_cdf": "" if residual_cdf is None else str(residual_cdf),
+            "cdf_kind": "" if residual_cdf is None else load_cdf(residual_cdf).kind,
+        }])
+        features = features.reset_index(drop=True).astype("float64")
+        write_columns(self._dir("decisions", target_date) / name, pd.concat([decision, features], axis=1))
+        if markets is not None:
+            write_columns(self._dir("markets", target_date) / name,
+                          markets.reset_index(drop=True).assign(**tag))
+        if orders is not None:
+            write_columns(self._dir("orders", target_date) / name, orders.reset_index(drop=True).assign(**tag))
+        return run_id
+
+    def record_run(self, run, run_id=None):
+        """
+        record() for an engine.CityRun that got as far as its EV table, priced as engine.ev_all did.
+        """
+        return self.record(run.city["name"], run.today + dt.timedelta(days=1), run.features, run.forecast, run.mu,
+                           run.city["sigma"], markets=run.ev, orders=run.order, run_id=run_id,
+                           residual_cdf=run.city.get("residual_cdf"))
+
+    def record_realized(self, city, observations, before):
+        """
+        Adds the TMAX of every date in observations (DATE, TMAX) before the date before, which the
+        CLI has finalized, unless it is already journaled. Returns the number of dates added.
+        """
+        obs = observations[["DATE", "TMAX"]].dropna().drop_duplicates("DATE")
+        obs = obs[pd.to_datetime(obs["DATE"]).dt.date < _date(before)]
+        if obs.empty:
+            return 0
+        have = self.read("realized", obs["DATE"].min(), obs["DATE"].max())
+        known = set() if have.empty else set(zip(pd.to_datetime(have["DATE"]).dt.date, have["city"]))
+        added = 0
+        for date, tmax in obs.itertuples(index=False):
+            if (_date(date), city) in known:
+                continue
+            write_columns(self._dir("realized", date) / city,
+                          pd.DataFrame({"DATE": [pd.Timestamp(date)], "city": [city], "TMAX": [float(tmax)]}))
+            added += 1
+        return added
+
+    def decisions(self, start=None, end=None):
+        """
+        The decisions with target date in [start, end], joined with the realized TMAX (NaN until the
+        CLI has it) and the error of the raw and adjusted forecasts.
+        """
+        df = self.read("decisions", start, end)
+        if df.empty:
+            return df
+        realized = self.read("realized", start, end)
+        if realized.empty:
+            realized = pd.DataFrame({"DATE": pd.Series(dtype="datetime64[ns]"), "city": pd.Series(dtype=str),
+                                     "TMAX": pd.Series(dtype="float64")})
+        df = df.merge(realized.rename(columns={"DATE": "target_date", "TMAX": "realized_TMAX"}),
+                      how="left", on=["target_date", "city"])
+        df["forecast_error"] = df["realized_TMAX"] - df["forecast"]
+        df["adjusted_error"] = df["realized_TMAX"] - df["adjusted_forecast"]
+        return df
@@ -0,0 +1,153 @@
+import base64
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from http_utils import TokenBucket, make_session, request_with_retry
+
+KALSHI_API = "https://api.elections.kalshi.com/trade-api/v2"
+# Kalshi's published Basic-tier limits
+KALSHI_READ_RATE = 20
+KALSHI_WRITE_RATE = 10
+
+
+def _load_private_key(pem_text: str):
+    return serialization.load_pem_private_key(pem_text.encode("utf-8"), password=None)
+
+def _sign(private_key, timestamp_ms: str, method: str, path: str) -> str:
+    path_no_query = path.split("?")[0]
+    msg = f"{timestamp_ms}{method.upper()}{path_no_query}".encode("utf-8")
+    sig = private_key.sign(
+        msg,
+        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+        hashes.SHA256(),
+    )
+    return base64.b64encode(sig).decode("utf-8")
+
+
+class KalshiClient:
+    """
+    One keep-alive session to the Kalshi trade API for both public and authenticated endpoints.
+
+    The private key is parsed once, each attempt of an authenticated request is signed with a
+    fresh timestamp, reads and writes go through their own token buckets, and every call's
+    wall time is recorded per endpoint (see latency_stats).
+    Paths are relative to base_url, e.g. client.get("/markets", params={...}).
+    """
+
+    def __init__(self, key_id=None, private_key_pem=None, base_url=KALSHI_API, pool_size=10, timeout=10,
+                 retries=3, read_rate=KALSHI_READ_RATE, write_rate=KALSHI_WRITE_RATE):
+        self.key_id = key_id
+        self._private_key = _load_private_key(private_key_pem) if private_key_pem else None
+        self.base_url = base_url.rstrip("/")
+        self._path_prefix = urlparse(self.base_url).path   # signatures cover the full path
+        self.session = make_session(pool_size=pool_size)
+        self.timeout = timeout
+        self.retries = retries
+        # no burst allowance: the server counts requests per rolling second
+        self.read_limiter = TokenBucket(read_rate, capacity=1)
+        self.write_limiter = TokenBucket(write_rate, capacity=1)
+        self._latencies = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """
+        Client authenticated with PRIVATE_KEY and KEY_ID from the environment (or a local .env).
+        """
+        load_dotenv()  # loads local .env if present; no-op in GitHub Actions unless you create one
+        private_key = os.getenv("PRIVATE_KEY")
+        key_id = os.getenv("KEY_ID")
+        if not private_key or not key_id:
+            raise ValueError("Missing PRIVATE_KEY or KEY_ID (set as environment variables or in .env)")
+        return cls(key_id=key_id, private_key_pem=private_key, **kwargs)
+
+    def auth_headers(self, method, path):
+        if self._private_key is None or not self.key_id:
+            raise ValueError("KalshiClient: this endpoint needs KEY_ID and PRIVATE_KEY")
+        timestamp_ms = str(int(time.time() * 1000))
+        return {
+            "Content-Type": "application/json",
+            "KALSHI-ACCESS-KEY": self.key_id,
+            "KALSHI-ACCESS-TIMESTAMP": timestamp_ms,
+            "KALSHI-ACCESS-SIGNATURE": _sign(self._private_key, timestamp_ms, method, self._path_prefix + path),
+        }
+
+    def request(self, method, path, auth=False, params=None, json=None, retries=None):
+        """
+        Sends one API call (retried on 429/5xx and connection errors) and returns the decoded JSON.
+        """
+        method = method.upper()
+        limiter = self.read_limiter if method == "GET" else self.write_limiter
+        headers_fn = (lambda: self.auth_headers(method, path)) if auth else None
+        start = time.perf_counter()
+        try:
+            r = request_with_retry(
+                self.session, method, self.base_url + path,
+                retries=self.retries if retries is None else retries,
+                timeout=self.timeout, limiter=limiter, headers_fn=headers_fn,
+                params=params, json=json,
+            )
+        finally:
+            self._record(method, path, time.perf_counter() - start)
+        return r.json()
+
+    def get(self, path, params=None, auth=False):
+        return self.request("GET", path, auth=auth, params=params)
+
+    def paginate(self, path, key, params=None, limit=None, auth=False):
+        """
+        Yields the list under key from each page of a listing endpoint, following the response
+        cursor until the server returns an empty one.
+        """
+        params = dict(params or {})
+        if limit:
+            params["limit"] = limit
+        while True:
+            data = self.get(path, params=params, auth=auth)
+            yield data.get(key, [])
+            cursor = data.get("cursor")
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
+    def post(self, path, json=None, auth=True, retries=None):
+        return self.request("POST", path, auth=auth, json=json, retries=retries)
+
+    def delete(self, path, auth=True):
+        return self.request("DELETE", path, auth=auth)
+
+    def _record(self, method, path, seconds):
+        # one bucket per endpoint, not per ticker
+        endpoint = method + " " + re.sub(r"/(series|events|markets|orders)/[^/?]+", r"/\1/{id}", path)
+        with self._lock:
+            self._latencies[endpoint].append(seconds)
+
+    def latency_stats(self):
+        """
+        Request latency per endpoint in milliseconds (count, mean, p50, p95, max), including retries.
+        """
+        with self._lock:
+            items = {k: np.array(v) * 1000 for k, v in self._latencies.items()}
+        rows = [{"endpoint": k, "count": len(v), "mean_ms": v.mean(), "p50_ms": np.percentile(v, 50),
+                 "p95_ms": np.percentile(v, 95), "max_ms": v.max()} for k, v in items.items()]
+        return pd.DataFrame(rows, columns=["endpoint", "count", "mean_ms", "p50_ms", "p95_ms", "max_ms"])
+
+
+_public_client = None
+
+def public_client():
+    """
+    A process-wide unauthenticated client for public market data.
+    """
+    global _public_client
+    if _public_client is None:
+        _public_client = KalshiClient()
+    return _public_client
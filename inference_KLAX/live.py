@@ -0,0 +1,258 @@
+"""
+Long-running live mode: keeps the day's adjusted forecast in memory, polls the event's quotes and
+re-evaluates EV only for the markets whose quotes changed, buying when an edge crosses a threshold.
+The daily pipeline (engine.run_cities) runs once at start; the hourly refresh only re-fetches the
+forecast and re-predicts mu from the feature state that run saved.
+
+    python inference_KLAX/live.py --city LAX --threshold 0.05 --interval 1 --duration 3600
+"""
+import argparse
+import asyncio
+import time
+import numpy as np
+import pandas as pd
+import ev
+from cities import get_cities
+from create_orders import place_order
+from execution import client_order_id, order_error
+from feature_state import FeatureState
+from get_data import get_forecast, resolve_grid
+from kalshi_client import KalshiClient
+from model import predict_errors, get_model_path
+from nws_forecast import ForecastClient, CACHE_DIR as FORECAST_CACHE_DIR
+from obs_store import ObsStore
+from residual_cdf import load_cdf
+
+
+class LiveBook:
+    """
+    The day's markets with their latest asks and model probabilities, as arrays indexed by market.
+    p_yes depends only on the forecast, so it is recomputed when the forecast changes and a quote
+    change only costs the edges of the markets that moved. sigma may be a ResidualCDF, priced with
+    month (the event's, 1..12).
+    """
+
+    def __init__(self, markets, mu, sigma, month=None):
+        self.tickers = markets["market_ticker"].to_numpy()
+        self.index = {t: i for i, t in enumerate(self.tickers)}
+        self.floor = markets["floor"].to_numpy(dtype="float64")
+        self.cap = markets["cap"].to_numpy(dtype="float64")
+        self.yes_ask = markets["yes_ask"].to_numpy(dtype="float64").copy()
+        self.no_ask = markets["no_ask"].to_numpy(dtype="float64").copy()
+        self.month = month
+        self.set_forecast(mu, sigma)
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def set_forecast(self, mu, sigma):
+        self.mu, self.sigma = mu, sigma
+        self.p_yes = ev.prob_yes(self.floor, self.cap, mu, sigma, self.month)
+
+    def update(self, quotes):
+        """
+        Applies (ticker, yes_ask, no_ask) quotes and returns the positions whose asks changed.
+        Markets that were not in the book are ignored.
+        """
+        changed = []
+        for ticker, yes_ask, no_ask in quotes:
+            i = self.index.get(ticker)
+            if i is not None and (yes_ask != self.yes_ask[i] or no_ask != self.no_ask[i]):
+                self.yes_ask[i], self.no_ask[i] = yes_ask, no_ask
+                changed.append(i)
+        return np.array(changed, dtype=np.intp)
+
+    def edges(self, idx):
+        """
+        (edge_yes, edge_no) in dollars for the markets at positions idx.
+        """
+        p = self.p_yes[idx]
+        return p - self.yes_ask[idx] / 100.0, (1.0 - p) - self.no_ask[idx] / 100.0
+
+
+async def poll_quotes(client, event_ticker, queue, interval=1.0, stop=None):
+    """
+    Puts ("quotes", received_at, [(ticker, yes_ask, no_ask), ...]) on queue every interval seconds.
+    received_at is the perf_counter time the response arrived. The blocking HTTP call runs in a worker
+    thread so the decision loop keeps going; a failed poll is reported and retried on the next tick.
+    """
+    params = {"event_ticker": event_ticker, "status": "open"}
+    while stop is None or not stop.is_set():
+        started = time.perf_counter()
+        try:
+            pages = await asyncio.to_thread(lambda: list(client.paginate("/markets", "markets", params)))
+        except Exception as e:
+            print(f"quote poll failed: {type(e).__name__}: {e}")
+        else:
+            received_at = time.perf_counter()
+            quotes = [(m["ticker"], m.get("yes_ask"), m.get("no_ask")) for page in pages for m in page]
+            await queue.put(("quotes", received_at, quotes))
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+
+async def refresh_forecast(forecast_fn, queue, every=3600.0, stop=None):
+    """
+    Puts ("forecast", time, (mu, sigma)) on queue every `every` seconds, from forecast_fn() run in a worker thread.
+    """
+    while stop is None or not stop.is_set():
+        await asyncio.sleep(every)
+        try:
+            mu, sigma = await asyncio.to_thread(forecast_fn)
+        except Exception as e:
+            print(f"forecast refresh failed, keeping the current one: {type(e).__name__}: {e}")
+            continue
+        await queue.put(("forecast", time.perf_counter(), (mu, sigma)))
+
+
+async def run_live(book, client, event_ticker, threshold=0.05, interval=1.0, count=1, max_orders=1,
+                   duration=None, forecast_fn=None, forecast_every=3600.0, trade=True, run_id=None):
+    """
+    Decision loop: evaluates every market once (and again whenever forecast_fn gives a new forecast),
+    then on every quote update re-evaluates only the markets whose asks changed and buys
+    the side whose edge is at least threshold (once per market and side, at the current ask),
+    until max_orders orders are out or duration seconds have passed. Client order ids are
+    execution.client_order_id(run_id, ticker, side), run_id defaulting to "live-<event_ticker>", so a
+    restarted session re-sending a market and side is rejected as a duplicate (status "duplicate").
+
+    Returns (decisions, stats): one row per order with its decision latency (quote receipt to the
+    order request going out) and ack latency (quote receipt to exchange response), and counts of
+    updates and markets evaluated.
+    """
+    run_id = run_id or f"live-{event_ticker}"
+    queue = asyncio.Queue()
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(poll_quotes(client, event_ticker, queue, interval, stop))]
+    if forecast_fn is not None:
+        tasks.append(asyncio.create_task(refresh_forecast(forecast_fn, queue, forecast_every, stop)))
+    orders = []
+    decisions = []
+    done = set()
+    stats = {"updates": 0, "full_evals": 0, "evaluated": 0}
+    # start with every market, then only the ones that move
+    queue.put_nowait(("forecast", time.perf_counter(), (book.mu, book.sigma)))
+    deadline = None if duration is None else time.perf_counter() + duration
+
+    def post(row, side, price, received_at):
+        # stamped in the worker thread, so the wait for a free thread counts as decision time
+        row["decision_latency_ms"] = (time.perf_counter() - received_at) * 1000
+        return place_order(client, row["market_ticker"], side, price, count, client_order_id=row["client_order_id"])
+
+    async def send(row, side, price, received_at):
+        try:
+            resp = await asyncio.to_thread(post, row, side, price, received_at)
+            order = resp.get("order", {})
+            row["order_id"], row["status"] = order.get("order_id"), order.get("status")
+        except Exception as e:
+            row.update(order_error(e))
+        row["ack_latency_ms"] = (time.perf_counter() - received_at) * 1000
+
+    try:
+        while len(decisions) < max_orders:
+            timeout = None if deadline is None else deadline - time.perf_counter()
+            if timeout is not None and timeout <= 0:
+                break
+            try:
+                kind, received_at, payload = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if kind == "forecast":
+                book.set_forecast(*payload)
+                idx = np.arange(len(book))
+                stats["full_evals"] += 1
+            else:
+                idx = book.update(payload)
+                stats["updates"] += 1
+            if not len(idx):
+                continue
+            stats["evaluated"] += len(idx)
+            edge_yes, edge_no = book.edges(idx)
+            for side, edges, asks in (("yes", edge_yes, book.yes_ask), ("no", edge_no, book.no_ask)):
+                for j in np.flatnonzero(edges >= threshold):
+                    i = idx[j]
+                    if (i, side) in done or len(decisions) >= max_orders:
+                        continue
+                    done.add((i, side))
+                    row = {"market_ticker": book.tickers[i], "side": side, "price": int(asks[i]),
+                           "edge": float(edges[j]), "mu": book.mu,
+                           "client_order_id": client_order_id(run_id, book.tickers[i], side)}
+                    decisions.append(row)
+                    if trade:
+                        orders.append(asyncio.create_task(send(row, side, int(asks[i]), received_at)))
+                    else:
+                        row["decision_latency_ms"] = (time.perf_counter() - received_at) * 1000
+        if orders:
+            await asyncio.gather(*orders)
+    finally:
+        stop.set()
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return pd.DataFrame(decisions), stats
+
+
+def forecast_mu(city, today, forecasts):
+    """
+    The adjusted forecast for the day after today from the latest hourly forecast (forecasts is a
+    nws_forecast.ForecastClient): forecast -> features -> predict only. The features come from the
+    observation store (or the feature state) as the day's run left it, nothing is written, and the
+    CLI is not fetched.
+    """
+    office, grid = city["office"], city["grid"]
+    if grid is None:
+        office, grid = resolve_grid(city["lat"], city["lon"], session=forecasts.session, api=forecasts.api)
+    tmax = float(get_forecast(office, grid, today=today, client=forecasts)["forecasted_TMAX"].iloc[0])
+    if np.isnan(tmax):
+        raise ValueError(f"no forecast for the day after {today}")
+    if city.get("obs_store"):
+        features = ObsStore(city["obs_store"]).features(today, tmax)
+    else:
+        features = FeatureState.load(city["state"]).features(tmax)
+    return tmax + float(predict_errors(features, city.get("model_path") or get_model_path())[0])
+
+
+def latency_summary(decisions):
+    """
+    p50/p95/max of the decision and ack latencies, in milliseconds.
+    """
+    cols = [c for c in ("decision_latency_ms", "ack_latency_ms") if c in decisions.columns]
+    return decisions[cols].describe(percentiles=[0.5, 0.95]).loc[["count", "50%", "95%", "max"]]
+
+
+def main():
+    from engine import run_cities
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--city", default="LAX")
+    parser.add_argument("--threshold", type=float, default=0.05, help="minimum edge in dollars")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between quote polls")
+    parser.add_argument("--duration", type=float, default=3600.0)
+    parser.add_argument("--max-orders", type=int, default=1)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    city = get_cities([args.city])[0]
+    client = KalshiClient.from_env()
+
+    markets, status = run_cities([city], client=client, trade=False)
+    row = status.iloc[0]
+    if not row["ok"]:
+        raise RuntimeError(f"{row['stage']}: {row['error']}")
+    target = pd.Timestamp(markets["date"].iloc[0])
+    sigma = load_cdf(city["residual_cdf"]) if city.get("residual_cdf") else city["sigma"]
+    book = LiveBook(markets, float(row["adjusted_forecast"]), sigma, month=target.month)
+    forecasts = ForecastClient(city.get("forecast_cache") or FORECAST_CACHE_DIR)
+    today = (target - pd.Timedelta(days=1)).date()
+    decisions, stats = asyncio.run(run_live(
+        book, client, markets["event_ticker"].iloc[0],
+        threshold=args.threshold, interval=args.interval, max_orders=args.max_orders,
+        duration=args.duration, forecast_fn=lambda: (forecast_mu(city, today, forecasts), sigma),
+        trade=not args.dry_run,
+    ))
+    print(stats)
+    if not decisions.empty:
+        print(decisions.to_string(index=False))
+        print(latency_summary(decisions))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,54 @@
-from get_data import get_text, normalize_cli_text, extract_cli_yesterday, extract_cli_today, get_forecast, get_markets_data, merge_data, save_results
-from model import feature_engineering, make_prediction, get_ev, get_model_path
-from create_orders import get_bet_info, send_order
-
-
-best_model = get_model_path()
-ticker = "KXHIGHLAX"
-office = "LOX"
-grid = "149,41"
-sigma = 2.5324872296670837
-data_file_path = "/Users/giulioelmi/Desktop/kelshi_trading/inference_KLAX/prediction_log.csv"
-
-def main():
-    merged_data = merge_data(extract_cli_yesterday(), extract_cli_today(), get_forecast(office, grid))
-
-    model_data = feature_engineering(merged_data)
-    print(model_data)
-
-    adjusted_forecast = make_prediction(model_data, best_model)
-
-    market_data = get_markets_data(ticker)
-    
-    ev_df = get_ev(market_data, adjusted_forecast, sigma=sigma)
-
-    #save_results(data_file_path, merged_data, adjusted_forecast)
-    
-    print(ev_df[["market_ticker", "floor", "cap", "edge_yes_cents", "edge_no_cents", "p_yes", "p_no"]])
-    
-    send_order(ev_df)
+import sys
+import tracing
+from journal import Journal
+from cities import get_cities
+from engine import run_cities
+from kalshi_client import KalshiClient, public_client
+
+
+history_days = 7  # lag7 and rolling_7 need the 7 days before today
+offline = False  # build the CLI part of the inference frame from the local cache only
+check_features = True  # cross-check the incremental features against feature_engineering()
+trade = True  # send orders for the cities whose config has trade enabled
+network_timeout = 8 * 60  # per weather/markets stage, leaves room in the 20-minute cron window
+trace = True  # write a per-stage latency trace of the run to inference_KLAX/traces/ (see tracing.py)
+journal = True  # append every city's features, forecasts, market snapshot and orders to inference_KLAX/journal/
+
+def main(cities=None):
+    """
+    Runs every configured city (see cities.py), or only the ones named on the command line.
+    """
+    cities = get_cities(cities)
+    # the private key is only needed to send orders
+    client = KalshiClient.from_env() if trade and any(c.get("trade") for c in cities) else public_client()
+    if trace:
+        tracing.start(cities=[c["name"] for c in cities], trade=trade)
+    try:
+        ev_df, status = run_cities(
+            cities,
+            client=client,
+            history_days=history_days,
+            offline=offline,
+            check_features=check_features,
+            trade=trade,
+            timeout=network_timeout,
+            journal=Journal() if journal else None,
+        )
+    finally:
+        tracer = tracing.stop()
+        if tracer is not None:
+            path = tracer.write()
+            print("------------------")
+            print(f"trace written to {path}")
+            print(tracing.summarize([path]).round(1).to_string(index=False))
+
+    print("------------------")
+    print(status.to_string(index=False))
+    print(client.latency_stats())
+    # one city failing doesn't stop the others, but the run is still reported as failed
+    if not status["ok"].all():
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:] or None)
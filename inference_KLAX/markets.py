@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+import pandas as pd
+from kalshi_client import public_client
+
+# the API's maximum page size for /markets
+PAGE_LIMIT = 1000
+
+PRICE_COLUMNS = ["floor", "cap", "yes_ask", "no_ask", "yes_bid", "no_bid"]
+MARKET_COLUMNS = ["date", "series_ticker", "event_ticker", "market_ticker", *PRICE_COLUMNS, "close_time"]
+
+# API field -> frame column
+_FIELDS = {
+    "event_ticker": "event_ticker",
+    "ticker": "market_ticker",
+    "floor_strike": "floor",
+    "cap_strike": "cap",
+    "yes_ask": "yes_ask",
+    "no_ask": "no_ask",
+    "yes_bid": "yes_bid",
+    "no_bid": "no_bid",
+    "close_time": "close_time",
+}
+
+
+def iter_market_pages(series_tickers, client=None, status="open", max_workers=8, limit=PAGE_LIMIT):
+    """
+    Streams /markets pages for every series as they arrive, yielding (series_ticker, markets).
+    Series are fetched concurrently; within a series the next page is requested as soon as the
+    previous one returns its cursor.
+    """
+    client = client or public_client()
+
+    def fetch(series, cursor):
+        params = {"series_ticker": series, "status": status, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        return series, client.get("/markets", params=params)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(fetch, s, None) for s in dict.fromkeys(series_tickers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                series, data = f.result()
+                if data.get("cursor"):
+                    pending.add(pool.submit(fetch, series, data["cursor"]))
+                yield series, data.get("markets", [])
+
+
+def markets_frame(markets):
+    """
+    Typed frame from a list of API market objects: the event date is parsed from the event ticker
+    (KXHIGHLAX-26JAN02 -> 2026-01-02) for all rows at once, prices and strikes are float64 (NaN if absent).
+    """
+    raw = pd.DataFrame.from_records(markets, columns=list(_FIELDS)).rename(columns=_FIELDS)
+    event = raw["event_ticker"].astype(str)
+    parts = event.str.rsplit("-", n=1)
+    df = pd.DataFrame({
+        "date": pd.to_datetime(parts.str[-1], format="%y%b%d", errors="coerce"),
+        "series_ticker": parts.str[0],
+        "event_ticker": event,
+        "market_ticker": raw["market_ticker"].astype(str),
+    })
+    for c in PRICE_COLUMNS:
+        df[c] = pd.to_numeric(raw[c], errors="coerce").astype(np.float64)
+    df["close_time"] = pd.to_datetime(raw["close_time"], utc=True, errors="coerce")
+    return df[MARKET_COLUMNS]
+
+
+def list_markets(series_tickers, client=None, status="open", max_workers=8, limit=PAGE_LIMIT):
+    """
+    Every market of the given series (open ones by default) as one frame, sorted by series, date and cap.
+    """
+    markets = []
+    for _, page in iter_market_pages(series_tickers, client, status, max_workers, limit):
+        markets.extend(page)
+    df = markets_frame(markets)
+    return df.sort_values(["series_ticker", "date", "cap"], na_position="last", kind="stable").reset_index(drop=True)
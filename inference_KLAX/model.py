@@ -1,10 +1,8 @@
-from pyexpat import model
 import pandas as pd
-import math
 import numpy as np
-from xgboost import XGBRegressor
-import xgboost as xgb
 from pathlib import Path
+import ev
+import tree_model
 
 def feature_engineering(df):
     """
@@ -43,14 +41,49 @@ def feature_engineering(df):
     df = df.drop(columns = ["DATE"])
     return df
 
+_boosters = {}
+
+def load_booster(model_path):
+    """
+    Returns the booster saved at model_path, loading it only once per process.
+    The handle is keyed by path and mtime, so a retrained model file is picked up on the next call.
+    """
+    path = Path(model_path).resolve()
+    key = (str(path), path.stat().st_mtime_ns)
+    booster = _boosters.get(key)
+    if booster is None:
+        import xgboost as xgb   # only for training / comparisons; inference scores with tree_model
+        booster = xgb.Booster()
+        booster.load_model(path)
+        # forget older versions of the same file
+        for k in [k for k in _boosters if k[0] == key[0]]:
+            del _boosters[k]
+        _boosters[key] = booster
+    return booster
+
+def predict_errors(df, model_path):
+    """
+    Predicted forecast errors (TMAX_obs - TMAX_forecast) for every row of df, in one vectorized call
+    of the compiled model (tree_model.py; identical to booster.inplace_predict, without xgboost).
+    Columns are put in the order the booster was trained with.
+    """
+    return tree_model.load_model(model_path).predict(df)
+
+def predict_batch(df, model_path, dates=None):
+    """
+    Adjusted forecasts (forecasted_TMAX + predicted error) for a whole feature frame,
+    as a Series indexed by dates (or by df's index if dates is None).
+    """
+    adjusted = df["forecasted_TMAX"].to_numpy(dtype="float64") + predict_errors(df, model_path)
+    index = pd.Index(dates, name="DATE") if dates is not None else df.index
+    return pd.Series(adjusted, index=index, name="adjusted_forecast")
+
 def make_prediction(df, best_model_path):
     """
     Makes a prediction using the trained model and adjusts the forecast.
     """
     inference_df = df
-    booster = xgb.Booster()
-    booster.load_model(best_model_path)
-    pred_error = booster.predict(xgb.DMatrix(inference_df))[0]
+    pred_error = predict_errors(inference_df, best_model_path)[0]
 
     forecast = df["forecasted_TMAX"].iloc[0]
     adjusted_forecast = forecast  + pred_error
@@ -62,7 +95,7 @@ def make_prediction(df, best_model_path):
 
     return adjusted_forecast
 
-def get_ev(markets: pd.DataFrame, mu: float, sigma: float) -> pd.DataFrame:
+def get_ev(markets: pd.DataFrame, mu, sigma) -> pd.DataFrame:
     """
     For each Kalshi contract row, compute:
       - p_yes: model-implied probability that YES settles to 1
@@ -75,63 +108,9 @@ def get_ev(markets: pd.DataFrame, mu: float, sigma: float) -> pd.DataFrame:
       - cap present only     -> unilateral: T < cap
 
     Prices in the input are assumed to be in cents (0..100).
+    mu and sigma may be scalars or arrays aligned with the rows (see ev.get_ev).
     """
-
-    def norm_cdf(x: float) -> float:
-        # Standard normal CDF using erf (no scipy dependency)
-        return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
-
-    def prob_yes(row) -> float:
-        floor = row.get("floor")
-        cap = row.get("cap")
-
-        has_floor = pd.notna(floor)
-        has_cap = pd.notna(cap)
-
-        if has_floor and has_cap:
-            # P(floor <= T < cap)
-            z_u = (cap - mu) / sigma
-            z_l = (floor - mu) / sigma
-            p = norm_cdf(z_u) - norm_cdf(z_l)
-        elif has_floor and not has_cap:
-            # P(T >= floor)
-            z = (floor - mu) / sigma
-            p = 1.0 - norm_cdf(z)
-        elif has_cap and not has_floor:
-            # P(T < cap)
-            z = (cap - mu) / sigma
-            p = norm_cdf(z)
-        else:
-            # If both missing, cannot interpret the contract
-            p = float("nan")
-
-        # Numerical safety
-        if pd.notna(p):
-            p = max(0.0, min(1.0, p))
-        return p
-
-    out = markets.copy()
-
-    out["p_yes"] = out.apply(prob_yes, axis=1)
-    out["p_no"] = 1.0 - out["p_yes"]
-
-    # Maximum you're willing to pay (in cents)
-    out["max_yes_cents"] = ( out["p_yes"])
-    out["max_no_cents"] = ( out["p_no"])
-
-    # Compare to current asks (also in cents)
-    if "yes_ask" in out.columns:
-        out["edge_yes_cents"] = (out["max_yes_cents"] - (out["yes_ask"]/100)).round(2)
-    if "no_ask" in out.columns:
-        out["edge_no_cents"] = (out["max_no_cents"] - (out["no_ask"]/100)).round(2)
-
-    # Handy boolean suggestions (strictly positive edge)
-    if "yes_ask" in out.columns:
-        out["buy_yes"] = out["edge_yes_cents"] > 0
-    if "no_ask" in out.columns:
-        out["buy_no"] = out["edge_no_cents"] > 0
-
-    return out
+    return ev.get_ev(markets, mu, sigma)
 
 def get_model_path():
     BASE_DIR = Path(__file__).resolve().parent           # inference_KLAX/
@@ -0,0 +1,137 @@
+"""
+weather.gov hourly forecast for a gridpoint, fetched with conditional requests and cached on disk.
+
+Each gridpoint keeps, under <root>/<office>_<x>_<y>/:
+  latest.json      the last full response body, with its ETag / Last-Modified
+  revisions/       columnar.ColumnTable, one row per target date of every new forecast revision:
+                   update_time, fetched_at, target_date, horizon, tmax, tmin, hours
+
+A fetch sends If-None-Match / If-Modified-Since from latest.json, so an unchanged forecast costs a
+304 and is served from the cache. The hourly periods are reduced to daily max/min for every date
+they cover in one grouped pass, and each new revision (a new updateTime) is appended to revisions/,
+so the history of forecasts for any target date can be read back.
+"""
+import datetime as dt
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from columnar import ColumnTable
+from http_utils import make_session, request_with_retry
+
+NWS_API = "https://api.weather.gov"
+NWS_HEADERS = {"User-Agent": "giulio"}
+CACHE_DIR = Path(__file__).resolve().parent / "forecast_cache"   # inference_KLAX/forecast_cache/
+DAILY_COLUMNS = ["target_date", "horizon", "tmax", "tmin", "hours"]
+
+
+def daily_extremes(periods, today):
+    """
+    Daily max/min temperature of hourly periods, by the local date of their startTime, with the
+    horizon in days from today and the number of hours seen (a partial day has fewer than 24).
+    """
+    if not periods:
+        return pd.DataFrame({c: pd.Series(dtype=t) for c, t in
+                             zip(DAILY_COLUMNS, ["datetime64[ns]", "int64", "float64", "float64", "int64"])})
+    # startTime carries the station's UTC offset, so its first 10 characters are the local date
+    start = np.array([p["startTime"] for p in periods], dtype="U10")
+    temp = np.array([np.nan if p.get("temperature") is None else p["temperature"] for p in periods], dtype="float64")
+    days = pd.DataFrame({"target_date": start.astype("datetime64[D]"), "t": temp}).groupby("target_date")["t"]
+    out = pd.DataFrame({"tmax": days.max(), "tmin": days.min(), "hours": days.count()}).reset_index()
+    out["target_date"] = out["target_date"].astype("datetime64[ns]")
+    out["horizon"] = (out["target_date"] - pd.Timestamp(today)).dt.days
+    return out[DAILY_COLUMNS]
+
+
+class ForecastClient:
+    """
+    Conditional, disk-cached client for /gridpoints/{office}/{grid}/forecast/hourly.
+    Counts 200s (full payloads) and 304s (not modified) in fetched / not_modified.
+    """
+
+    def __init__(self, root=CACHE_DIR, session=None, api=NWS_API):
+        self.root = Path(root)
+        self.session = session or make_session()
+        self.api = api
+        self.fetched = 0
+        self.not_modified = 0
+        self._cached = {}    # gridpoint directory -> latest.json contents
+        self._daily = {}     # (gridpoint directory, today) -> daily frame of the cached payload
+
+    def _dir(self, office, grid):
+        return self.root / f"{office}_{grid.replace(',', '_')}"
+
+    def _latest(self, office, grid):
+        path = self._dir(office, grid) / "latest.json"
+        if path not in self._cached and path.exists():
+            self._cached[path] = json.loads(path.read_text())
+        return self._cached.get(path)
+
+    def _save_latest(self, office, grid, entry):
+        path = self._dir(office, grid) / "latest.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, path)
+        self._cached[path] = entry
+
+    def revisions(self, office, grid):
+        return ColumnTable(self._dir(office, grid) / "revisions")
+
+    def fetch(self, office, grid):
+        """
+        The hourly forecast payload, from a 304 against the cached copy when it is unchanged.
+        Returns (payload, modified).
+        """
+        cached = self._latest(office, grid)
+        headers = dict(NWS_HEADERS)
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        r = request_with_retry(self.session, "GET", f"{self.api}/gridpoints/{office}/{grid}/forecast/hourly",
+                               headers=headers, timeout=30)
+        if r.status_code == 304 and cached is not None:
+            self.not_modified += 1
+            return cached["payload"], False
+        self.fetched += 1
+        payload = r.json()
+        self._save_latest(office, grid, {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified"),
+                                         "payload": payload})
+        return payload, True
+
+    def daily(self, office, grid, today=None):
+        """
+        Daily max/min for every date the current forecast covers (see daily_extremes), recording
+        it in the revision history if it is a forecast revision not seen before.
+        """
+        today = today or dt.date.today()
+        payload, modified = self.fetch(office, grid)
+        key = (self._dir(office, grid), today)
+        if not modified and key in self._daily:
+            return self._daily[key].copy()
+        props = payload["properties"]
+        daily = daily_extremes(props["periods"], today)
+        update_time = pd.Timestamp(props.get("updateTime") or props.get("generatedAt") or dt.datetime.now(dt.timezone.utc))
+        update_time = update_time.tz_convert(None) if update_time.tzinfo else update_time
+        table = self.revisions(office, grid)
+        last = table.attrs.get("update_time")
+        if last is None or pd.Timestamp(last) != update_time:
+            rows = daily.assign(update_time=update_time, fetched_at=pd.Timestamp.now("UTC").tz_convert(None))
+            table.append(rows[["update_time", "fetched_at"] + DAILY_COLUMNS], update_time=update_time.isoformat())
+        self._daily[key] = daily
+        return daily.copy()
+
+    def history(self, office, grid, target_date=None):
+        """
+        Every recorded revision (of target_date only, if given), oldest first.
+        """
+        table = self.revisions(office, grid)
+        if not len(table):
+            return pd.DataFrame(columns=["update_time", "fetched_at"] + DAILY_COLUMNS)
+        df = table.frame()
+        if target_date is not None:
+            df = df[df["target_date"] == pd.Timestamp(target_date)]
+        return df.reset_index(drop=True)
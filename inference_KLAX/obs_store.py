@@ -0,0 +1,217 @@
+"""
+Local store of a station's daily observations (OBS_COLUMNS), indexed by date.
+
+One columnar.ColumnTable under <root>/ with a fixed stride of one row per calendar day: row k is
+the day epoch + k, so a date's row is its day offset and any window of days is a slice of the
+memory-mapped columns. A day nothing was recorded for keeps an all-NaN row with source 0; nothing
+is forward-filled, and missing() lists those days. features() builds the inference feature row
+from the HISTORY days ending on a date and refuses a window with a missing day.
+
+The long history is backfilled in bulk from a NOAA daily CSV (as used by data_prep_noaa.ipynb),
+and every run adds the CLI reports it parsed. Each row remembers its source, and a source never
+overwrites a better one: NOAA > final CLI (the YESTERDAY report) > preliminary CLI (the TODAY report).
+
+    python inference_KLAX/obs_store.py --noaa training_weather_data.csv
+"""
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from columnar import ColumnTable
+from feature_state import FeatureState, HISTORY, OBS_COLUMNS
+
+OBS_DIR = Path(__file__).resolve().parent / "obs_store"   # inference_KLAX/obs_store/
+SOURCES = {"cli_today": 1, "cli": 2, "noaa": 3}             # a source only replaces rows of lower rank
+COLUMNS = OBS_COLUMNS + ["source"]
+DAY = np.timedelta64(1, "D")
+
+
+def read_noaa_csv(path):
+    """
+    DATE and OBS_COLUMNS of a NOAA daily CSV (GHCN-Daily export), every date it has.
+    """
+    df = pd.read_csv(path, usecols=["DATE"] + OBS_COLUMNS)
+    df["DATE"] = pd.to_datetime(df["DATE"])
+    return df
+
+
+def _blank(days):
+    df = pd.DataFrame({c: np.full(days, np.nan) for c in OBS_COLUMNS})
+    df["source"] = np.zeros(days, dtype=np.int8)
+    return df
+
+
+def _day(date):
+    return np.datetime64(pd.Timestamp(date).date(), "D")
+
+
+class ObsStore:
+    """
+    The store under root; see the module docstring. The columns are mapped once and re-mapped
+    after this object's own writes (open a new one to see another process's).
+    """
+
+    def __init__(self, root=OBS_DIR):
+        self.table = ColumnTable(root)
+        self._mapped = None   # (rows, epoch, read-only column maps), dropped on every write
+
+    def _map(self):
+        if self._mapped is None:
+            meta = self.table.meta
+            epoch = meta.get("attrs", {}).get("epoch")
+            self._mapped = (meta["rows"], None if epoch is None else np.datetime64(epoch, "D"), self.table.arrays())
+        return self._mapped
+
+    def __len__(self):
+        return self._map()[0]
+
+    @property
+    def epoch(self):
+        """
+        The first day held (datetime64[D]), None while the store is empty.
+        """
+        return self._map()[1]
+
+    @property
+    def last_date(self):
+        return None if not len(self) else self.epoch + (len(self) - 1)
+
+    def dates(self, start=None, end=None):
+        """
+        The days of the rows arrays(start, end) returns.
+        """
+        i, j = self._bounds(start, end)
+        return pd.DatetimeIndex((self.epoch + np.arange(i, j)).astype("datetime64[ns]"))
+
+    def _bounds(self, start, end):
+        # row range [i, j) of start..end (inclusive, either optional), clipped to the store
+        if not len(self):
+            return 0, 0
+        i = 0 if start is None else int((_day(start) - self.epoch) // DAY)
+        j = len(self) if end is None else int((_day(end) - self.epoch) // DAY) + 1
+        return min(max(i, 0), len(self)), min(max(j, 0), len(self))
+
+    def _extend(self, first, last):
+        # grows the table so that first..last are rows; days before the epoch mean rewriting it once
+        epoch, last_date = self.epoch, self.last_date
+        self._mapped = None
+        if epoch is None:
+            self.table.append(_blank(int((last - first) // DAY) + 1), epoch=str(first))
+            return
+        if first < epoch:
+            old = self.table.frame().copy()
+            self.table.truncate(0)
+            self.table.append(pd.concat([_blank(int((epoch - first) // DAY)), old], ignore_index=True),
+                              epoch=str(first))
+        if last > last_date:
+            self.table.append(_blank(int((last - last_date) // DAY)))
+
+    def write(self, obs, source):
+        """
+        Records obs (DATE and any of OBS_COLUMNS, one row per day; the first row of a repeated date
+        wins) as coming from source (see SOURCES). Days already held from a better source are kept.
+        Returns the number of days written.
+        """
+        rank = SOURCES[source]
+        obs = obs.dropna(subset=["DATE"]).drop_duplicates("DATE")
+        if obs.empty:
+            return 0
+        days = pd.to_datetime(obs["DATE"]).to_numpy("datetime64[D]")
+        self._extend(days.min(), days.max())
+        rows = ((days - self.epoch) // DAY).astype(np.intp)
+        arrays = self.table.arrays(mode="r+")
+        take = arrays["source"][rows] <= rank
+        rows = rows[take]
+        for c in OBS_COLUMNS:
+            values = pd.to_numeric(obs[c], errors="coerce").to_numpy(dtype="float64") if c in obs else np.nan
+            arrays[c][rows] = values[take] if np.ndim(values) else values
+        arrays["source"][rows] = rank
+        for a in arrays.values():
+            a.flush()
+        self._mapped = None
+        return len(rows)
+
+    def backfill_noaa(self, path):
+        """
+        Bulk-loads a NOAA daily CSV (read_noaa_csv). Returns the number of days written.
+        """
+        return self.write(read_noaa_csv(path), "noaa")
+
+    def record_cli(self, merged, today):
+        """
+        Adds the CLI rows of a run's inference frame (get_data.merge_data): days before today are
+        final reports, today's row is the preliminary one. Returns the number of days written.
+        """
+        dates = pd.to_datetime(merged["DATE"]).dt.date
+        final = self.write(merged[dates < today], "cli")
+        return final + self.write(merged[dates == today], "cli_today")
+
+    def arrays(self, start=None, end=None, columns=None):
+        """
+        Memory-mapped views of the rows start..end (inclusive, clipped to the store), without reading them.
+        """
+        i, j = self._bounds(start, end)
+        mapped = self._map()[2]
+        return {c: mapped[c][i:j] for c in columns or COLUMNS}
+
+    def frame(self, start=None, end=None, columns=None):
+        """
+        DATE plus the columns of start..end, one row per day; missing days are NaN rows with source 0.
+        """
+        df = pd.DataFrame(self.arrays(start, end, columns))
+        df.insert(0, "DATE", self.dates(start, end))
+        return df
+
+    def window(self, end, days):
+        """
+        frame() of the days days ending on end.
+        """
+        return self.frame(_day(end) - (days - 1), end)
+
+    def features(self, end, forecasted_tmax):
+        """
+        The inference feature row (FeatureState.features) for end from the HISTORY days ending on it,
+        so every lag is the observation of its own date. Raises ValueError naming the days of the
+        window without an observation; a value missing from a day held is forward-filled as in training.
+        """
+        missing = self.missing(_day(end) - (HISTORY - 1), end)
+        if len(missing):
+            raise ValueError(f"no observation for {', '.join(str(d.date()) for d in missing)} "
+                             f"in the {HISTORY}-day feature window ending {pd.Timestamp(end).date()}")
+        state = FeatureState()
+        state.update_from_frame(self.window(end, HISTORY))
+        return state.features(forecasted_tmax)
+
+    def missing(self, start=None, end=None):
+        """
+        The days in start..end (default: the whole store) without an observation, including days
+        of the range before or after what the store holds.
+        """
+        if not len(self):
+            if start is None or end is None:
+                return pd.DatetimeIndex([], dtype="datetime64[ns]")
+            return pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="D")
+        start = self.epoch if start is None else _day(start)
+        end = self.last_date if end is None else _day(end)
+        days = np.arange(start, end + 1)
+        inside = (days >= self.epoch) & (days <= self.last_date)
+        i, j = self._bounds(start, end)
+        held = np.zeros(len(days), dtype=bool)
+        held[inside] = self._map()[2]["source"][i:j] > 0
+        return pd.DatetimeIndex(days[~held].astype("datetime64[ns]"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--noaa", required=True, help="NOAA daily CSV for the station")
+    parser.add_argument("--root", default=str(OBS_DIR))
+    args = parser.parse_args()
+    store = ObsStore(args.root)
+    written = store.backfill_noaa(args.noaa)
+    missing = store.missing()
+    print(f"{written} days written, store holds {store.epoch} .. {store.last_date} ({len(store)} days)")
+    print(f"{len(missing)} missing days" + (f", latest {missing[-10:].date.tolist()}" if len(missing) else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Distribution of the adjusted-forecast error (realized TMAX - mu) from out-of-fold residuals, as a
+lookup table, for pricing contracts without assuming a Normal with one constant sigma.
+
+The CDF is tabulated once on a uniform grid of errors, either the empirical CDF of the residuals or
+a Gaussian-kernel smoothed one (kde, Silverman bandwidth). With seasonal=True there is one row per
+month, fitted on the residuals of that month and its window neighbours on each side. A lookup is
+index arithmetic plus a linear interpolation between two table entries, so pricing every market of
+every day is a handful of array operations.
+
+    cdf = ResidualCDF.fit(residuals, months, kind="kde", seasonal=True)
+    cdf.save(RESIDUAL_CDF_PATH)
+    p_yes = ResidualCDF.load(RESIDUAL_CDF_PATH).prob_yes(floor, cap, mu, month)
+"""
+from pathlib import Path
+import numpy as np
+from scipy.special import ndtr
+
+RESIDUAL_CDF_PATH = Path(__file__).resolve().parent / "residual_cdf.npz"   # inference_KLAX/residual_cdf.npz
+GRID_STEP = 0.05   # F
+KINDS = ("empirical", "kde")
+_loaded = {}   # (path, mtime) -> ResidualCDF
+
+
+def silverman_bandwidth(residuals):
+    r = np.asarray(residuals, dtype="float64")
+    iqr = np.subtract(*np.percentile(r, [75, 25]))
+    spread = min(r.std(ddof=1), iqr / 1.349) if iqr > 0 else r.std(ddof=1)
+    return 0.9 * spread * len(r) ** -0.2
+
+
+def _tabulate(residuals, grid, kind, bandwidth):
+    r = np.sort(np.asarray(residuals, dtype="float64"))
+    if kind == "empirical":
+        return np.searchsorted(r, grid, side="right") / len(r)
+    # mean of the kernels' CDFs, in blocks of grid points to bound memory
+    out = np.empty(len(grid))
+    for i in range(0, len(grid), 256):
+        out[i:i + 256] = ndtr((grid[i:i + 256, None] - r[None, :]) / bandwidth).mean(axis=1)
+    return out
+
+
+class ResidualCDF:
+    """
+    table[row] is the CDF at x0 + i * dx; season maps month 1..12 to a row (all 0 if not seasonal)
+    and the last row is the one used without a month.
+    """
+
+    def __init__(self, x0, dx, table, season, kind="kde", bandwidth=np.nan, n=0):
+        self.x0, self.dx = float(x0), float(dx)
+        self.table = np.ascontiguousarray(table, dtype="float64")
+        self.season = np.asarray(season, dtype=np.intp)
+        self.kind, self.bandwidth, self.n = str(kind), float(bandwidth), int(n)
+        self._points = self.table.shape[1]
+        # each row padded with its last value, so i + 1 is in the row for every i the clip allows
+        self._flat = np.concatenate([self.table, self.table[:, -1:]], axis=1).ravel()
+        self._next = self._flat[1:]
+
+    @classmethod
+    def fit(cls, residuals, months=None, kind="kde", seasonal=False, window=1, step=GRID_STEP, bandwidth=None):
+        """
+        Tabulates the CDF of residuals. months (1..12, aligned with residuals) is needed for seasonal:
+        month m's row uses the residuals of months m-window..m+window (wrapping around the year),
+        and a last row all of them, for lookups without a month.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"ResidualCDF.fit(): kind must be one of {KINDS}, got {kind!r}")
+        r = np.asarray(residuals, dtype="float64")
+        r = r[~np.isnan(r)]
+        h = float(bandwidth or silverman_bandwidth(r))
+        pad = 5 * h if kind == "kde" else step
+        x0 = np.floor((r.min() - pad) / step) * step
+        grid = np.arange(x0, r.max() + pad + step, step)
+        if not seasonal:
+            return cls(x0, step, _tabulate(r, grid, kind, h)[None, :], np.zeros(12), kind, h, len(r))
+        if months is None:
+            raise ValueError("ResidualCDF.fit(): seasonal=True needs months")
+        months = np.asarray(months)[~np.isnan(np.asarray(residuals, dtype="float64"))]
+        rows = []
+        for m in range(1, 13):
+            dist = np.abs((months - m + 6) % 12 - 6)   # months apart, around the year
+            rows.append(_tabulate(r[dist <= window], grid, kind, h))
+        rows.append(_tabulate(r, grid, kind, h))
+        return cls(x0, step, np.stack(rows), np.arange(12), kind, h, len(r))
+
+    def save(self, path=RESIDUAL_CDF_PATH):
+        np.savez(path, x0=self.x0, dx=self.dx, table=self.table, season=self.season, kind=self.kind,
+                 bandwidth=self.bandwidth, n=self.n)
+        return Path(path)
+
+    @classmethod
+    def load(cls, path=RESIDUAL_CDF_PATH):
+        with np.load(path) as z:
+            return cls(z["x0"], z["dx"], z["table"], z["season"], str(z["kind"]), z["bandwidth"], z["n"])
+
+    @property
+    def seasonal(self):
+        return len(self.table) > 1
+
+    def _lookup(self, z, month=None):
+        # linear interpolation in the table, clamped to its ends; fmax/fmin also map NaN to the first entry
+        seasonal = self.seasonal and month is not None
+        if seasonal:
+            z, month = np.broadcast_arrays(z, month)
+        shape = np.shape(z)
+        pos = np.subtract(np.atleast_1d(z), self.x0, dtype="float64")
+        pos *= 1.0 / self.dx
+        np.fmax(pos, 0.0, out=pos)
+        np.fmin(pos, self._points - 1, out=pos)
+        i = pos.astype(np.intp)
+        pos -= i
+        if seasonal:
+            i += self.season[np.atleast_1d(month).astype(np.intp) - 1] * (self._points + 1)
+        elif self.seasonal:
+            i += (len(self.table) - 1) * (self._points + 1)
+        lo = self._flat[i]
+        out = self._next[i]
+        out -= lo
+        out *= pos
+        out += lo
+        return out.reshape(shape)
+
+    def cdf(self, z, month=None):
+        """
+        P(error <= z), broadcasting z against month (1..12; ignored if not seasonal, all year if None).
+        """
+        z = np.asarray(z, dtype="float64")
+        return np.where(np.isnan(z), np.nan, self._lookup(z, month))
+
+    def prob_yes(self, floor, cap, mu, month=None):
+        """
+        ev.prob_yes with T = mu + error: P(floor <= T < cap), P(T >= floor) or P(T < cap).
+        """
+        floor = np.asarray(floor, dtype="float64")
+        cap = np.asarray(cap, dtype="float64")
+        mu = np.asarray(mu, dtype="float64")
+        has_floor = ~np.isnan(floor)
+        has_cap = ~np.isnan(cap)
+        upper = np.where(has_cap, self._lookup(cap - mu, month), 1.0)
+        lower = np.where(has_floor, self._lookup(floor - mu, month), 0.0)
+        p = np.clip(upper - lower, 0.0, 1.0)
+        valid = has_floor | has_cap
+        if np.isnan(mu).any():
+            valid = valid & ~np.isnan(mu)
+        return np.where(valid, p, np.nan)
+
+
+def load_cdf(path=RESIDUAL_CDF_PATH):
+    """
+    ResidualCDF.load(path), read once per process and again only when the file changes.
+    """
+    path = Path(path)
+    key = (str(path.resolve()), path.stat().st_mtime_ns)
+    if key not in _loaded:
+        _loaded[key] = ResidualCDF.load(path)
+    return _loaded[key]
@@ -0,0 +1,190 @@
+"""
+Per-stage latency tracing for the inference run.
+
+Stages and HTTP calls are wrapped in span(name, **attrs). While a Tracer is started, every span
+records its start (seconds since the run began), duration, thread, parent span (the span open on
+the same thread when it started), its attrs (city, status, bytes, retries, ...) and the exception
+type if it raised. Tracer.write dumps the run as one JSON file. With no tracer started, span()
+returns a shared no-op object, so instrumented code costs a global lookup per span.
+
+summarize() reads a directory of traces and gives p50/p95 per stage across runs:
+
+    python inference_KLAX/tracing.py inference_KLAX/traces
+"""
+import datetime as dt
+import itertools
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+import numpy as np
+import pandas as pd
+
+TRACE_DIR = Path(__file__).resolve().parent / "traces"   # inference_KLAX/traces/
+
+_tracer = None
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "id", "parent", "name", "attrs", "start", "seconds")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer, self.name, self.attrs = tracer, name, attrs
+        self.id = next(tracer._ids)
+        self.parent = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        self.parent = stack[-1].id if stack else None
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        self.tracer._stack().pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._record(self)
+        return False
+
+
+class Tracer:
+    """
+    Collects the spans of one run.
+    """
+
+    def __init__(self, run_id=None, **attrs):
+        self.started = dt.datetime.now(dt.timezone.utc)
+        self.run_id = run_id or self.started.strftime("%Y%m%dT%H%M%SZ")
+        self.attrs = attrs
+        self.t0 = time.perf_counter()
+        self.spans = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span):
+        row = {"id": span.id, "parent": span.parent, "name": span.name,
+               "start": round(span.start - self.t0, 6), "seconds": round(span.seconds, 6),
+               "thread": threading.current_thread().name, **span.attrs}
+        with self._lock:
+            self.spans.append(row)
+
+    def span(self, name, **attrs):
+        return Span(self, name, attrs)
+
+    def trace(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start"])
+        return {"run_id": self.run_id, "started": self.started.isoformat(),
+                "seconds": round(time.perf_counter() - self.t0, 6), **self.attrs, "spans": spans}
+
+    def write(self, directory=TRACE_DIR):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.run_id}.json"
+        path.write_text(json.dumps(self.trace(), default=str))
+        return path
+
+
+def start(run_id=None, **attrs):
+    """
+    Starts tracing this process's spans; returns the Tracer.
+    """
+    global _tracer
+    _tracer = Tracer(run_id, **attrs)
+    return _tracer
+
+
+def stop():
+    """
+    Stops tracing and returns the Tracer that was running (or None).
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def span(name, **attrs):
+    """
+    Context manager timing the enclosed block as one span (a no-op unless a tracer is started).
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return tracer.span(name, **attrs)
+
+
+def http_span(method, url):
+    """
+    Span for one HTTP call, named by method and host; the path (without query) goes in attrs.
+    """
+    if _tracer is None:
+        return _NOOP
+    u = urlparse(url)
+    return _tracer.span(f"http {method} {u.netloc}", path=u.path)
+
+
+def _stage_rows(trace):
+    spans = pd.DataFrame(trace["spans"])
+    if spans.empty:
+        return spans
+    spans["run_id"] = trace["run_id"]
+    rows = [spans[["run_id", "name", "seconds"]]]
+    # time from having a city's quotes to starting its orders
+    if "city" in spans:
+        ends = spans[spans["name"] == "markets"].assign(end=lambda d: d["start"] + d["seconds"]).set_index("city")["end"]
+        orders = spans[spans["name"] == "order"].set_index("city")["start"]
+        gap = (orders - ends.reindex(orders.index)).dropna()
+        rows.append(pd.DataFrame({"run_id": trace["run_id"], "name": "quote_to_order", "seconds": gap.to_numpy()}))
+    rows.append(pd.DataFrame({"run_id": [trace["run_id"]], "name": ["run"], "seconds": [trace["seconds"]]}))
+    return pd.concat(rows, ignore_index=True)
+
+
+def summarize(paths):
+    """
+    One row per span name across the traces: runs it appears in, count, p50/p95/max in ms.
+    paths is a trace directory or a list of trace files.
+    """
+    if isinstance(paths, (str, Path)) and Path(paths).is_dir():
+        paths = sorted(Path(paths).glob("*.json"))
+    frames = [_stage_rows(json.loads(Path(p).read_text())) for p in paths]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=["name", "runs", "count", "p50_ms", "p95_ms", "max_ms"])
+    df = pd.concat(frames, ignore_index=True)
+    out = df.groupby("name").agg(runs=("run_id", "nunique"), count=("seconds", "size"),
+                                 p50_ms=("seconds", lambda s: np.percentile(s, 50) * 1000),
+                                 p95_ms=("seconds", lambda s: np.percentile(s, 95) * 1000),
+                                 max_ms=("seconds", lambda s: s.max() * 1000))
+    return out.sort_values("p95_ms", ascending=False).reset_index()
+
+
+if __name__ == "__main__":
+    print(summarize(sys.argv[1] if len(sys.argv) > 1 else TRACE_DIR).round(1).to_string(index=False))
@@ -0,0 +1,159 @@
+"""
+The XGBoost model as flat NumPy arrays, so inference can score without importing xgboost.
+
+compile_model turns a saved booster (best1_1.json) into one .npz next to it: every tree's nodes
+concatenated (split feature, threshold, children, default direction, leaf value), the root of each
+tree, the base score and the feature names. TreeModel evaluates all trees for all rows at once,
+one tree level per step, and adds the leaves in tree order in float32 like the booster does, so
+its predictions are identical to booster.inplace_predict.
+
+    python inference_KLAX/tree_model.py inference_KLAX/best1_1.json
+"""
+import hashlib
+import json
+import sys
+from pathlib import Path
+import numpy as np
+
+
+def _source_hash(json_path):
+    return hashlib.sha256(Path(json_path).read_bytes()).hexdigest()
+
+
+def compiled_path(json_path):
+    return Path(json_path).with_suffix(".npz")
+
+
+def _parse_float(s):
+    # base_score is stored as "[1.4819772E0]" by xgboost >= 2 and "1.48E0" before
+    return float(str(s).strip("[]"))
+
+
+def compile_model(json_path, out_path=None):
+    """
+    Writes the compiled arrays of the booster saved at json_path (default out_path: same name, .npz).
+    Only single-output gbtree models with numerical splits are supported.
+    """
+    json_path = Path(json_path)
+    out_path = Path(out_path) if out_path else compiled_path(json_path)
+    learner = json.loads(json_path.read_text())["learner"]
+    booster = learner["gradient_booster"]
+    params = learner["learner_model_param"]
+    if booster["name"] != "gbtree":
+        raise ValueError(f"compile_model(): unsupported booster {booster['name']!r}")
+    if int(params.get("num_class", 0)) > 1 or int(params.get("num_target", 1)) > 1:
+        raise ValueError("compile_model(): multi-output models are not supported")
+    if not learner["objective"]["name"].startswith("reg:squared"):
+        # other objectives transform the margin (sigmoid, exp, ...)
+        raise ValueError(f"compile_model(): unsupported objective {learner['objective']['name']!r}")
+
+    trees = booster["model"]["trees"]
+    feature, threshold, left, right, default_left = [], [], [], [], []
+    roots, depth = [], 0
+    offset = 0
+    for tree in trees:
+        if any(tree["split_type"]):
+            raise ValueError("compile_model(): categorical splits are not supported")
+        lc = np.asarray(tree["left_children"], dtype=np.int32)
+        rc = np.asarray(tree["right_children"], dtype=np.int32)
+        leaf = lc == -1
+        roots.append(offset)
+        feature.append(np.asarray(tree["split_indices"], dtype=np.int32))
+        # leaves keep their value in split_conditions
+        threshold.append(np.asarray(tree["split_conditions"], dtype=np.float32))
+        # children as global indices; a leaf points at itself so evaluation can overrun it
+        own = np.arange(offset, offset + len(lc), dtype=np.int32)
+        left.append(np.where(leaf, own, lc + offset))
+        right.append(np.where(leaf, own, rc + offset))
+        default_left.append(np.asarray(tree["default_left"], dtype=bool))
+        depth = max(depth, _depth(lc, rc))
+        offset += len(lc)
+
+    arrays = dict(
+        feature=np.concatenate(feature), threshold=np.concatenate(threshold),
+        left=np.concatenate(left), right=np.concatenate(right), default_left=np.concatenate(default_left),
+        roots=np.asarray(roots, dtype=np.int32), depth=np.int32(depth),
+        base_score=np.float32(_parse_float(params["base_score"])),
+        feature_names=np.asarray(learner.get("feature_names") or [], dtype=str),
+        source_sha256=np.asarray(_source_hash(json_path)),
+    )
+    np.savez(out_path, **arrays)
+    return out_path
+
+
+def _depth(lc, rc):
+    depth = np.zeros(len(lc), dtype=np.int32)
+    # parents come before their children in xgboost's node order
+    for i in range(len(lc)):
+        if lc[i] != -1:
+            depth[lc[i]] = depth[rc[i]] = depth[i] + 1
+    return int(depth.max())
+
+
+class TreeModel:
+    """
+    Vectorized evaluator over the compiled arrays.
+    """
+
+    def __init__(self, path):
+        with np.load(path) as z:
+            self.feature = z["feature"]
+            self.threshold = z["threshold"]
+            self.left = z["left"]
+            self.right = z["right"]
+            self.default_left = z["default_left"]
+            self.roots = z["roots"]
+            self.depth = int(z["depth"])
+            self.base_score = np.float32(z["base_score"])
+            self.feature_names = [str(n) for n in z["feature_names"]] or None
+            self.source_sha256 = str(z["source_sha256"])
+
+    def predict(self, X):
+        """
+        Predictions for the rows of X (DataFrame with the model's feature columns, or a 2-D array
+        in feature order). NaN takes each split's default direction.
+        """
+        if hasattr(X, "columns"):
+            X = X[self.feature_names] if self.feature_names else X
+            X = X.to_numpy(dtype=np.float32)
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        for _ in range(self.depth):
+            x = X[rows, self.feature[node]]
+            go_left = np.where(np.isnan(x), self.default_left[node], x < self.threshold[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+        # the booster adds tree after tree onto the base score in float32
+        leaves = np.concatenate([np.full((len(X), 1), self.base_score, dtype=np.float32),
+                                 self.threshold[node]], axis=1)
+        return np.cumsum(leaves, axis=1, dtype=np.float32)[:, -1]
+
+
+_models = {}
+
+
+def load_model(json_path):
+    """
+    The TreeModel for the booster saved at json_path, loaded once per process. The .npz is
+    (re)compiled first if it is missing or was compiled from a different version of the file,
+    which needs only the JSON, not xgboost.
+    """
+    npz = compiled_path(json_path)
+    if npz.exists():
+        key = (str(npz.resolve()), npz.stat().st_mtime_ns, Path(json_path).stat().st_mtime_ns)
+        if key in _models:
+            return _models[key]
+        model = TreeModel(npz)
+        if model.source_sha256 == _source_hash(json_path):
+            _models[key] = model
+            return model
+    print(f"compiling {json_path} -> {npz}")
+    compile_model(json_path, npz)
+    return load_model(json_path)
+
+
+if __name__ == "__main__":
+    for p in sys.argv[1:]:
+        print(f"{p} -> {compile_model(p)}")
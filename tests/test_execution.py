@@ -0,0 +1,104 @@
+import uuid
+import pandas as pd
+import pytest
+import requests
+from stubs import KalshiStub
+from kalshi_client import KalshiClient
+from execution import (BATCH_LIMIT, LEG_COLUMNS, best_no_leg, cap_legs, client_order_id, execute, order_error,
+                       submit_orders)
+
+
+def http_error(status):
+    r = requests.Response()
+    r.status_code = status
+    return requests.HTTPError(f"{status} error", response=r)
+
+
+def stub_legs(stub, run_id, n_series):
+    """
+    A NO leg at the ask on every open market of n_series stub series.
+    """
+    markets = [m for i in range(n_series) for m in stub.open_markets(f"KXHIGHT{i}")]
+    return pd.DataFrame([{
+        "market_ticker": m["ticker"], "side": "no", "price": m["no_ask"], "count": 1, "edge": 0.1,
+        "client_order_id": client_order_id(run_id, m["ticker"], "no"),
+    } for m in markets], columns=LEG_COLUMNS)
+
+
+@pytest.fixture
+def stub(rsa_key):
+    with KalshiStub(public_key=rsa_key.public_key(), market_days=1) as stub:
+        yield stub
+
+
+@pytest.fixture
+def client(stub, pem):
+    return KalshiClient(key_id="key-id", private_key_pem=pem, base_url=stub.api_url, write_rate=1000)
+
+
+def test_client_order_id_is_deterministic():
+    a = client_order_id("run-1", "KXHIGHLAX-26JAN02-B70.5", "no")
+    assert a == client_order_id("run-1", "KXHIGHLAX-26JAN02-B70.5", "no")
+    assert uuid.UUID(a).version == 5
+    assert len({a, client_order_id("run-2", "KXHIGHLAX-26JAN02-B70.5", "no"),
+                client_order_id("run-1", "KXHIGHLAX-26JAN02-B72.5", "no"),
+                client_order_id("run-1", "KXHIGHLAX-26JAN02-B70.5", "yes")}) == 4
+
+
+def test_order_error_treats_409_as_duplicate():
+    assert order_error(http_error(409)) == {"status": "duplicate"}
+    out = order_error(http_error(400))
+    assert out["status"] == "rejected" and "400" in out["error"]
+    assert order_error(requests.ConnectionError("reset"))["status"] == "rejected"
+
+
+def test_cap_legs():
+    legs = pd.DataFrame({"market_ticker": list("abcd"), "side": "no", "price": [40, 30, 20, 10], "count": 1,
+                         "edge": [0.4, 0.3, 0.2, 0.1], "client_order_id": list("abcd")})
+    assert cap_legs(legs)["market_ticker"].tolist() == ["a"]
+    assert cap_legs(legs, max_legs=3, max_notional=0.7)["market_ticker"].tolist() == ["a", "b"]
+
+
+def test_best_no_leg():
+    ev_df = pd.DataFrame({"market_ticker": ["m1", "m2"], "edge_no_cents": [0.1, 0.3], "p_no": [0.5, 0.985]})
+    leg = best_no_leg(ev_df, "run-1").iloc[0]
+    assert leg["market_ticker"] == "m2" and leg["price"] == 99
+    assert leg["client_order_id"] == client_order_id("run-1", "m2", "no")
+
+
+def test_resubmitted_orders_are_duplicates(stub, client):
+    legs = stub_legs(stub, "run-1", 2)
+    first, _ = submit_orders(client, legs)
+    assert (first["status"] == "executed").all() and first["order_id"].notna().all()
+    again, _ = submit_orders(client, legs)
+    assert (again["status"] == "duplicate").all() and again["order_id"].isna().all()
+    assert len(stub.orders) == len(legs)
+
+
+@pytest.mark.parametrize("n_series", [2, 4, 7])
+def test_batches_split_at_limit(stub, client, n_series):
+    legs = stub_legs(stub, "run-1", n_series)
+    results, _ = submit_orders(client, legs, batch=True)
+    assert stub.requests == -(-len(legs) // BATCH_LIMIT)
+    assert (results["status"] == "executed").all()
+    assert results["market_ticker"].tolist() == legs["market_ticker"].tolist()
+    assert len(stub.orders) == len(legs)
+    again, _ = submit_orders(client, legs, batch=True)
+    assert (again["status"] == "duplicate").all() and len(stub.orders) == len(legs)
+
+
+def test_unknown_market_is_rejected_not_raised(stub, client):
+    legs = stub_legs(stub, "run-1", 1)
+    legs.loc[0, "market_ticker"] = "KXHIGHT0-NOPE-B1"
+    results, _ = submit_orders(client, legs)
+    assert results["status"].tolist() == ["rejected"] + ["executed"] * (len(legs) - 1)
+
+
+def test_execute_sends_one_order_by_default(stub, client):
+    tickers = [m["ticker"] for m in stub.open_markets("KXHIGHT0")]
+    ev_df = pd.DataFrame({"market_ticker": tickers, "yes_ask": 50.0, "no_ask": 50.0,
+                          "edge_yes_cents": -0.1, "edge_no_cents": [0.1, 0.2, 0.3, 0.05, 0.0, -0.2]})
+    results = execute(ev_df, client, "run-1")
+    assert results["market_ticker"].tolist() == [tickers[2]] and len(stub.orders) == 1
+    results = execute(ev_df, client, "run-2", max_legs=5, max_notional=1.0)
+    assert results["market_ticker"].tolist() == [tickers[2], tickers[1]]
@@ -0,0 +1,43 @@
+import pytest
+import requests
+from stubs import KalshiStub
+from kalshi_client import KalshiClient
+
+
+def test_paginate_follows_cursors():
+    with KalshiStub(market_days=3) as stub:
+        client = KalshiClient(base_url=stub.api_url, read_rate=1000)
+        pages = list(client.paginate("/markets", "markets", params={"series_ticker": "KXHIGHP"}, limit=5))
+        requests_made = stub.requests
+        expected = [m["ticker"] for m in stub.open_markets("KXHIGHP")]
+    assert [len(p) for p in pages] == [5, 5, 5, 3]
+    assert [m["ticker"] for p in pages for m in p] == expected
+    assert requests_made == 4
+
+
+def test_paginate_single_page():
+    with KalshiStub(market_days=1) as stub:
+        client = KalshiClient(base_url=stub.api_url, read_rate=1000)
+        pages = list(client.paginate("/markets", "markets", params={"series_ticker": "KXHIGHP"}))
+        assert [len(p) for p in pages] == [6] and stub.requests == 1
+
+
+def test_retries_throttled_and_unavailable():
+    with KalshiStub(rate=3, flaky=0.2, seed=1) as stub:
+        client = KalshiClient(base_url=stub.api_url, read_rate=1000, retries=8)
+        for _ in range(6):
+            assert len(client.get("/markets", params={"series_ticker": "KXHIGHP"})["markets"]) == 18
+        assert stub.throttled > 0 and stub.requests > 6
+
+
+def test_signed_order_request(rsa_key, pem):
+    order = {"ticker": "KXHIGHP-X-B1", "side": "no", "action": "buy", "type": "limit", "count": 1,
+             "no_price": 50, "client_order_id": "id-1"}
+    with KalshiStub(public_key=rsa_key.public_key()) as stub:
+        client = KalshiClient(key_id="key-id", private_key_pem=pem, base_url=stub.api_url)
+        with pytest.raises(requests.HTTPError) as err:
+            client.post("/portfolio/orders", json=order)
+        # signed correctly: the stub gets past the signature check and rejects the unknown market
+        assert err.value.response.status_code == 400
+        with pytest.raises(ValueError):
+            KalshiClient(base_url=stub.api_url).post("/portfolio/orders", json=order)
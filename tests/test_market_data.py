@@ -0,0 +1,25 @@
+from stubs import KalshiStub
+from kalshi_client import KalshiClient
+from get_market_data import fetch_daily_candles, make_daily_request_table
+
+
+def test_failed_days_are_isolated():
+    req = make_daily_request_table("KXHIGHLAX", "2025-03-01", "2025-03-10")
+    fail = set(req["event_ticker"].iloc[[2, 7]])
+    with KalshiStub(fail_events=fail) as stub:
+        candles, failed = fetch_daily_candles(req, client=KalshiClient(base_url=stub.api_url, read_rate=1000, retries=1))
+    assert set(failed["event_ticker"]) == fail and failed["error"].str.contains("500").all()
+    assert candles["day"].unique().tolist() == [d for d, e in zip(req["day"], req["event_ticker"]) if e not in fail]
+    assert candles.groupby("day").size().eq(6).all()
+
+
+def test_retried_days_pick_the_target_candle():
+    req = make_daily_request_table("KXHIGHLAX", "2025-03-01", "2025-03-06")
+    with KalshiStub(flaky=0.2, seed=1) as stub:
+        candles, failed = fetch_daily_candles(req, client=KalshiClient(base_url=stub.api_url, read_rate=1000, retries=8))
+        assert stub.requests > len(req)
+    assert failed.empty and len(candles) == 6 * len(req)
+    # the target is 12:00 UTC, where the stub's ask is 0.05 + 0.15 * (market index)
+    for _, day in candles.groupby("day"):
+        assert day["yes_ask"].tolist() == [round(0.05 + 0.15 * i, 4) for i in range(6)]
+    assert candles["day"].tolist() == req["day"].repeat(6).tolist()
@@ -0,0 +1,27 @@
+import pandas as pd
+from stubs import KalshiStub
+from kalshi_client import KalshiClient
+from markets import iter_market_pages, list_markets
+
+
+def test_pages_follow_cursors_per_series():
+    series = ["KXHIGHA", "KXHIGHB", "KXHIGHC"]
+    with KalshiStub(market_days=3) as stub:
+        client = KalshiClient(base_url=stub.api_url, read_rate=1000)
+        pages = list(iter_market_pages(series + ["KXHIGHA"], client=client, limit=4))
+        # 18 markets per series in pages of 4, duplicates in the series list fetched once
+        assert stub.requests == 3 * 5
+        expected = {s: [m["ticker"] for m in stub.open_markets(s)] for s in series}
+    got = {s: [m["ticker"] for name, page in pages if name == s for m in page] for s in series}
+    assert got == expected
+
+
+def test_list_markets_frame():
+    with KalshiStub(market_days=2) as stub:
+        df = list_markets(["KXHIGHB", "KXHIGHA"], client=KalshiClient(base_url=stub.api_url, read_rate=1000), limit=5)
+    assert len(df) == 24 and df["market_ticker"].is_unique
+    assert df["series_ticker"].tolist() == ["KXHIGHA"] * 12 + ["KXHIGHB"] * 12
+    day = df[(df["series_ticker"] == "KXHIGHA") & (df["date"] == df["date"].max())]
+    assert day["floor"].isna().sum() == 1 and day["cap"].isna().sum() == 1
+    assert day["cap"].dropna().is_monotonic_increasing
+    assert df["date"].max() == pd.Timestamp.now("UTC").normalize().tz_localize(None) + pd.Timedelta(days=1)
@@ -0,0 +1,46 @@
+import datetime as dt
+import pytest
+from stubs import GribstreamStub
+from reforecast import WINDOW_DAYS, ReforecastStore, asof_time, download, fetch_nextday_tmax_lax, windows
+
+START = dt.date(2024, 5, 1)
+
+
+def day(i):
+    return START + dt.timedelta(days=i)
+
+
+def test_windows_split_runs_of_consecutive_days():
+    days = [day(i) for i in list(range(10)) + [12, 13]]
+    assert [len(w) for w in windows(days, window_days=WINDOW_DAYS)] == [7, 3, 2]
+    assert windows(days, window_days=4)[2] == [day(8), day(9)]
+
+
+def test_tmax_is_the_as_of_run(tmp_path):
+    with GribstreamStub() as stub:
+        tmax = fetch_nextday_tmax_lax(day(0), day(2), store=ReforecastStore(tmp_path), token=stub.token,
+                                      url=stub.url + stub.PATH)
+    assert tmax["date_utc"].tolist() == [day(i).isoformat() for i in range(3)]
+    for d, got in zip([day(i) for i in range(3)], tmax["tmax_K"]):
+        run = asof_time(d, 12)
+        hours = [dt.datetime(d.year, d.month, d.day, h, tzinfo=dt.timezone.utc) for h in range(24)]
+        assert got == pytest.approx(max(GribstreamStub.temp_k(run, t) for t in hours))
+
+
+def test_resumes_without_refetching(tmp_path):
+    store = ReforecastStore(tmp_path)
+    with GribstreamStub(fail_days=[day(3)], failures=1, missing_days=[day(9)]) as stub:
+        kwargs = dict(store=store, token=stub.token, url=stub.url + stub.PATH, retries=0)
+        failed = download(day(0), day(13), **kwargs)
+        # the failing window's days are reported and the others checkpointed
+        assert failed["day"].tolist() == [day(i) for i in range(7)]
+        assert store.missing_days(day(0), day(13)) == failed["day"].tolist()
+        first = list(stub.windows)
+
+        failed = download(day(0), day(13), **kwargs)
+        assert failed.empty and store.missing_days(day(0), day(13)) == []
+        assert stub.windows[len(first):] == [(day(0), 7)]
+
+        # a day without data is stored empty, so nothing is requested again
+        assert download(day(0), day(13), **kwargs).empty and len(stub.windows) == len(first) + 1
+    assert store.daily_tmax(day(0), day(13))["date_utc"].tolist() == [day(i).isoformat() for i in range(14) if i != 9]
@@ -0,0 +1,180 @@
+"""
+Successive-halving hyperparameter search for the forecast-error model, in place of the notebooks'
+RandomizedSearchCV (n_iter=30, TimeSeriesSplit(5), every candidate trained to n_estimators on every fold).
+
+Candidates are drawn from the same distribution with the same sampler, so with the same seed they
+are the ones RandomizedSearchCV would try. Every rung trains the surviving candidates a few times
+more rounds on every fold, continuing from the trees they already have, and keeps the best 1/eta.
+Each fold's time-ordered validation block is split in two: early stopping watches the first half,
+and candidates are ranked by their MAE on the later half at the round early stopping picked, so the
+block that chooses the round count is not also the one that scores it. The fold matrices are
+binned once, on cut points sketched from a prefix of the fold's training block
+(walk_forward.TrainingMatrix), and shared by all candidates.
+"""
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.model_selection import ParameterSampler, TimeSeriesSplit
+from walk_forward import TrainingMatrix, booster_params
+
+# RandomizedSearchCV's param_dist in model_forecast_1.ipynb
+PARAM_DIST = {
+    "n_estimators": [400, 800, 1200, 2000],
+    "learning_rate": [0.01, 0.03, 0.05, 0.08],
+    "max_depth": [2, 3, 4, 5, 6],
+    "min_child_weight": [1, 3, 5, 8, 12],
+    "subsample": [0.6, 0.8, 1.0],
+    "colsample_bytree": [0.6, 0.8, 1.0],
+    "reg_lambda": [1, 5, 10, 20],
+    "reg_alpha": [0.0, 0.01, 0.1],
+}
+
+
+class Fold:
+    """
+    One TimeSeriesSplit fold: the training QuantileDMatrix, the early-stopping half of the validation
+    block binned against it, and the row slices of the whole validation block and of its later,
+    ranking half.
+    """
+    __slots__ = ("dtrain", "dstop", "val", "rank")
+
+    def __init__(self, dtrain, dstop, val, rank):
+        self.dtrain, self.dstop, self.val, self.rank = dtrain, dstop, val, rank
+
+
+class FoldData:
+    """
+    Every TimeSeriesSplit fold (Fold), built once, binned on cut points from a prefix of the fold's training block.
+    """
+
+    def __init__(self, X, y, n_splits=5, max_bin=256):
+        self.matrix = TrainingMatrix(X, y, max_bin=max_bin)
+        self.folds = []
+        for train_idx, val_idx in TimeSeriesSplit(n_splits=n_splits).split(self.matrix.X):
+            # TimeSeriesSplit folds are contiguous: train [0, a), validation [a, b), ranked on [m, b)
+            a, b = train_idx[-1] + 1, val_idx[-1] + 1
+            m = (a + b) // 2
+            dtrain = self.matrix.dmatrix(a)
+            # xgboost requires evaluation data binned against the training matrix itself
+            dstop = xgb.QuantileDMatrix(self.matrix.X[a:m], self.matrix.y[a:m], ref=dtrain,
+                                        feature_names=self.matrix.feature_names)
+            self.folds.append(Fold(dtrain, dstop, slice(a, b), slice(m, b)))
+
+    def __len__(self):
+        return len(self.folds)
+
+
+class _Trial:
+    """
+    One candidate on one fold: its booster so far, the early-stopping MAE after every round, and
+    the ranking-block MAE at the best of those rounds.
+    """
+    __slots__ = ("booster", "history", "stopped", "rank_mae")
+
+    def __init__(self):
+        self.booster, self.history, self.stopped, self.rank_mae = None, [], False, np.inf
+
+    @property
+    def best(self):
+        return min(self.history) if self.history else np.inf
+
+    @property
+    def best_rounds(self):
+        return int(np.argmin(self.history)) + 1 if self.history else 0
+
+
+def _advance(trial, fold, matrix, params, target, early_stopping_rounds, nthread):
+    """
+    Trains the trial up to target rounds (or until early stopping) from where it left off, then
+    scores its best round count on the fold's ranking block.
+    """
+    extra = target - len(trial.history)
+    if trial.stopped or extra <= 0:
+        return
+    result = {}
+    trial.booster = xgb.train({**params, "nthread": nthread}, fold.dtrain, num_boost_round=extra,
+                              evals=[(fold.dstop, "stop")], evals_result=result, verbose_eval=False,
+                              early_stopping_rounds=early_stopping_rounds, xgb_model=trial.booster)
+    trial.history.extend(result["stop"]["mae"])
+    since_best = len(trial.history) - trial.best_rounds
+    trial.stopped = since_best >= early_stopping_rounds
+    pred = trial.booster.inplace_predict(matrix.X[fold.rank], iteration_range=(0, trial.best_rounds))
+    trial.rank_mae = float(np.mean(np.abs(matrix.y[fold.rank] - pred)))
+
+
+def successive_halving(X, y, n_candidates=30, param_dist=PARAM_DIST, n_splits=5, min_rounds=100, eta=3,
+                       early_stopping_rounds=50, seed=42, max_workers=None, data=None):
+    """
+    Returns (best_params, candidates, timeline):
+      best_params  XGBRegressor params of the winner, n_estimators set to its mean best round count
+      candidates   one row per candidate: its params, last rung reached, rounds trained, mean
+                   ranking-block MAE (mae) and mean early-stopping MAE (stop_mae)
+      timeline     per rung: elapsed seconds, candidates trained, best mean ranking-block MAE so far
+
+    Rung r trains the survivors to min_rounds * eta**r rounds (never past their n_estimators).
+    """
+    start = time.perf_counter()
+    data = data or FoldData(X, y, n_splits)
+    candidates = list(ParameterSampler(param_dist, n_candidates, random_state=seed))
+    trials = [[_Trial() for _ in data.folds] for _ in candidates]
+    cores = os.cpu_count() or 1
+    max_workers = max_workers or cores
+    nthread = max(1, cores // max_workers)
+    rung_of = [0] * len(candidates)
+    alive = list(range(len(candidates)))
+    timeline = []
+    rung = 0
+
+    def score(i):
+        return float(np.mean([t.rank_mae for t in trials[i]]))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while True:
+            budget = min_rounds * eta ** rung
+            jobs = []
+            for i in alive:
+                params, cap = booster_params(candidates[i])
+                rung_of[i] = rung
+                for trial, fold in zip(trials[i], data.folds):
+                    jobs.append(pool.submit(_advance, trial, fold, data.matrix, params, min(budget, cap),
+                                            early_stopping_rounds, nthread))
+            for j in jobs:
+                j.result()
+            alive.sort(key=score)
+            timeline.append({"rung": rung, "budget": budget, "candidates": len(alive),
+                             "seconds": time.perf_counter() - start, "best_mae": score(alive[0])})
+            done = all(t.stopped or len(t.history) >= booster_params(candidates[i])[1]
+                       for i in alive for t in trials[i])
+            if len(alive) == 1 or done:
+                break
+            alive = alive[:max(1, math.ceil(len(alive) / eta))]
+            rung += 1
+
+    rows = []
+    for i, params in enumerate(candidates):
+        rows.append({**params, "rung": rung_of[i], "rounds": max(len(t.history) for t in trials[i]),
+                     "best_rounds": int(np.mean([t.best_rounds for t in trials[i]])), "mae": score(i),
+                     "stop_mae": float(np.mean([t.best for t in trials[i]]))})
+    table = pd.DataFrame(rows).sort_values(["rung", "mae"], ascending=[False, True]).reset_index(drop=True)
+    best = alive[0]
+    best_params = {**candidates[best], "n_estimators": int(np.mean([t.best_rounds for t in trials[best]]))}
+    return best_params, table, pd.DataFrame(timeline)
+
+
+def cv_mae(X, y, params, n_splits=5, data=None):
+    """
+    Mean validation MAE of XGBRegressor-style params over TimeSeriesSplit (whole validation blocks),
+    trained to n_estimators without early stopping (how RandomizedSearchCV scores a candidate).
+    """
+    train_params, rounds = booster_params(params)
+    data = data or FoldData(X, y, n_splits)
+    maes = []
+    for fold in data.folds:
+        booster = xgb.train(train_params, fold.dtrain, num_boost_round=rounds)
+        pred = booster.inplace_predict(data.matrix.X[fold.val])
+        maes.append(float(np.mean(np.abs(data.matrix.y[fold.val] - pred))))
+    return float(np.mean(maes))
@@ -0,0 +1,205 @@
+"""
+Training data for the forecast-error model as one incremental pipeline, replacing the CSV hand-offs
+between data_prep_noaa.ipynb, merge_data_1.ipynb and model_forecast_1.ipynb.
+
+Three append-only column tables (columnar.ColumnTable) under train_test/data/:
+  noaa        daily KLAX observations: DATE, TMAX, TMIN, PRCP, AWND, WDF2, WSF2, year
+  reforecast  next-day NBM forecast by as-of date: DATE, forecasted_TMAX
+  features    the two merged, plus TMAX_next_d, y and every model feature (feature_state.FEATURE_COLUMNS)
+
+Each update writes only dates that are not stored yet, and the features are recomputed only from
+the first changed date (minus the lag window) onwards. Everything is memory-mapped on load.
+
+    python train_test/training_data.py --noaa training_weather_data.csv --asof-hour 20
+"""
+import argparse
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "inference_KLAX"))
+sys.path.insert(0, str(ROOT / "backtesting"))
+from columnar import ColumnTable
+from feature_state import OBS_COLUMNS, LAGS, PRCP_LAGS, HISTORY, FEATURE_COLUMNS
+from obs_store import read_noaa_csv as read_noaa_daily
+
+DATA_DIR = Path(__file__).resolve().parent / "data"   # train_test/data/
+NOAA_START = "1998-01-01"                             # almost no nulls from here on (data_prep_noaa.ipynb)
+NOAA_COLUMNS = ["DATE"] + OBS_COLUMNS + ["year"]
+REFORECAST_COLUMNS = ["DATE", "forecasted_TMAX"]
+TARGET = "y"
+
+
+def read_noaa_csv(path, start=NOAA_START):
+    """
+    The NOAA daily CSV reduced to the kept columns (data_prep_noaa.ipynb).
+    """
+    df = read_noaa_daily(path)
+    df = df[df["DATE"] >= start]
+    df["year"] = df["DATE"].dt.year
+    return df[NOAA_COLUMNS]
+
+
+def reforecast_frame(daily):
+    """
+    reforecast.fetch_nextday_tmax_lax output keyed by its as-of date, as in merge_data_1.ipynb:
+    the forecast for day D+1 is the row of day D.
+    """
+    date = pd.to_datetime(pd.to_datetime(daily["asof_utc"], utc=True).dt.strftime("%Y-%m-%d"))
+    return pd.DataFrame({"DATE": date, "forecasted_TMAX": pd.to_numeric(daily["tmax_F"], errors="coerce")})
+
+
+def add_features(data):
+    """
+    Target and features of model_forecast_1.ipynb for a date-sorted frame of merged rows.
+    """
+    data = data.copy()
+    data["TMAX_next_d"] = data["TMAX"].shift(-1)
+    data[TARGET] = data["TMAX_next_d"] - data["forecasted_TMAX"]
+    data["doy"] = data["DATE"].dt.dayofyear
+    data["dow"] = data["DATE"].dt.dayofweek
+    data["month"] = data["DATE"].dt.month
+    data["doy_sin"] = np.sin(2 * np.pi * data["doy"] / 365.25)
+    data["doy_cos"] = np.cos(2 * np.pi * data["doy"] / 365.25)
+    data["diurnal_range"] = data["TMAX"] - data["TMIN"]
+    data["wind_dir_sin"] = np.sin(np.deg2rad(data["WDF2"]))
+    data["wind_dir_cos"] = np.cos(np.deg2rad(data["WDF2"]))
+    for c in ["TMAX", "TMIN", "diurnal_range"]:
+        for k in LAGS:
+            data[f"{c}_lag{k}"] = data[c].shift(k)
+    for k in PRCP_LAGS:
+        data[f"PRCP_lag_{k}"] = data["PRCP"].shift(k)
+    data["rolling_3"] = data["TMAX"].rolling(3).mean()
+    data["rolling_7"] = data["TMAX"].rolling(7).mean()
+    return data[["DATE", "TMAX_next_d", TARGET] + FEATURE_COLUMNS]
+
+
+class TrainingData:
+    """
+    The noaa, reforecast and features tables. update() brings them up to date with new rows;
+    frame() / Xy() read the features through memory maps.
+    """
+
+    def __init__(self, root=DATA_DIR):
+        self.root = Path(root)
+        self.noaa = ColumnTable(self.root / "noaa")
+        self.reforecast = ColumnTable(self.root / "reforecast")
+        self.features = ColumnTable(self.root / "features")
+
+    def _dates(self, table):
+        return table.arrays(["DATE"])["DATE"] if len(table) else np.array([], dtype="datetime64[ns]")
+
+    def _mark_dirty(self, date):
+        dirty = self.features.attrs.get("dirty_from")
+        if dirty is None or date < pd.Timestamp(dirty):
+            self.features.set_attrs(dirty_from=date.isoformat())
+
+    def _upsert(self, table, df):
+        """
+        Adds the rows of df whose DATE is not in table. Rows dated before the table's last date are
+        merged in by rewriting only the tail from the first of them. Returns the first new date or None.
+        """
+        df = df.sort_values("DATE").drop_duplicates("DATE", keep="last")
+        existing = self._dates(table)
+        new = df[~np.isin(df["DATE"].to_numpy("datetime64[ns]"), existing)]
+        if new.empty:
+            return None
+        first = pd.Timestamp(new["DATE"].iloc[0])
+        self._mark_dirty(first)
+        keep = int(np.searchsorted(existing, first.to_datetime64()))
+        if keep < len(existing):
+            tail = pd.concat([table.frame().iloc[keep:], new], ignore_index=True).sort_values("DATE")
+            table.truncate(keep)
+            table.append(tail)
+        else:
+            table.append(new)
+        return first
+
+    def update_noaa(self, noaa):
+        # float observations throughout, so a later day with a missing value fits the stored dtype
+        return self._upsert(self.noaa, noaa[NOAA_COLUMNS].astype({c: "float64" for c in OBS_COLUMNS}))
+
+    def update_reforecast(self, reforecast):
+        return self._upsert(self.reforecast, reforecast[REFORECAST_COLUMNS].astype({"forecasted_TMAX": "float64"}))
+
+    def update_features(self):
+        """
+        Recomputes the feature rows from the first changed date on. Returns the number of rows written.
+        """
+        dirty = self.features.attrs.get("dirty_from")
+        if dirty is None or not len(self.noaa):
+            return 0
+        # a new day changes the previous day's target (TMAX_next_d) too
+        start = pd.Timestamp(dirty) - pd.Timedelta(days=1)
+        weather_dates = self._dates(self.noaa)
+        first = int(np.searchsorted(weather_dates, start.to_datetime64()))
+        context = max(0, first - HISTORY)
+        weather = self.noaa.frame().iloc[context:]
+        reforecast = self.reforecast.frame() if len(self.reforecast) else pd.DataFrame(
+            {"DATE": pd.Series(dtype="datetime64[ns]"), "forecasted_TMAX": pd.Series(dtype="float64")})
+        merged = weather.merge(reforecast, how="left", on="DATE")
+        rows = add_features(merged)
+        rows = rows[rows["DATE"] >= start]
+
+        keep = int(np.searchsorted(self._dates(self.features), start.to_datetime64()))
+        self.features.truncate(keep)
+        self.features.append(rows.reset_index(drop=True), dirty_from=None)
+        return len(rows)
+
+    def update(self, noaa=None, reforecast=None):
+        """
+        Appends whatever is new in noaa (read_noaa_csv) and reforecast (reforecast_frame) and refreshes
+        the features. Returns {stage: first new date or rows written}.
+        """
+        out = {
+            "noaa": None if noaa is None else self.update_noaa(noaa),
+            "reforecast": None if reforecast is None else self.update_reforecast(reforecast),
+        }
+        out["features"] = self.update_features()
+        return out
+
+    def frame(self, dropna=True):
+        """
+        The features table (memory-mapped columns). dropna keeps only complete rows, like
+        full_training_df = data.dropna() in the notebook.
+        """
+        df = self.features.frame()
+        return df.dropna() if dropna else df
+
+    def Xy(self, start=None, end=None):
+        """
+        (X, y, dates) of the complete rows with start <= DATE < end, X in booster feature order.
+        """
+        df = self.frame()
+        if start is not None:
+            df = df[df["DATE"] >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df["DATE"] < pd.Timestamp(end)]
+        return df[FEATURE_COLUMNS], df[TARGET], df["DATE"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--noaa", help="NOAA daily CSV for KLAX")
+    parser.add_argument("--asof-hour", type=int, default=None, help="add the stored reforecasts for this as-of hour")
+    parser.add_argument("--root", default=str(DATA_DIR))
+    args = parser.parse_args()
+
+    data = TrainingData(args.root)
+    noaa = read_noaa_csv(args.noaa) if args.noaa else None
+    reforecast = None
+    if args.asof_hour is not None:
+        from reforecast import ReforecastStore
+        store = ReforecastStore(asof_hour_utc=args.asof_hour)
+        days = store.days()
+        if days:
+            reforecast = reforecast_frame(store.daily_tmax(days[0], days[-1]))
+    result = data.update(noaa, reforecast)
+    print(f"noaa: first new date {result['noaa']}, reforecast: first new date {result['reforecast']}, "
+          f"features: {result['features']} rows rewritten, {len(data.frame())} complete rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Expanding-window walk-forward for the forecast-error model (compute_oof_residuals in
+model_forecast_1.ipynb), with the training data binned on shared cut points and the folds trained
+in parallel.
+
+Folds are index slices of one sorted array: fold k trains on rows [0, train_end) and predicts
+[train_end, test_end). The histogram cut points are sketched from prefixes of the rows, [0, 2**j)
+for each power of two, and a fold bins its training rows on the longest prefix not past its
+train_end: every fold reuses one of log2(n) sketches, and no sketch holds a row after the training
+window of a fold that uses it. The test rows are predicted from the raw features (inplace_predict)
+and never binned.
+"""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "inference_KLAX"))
+from residual_cdf import ResidualCDF
+
+BASE_PARAMS = {"objective": "reg:squarederror", "eval_metric": "mae", "tree_method": "hist", "seed": 42}
+FOLD_COLUMNS = ["fold", "train_end", "test_end", "train_start_date", "test_start_date", "test_end_date",
+                "rounds", "seconds", "mae"]
+
+
+def folds(n, min_train_size=365, step=30):
+    """
+    (train_end, test_end) of every fold, as in compute_oof_residuals.
+    """
+    out, train_end = [], min_train_size
+    while train_end < n:
+        test_end = min(train_end + step, n)
+        out.append((train_end, test_end))
+        train_end = test_end
+    return out
+
+
+def booster_params(params):
+    """
+    XGBRegressor-style params (n_estimators, learning_rate, reg_lambda, ...) as (xgb.train params, rounds).
+    """
+    params = dict(params)
+    rounds = int(params.pop("n_estimators", 100))
+    params.pop("n_jobs", None)
+    if "random_state" in params:
+        params["seed"] = params.pop("random_state")
+    return {**BASE_PARAMS, **params}, rounds
+
+
+class TrainingMatrix:
+    """
+    X and y as one float32 array each, converted once. dmatrix(stop, start) is the QuantileDMatrix
+    of rows [start, stop), binned on the cut points of reference(stop).
+    """
+
+    def __init__(self, X, y, max_bin=256):
+        self.feature_names = list(X.columns) if hasattr(X, "columns") else None
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+        self.y = np.asarray(y, dtype=np.float32)
+        self.max_bin = max_bin
+        self._refs = {}   # prefix length (a power of two) -> QuantileDMatrix sketched from those rows
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.y)
+
+    def reference(self, stop):
+        """
+        The sketch of rows [0, 2**j) for the largest 2**j <= stop, built on first use.
+        """
+        end = 1 << (int(stop).bit_length() - 1)
+        with self._lock:
+            if end not in self._refs:
+                self._refs[end] = xgb.QuantileDMatrix(self.X[:end], self.y[:end], max_bin=self.max_bin,
+                                                      feature_names=self.feature_names)
+            return self._refs[end]
+
+    def dmatrix(self, stop, start=0):
+        return xgb.QuantileDMatrix(self.X[start:stop], self.y[start:stop], ref=self.reference(stop),
+                                   max_bin=self.max_bin, feature_names=self.feature_names)
+
+
+def _fit_fold(matrix, params, rounds, train_end, test_end, nthread, init=None):
+    start = time.perf_counter()
+    booster = xgb.train({**params, "nthread": nthread}, matrix.dmatrix(train_end), num_boost_round=rounds,
+                        xgb_model=init)
+    pred = booster.inplace_predict(matrix.X[train_end:test_end])
+    return booster, pred, time.perf_counter() - start
+
+
+def walk_forward(X, y, dates, params, min_train_size=365, step=30, max_workers=None, warm_start=False,
+                 warm_rounds=None, max_bin=256, matrix=None):
+    """
+    Out-of-fold predictions of an expanding-window walk-forward.
+
+    Folds run concurrently on max_workers threads (xgboost releases the GIL), the cores split
+    between them. With warm_start the folds run in order instead and each continues from the
+    previous fold's trees, adding warm_rounds (default a quarter of n_estimators) on its longer
+    training window.
+
+    Returns (oof_pred, residuals, folds_df): predictions aligned with X (NaN before the first fold),
+    y - oof_pred where predicted, and one row per fold with its dates, rounds, seconds and MAE.
+    """
+    matrix = matrix or TrainingMatrix(X, y, max_bin=max_bin)
+    dates = pd.to_datetime(pd.Series(dates)).reset_index(drop=True)
+    train_params, rounds = booster_params(params)
+    fold_list = folds(len(matrix), min_train_size, step)
+    cores = os.cpu_count() or 1
+    results = []
+
+    if warm_start:
+        warm_rounds = warm_rounds or max(1, rounds // 4)
+        booster = None
+        for train_end, test_end in fold_list:
+            booster, pred, seconds = _fit_fold(matrix, train_params, rounds if booster is None else warm_rounds,
+                                               train_end, test_end, cores, init=booster)
+            results.append((booster.num_boosted_rounds(), pred, seconds))
+    else:
+        max_workers = max_workers or min(len(fold_list), cores) or 1
+        nthread = max(1, cores // max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_fit_fold, matrix, train_params, rounds, a, b, nthread) for a, b in fold_list]
+            for f in futures:
+                booster, pred, seconds = f.result()
+                results.append((booster.num_boosted_rounds(), pred, seconds))
+
+    oof_pred = np.full(len(matrix), np.nan)
+    rows = []
+    for i, ((train_end, test_end), (n_rounds, pred, seconds)) in enumerate(zip(fold_list, results)):
+        oof_pred[train_end:test_end] = pred
+        rows.append({
+            "fold": i, "train_end": train_end, "test_end": test_end,
+            "train_start_date": dates.iloc[0], "test_start_date": dates.iloc[train_end],
+            "test_end_date": dates.iloc[test_end - 1], "rounds": n_rounds, "seconds": seconds,
+            "mae": float(np.mean(np.abs(matrix.y[train_end:test_end] - pred))),
+        })
+    mask = ~np.isnan(oof_pred)
+    residuals = matrix.y[mask].astype("float64") - oof_pred[mask]
+    return oof_pred, residuals, pd.DataFrame(rows, columns=FOLD_COLUMNS)
+
+
+def compute_oof_residuals(X, y, dates, best_params, min_train_size=365, step=30, cdf_path=None, **kwargs):
+    """
+    Drop-in for the notebook function: returns (residuals, oof_pred).
+    With cdf_path, the residual CDF the engine prices with is refitted and saved there as well.
+    """
+    oof_pred, residuals, _ = walk_forward(X, y, dates, best_params, min_train_size, step, **kwargs)
+    if cdf_path is not None:
+        fit_residual_cdf(residuals, pd.Series(dates)[~np.isnan(oof_pred)], path=cdf_path)
+    return residuals, oof_pred
+
+
+def fit_residual_cdf(residuals, dates, path=None, kind="kde", seasonal=True, window=1):
+    """
+    residual_cdf.ResidualCDF of the out-of-fold residuals, seasonal by the month of the target
+    date (the day after DATE), saved to path if given.
+    """
+    months = (pd.to_datetime(pd.Series(dates)) + pd.Timedelta(days=1)).dt.month.to_numpy()
+    cdf = ResidualCDF.fit(residuals, months, kind=kind, seasonal=seasonal, window=window)
+    if path is not None:
+        cdf.save(path)
+    return cdf
+
+
+def oof_sigma(residuals):
+    """
+    Out-of-sample sigma of the forecast error, the sigma used by ev.get_ev.
+    """
+    return float(np.std(residuals, ddof=1))